@@ -1,30 +1,278 @@
+import hashlib
 import heapq
+import json
 import math
+import os
+import struct
 import time
+from array import array
 from collections import deque
 import numpy as np
 
+# Move set shared by every solver: four straight moves, then the four diagonals.
+# Bit i of a cell's neighbor mask is set when DIRECTIONS[i] leads to a free cell.
+DIRECTIONS = (
+    (-1, 0), (1, 0), (0, -1), (0, 1),
+    (-1, -1), (-1, 1), (1, -1), (1, 1)
+)
+SQRT2 = math.sqrt(2)
+MOVE_COSTS = tuple(SQRT2 if dr and dc else 1 for dr, dc in DIRECTIONS)
+DIRECTION_BITS = {direction: 1 << bit for bit, direction in enumerate(DIRECTIONS)}
+
+# Grid connectivity: all 8 neighbors with diagonal moves allowed past wall
+# corners, 8 neighbors where a diagonal move needs both straight cells it
+# passes to be free, or the 4 straight neighbors only. The rule is baked into
+# the neighbor mask, so the solvers' loops never see a move the mode forbids.
+CONNECT_8, CONNECT_8_NO_CUT, CONNECT_4 = "8", "8-no-cut", "4"
+CONNECTIVITIES = (CONNECT_8, CONNECT_8_NO_CUT, CONNECT_4)
+
 # Core grid utilities
 def octile_distance(pos1, pos2):
     dx = abs(pos1[0] - pos2[0])
     dy = abs(pos1[1] - pos2[1])
     return max(dx, dy) + (math.sqrt(2) - 1) * min(dx, dy)
 
-def get_neighbors(grid, node_pos):
+def manhattan_distance(pos1, pos2):
+    return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
+
+# Extra cost of a diagonal over a straight step in the grid's distance
+# estimate: octile for 8-connected grids; 1 for 4-connected ones turns
+# max(dx, dy) + extra * min(dx, dy) into the Manhattan distance
+def diagonal_extra(grid):
+    return 1 if grid.connectivity == CONNECT_4 else SQRT2 - 1
+
+# Default heuristic for a grid: Manhattan distance on 4-connected grids,
+# octile otherwise, scaled by the cheapest terrain cost on weighted grids so
+# it never overestimates
+def grid_heuristic(grid):
+    base = manhattan_distance if grid.connectivity == CONNECT_4 else octile_distance
+    scale = grid.min_cost
+    if scale == 1:
+        return base
+    def heuristic(pos, goal):
+        return scale * base(pos, goal)
+    return heuristic
+
+# Plain nested-list grids take the connectivity here; a Grid brings its own
+def get_neighbors(grid, node_pos, connectivity=CONNECT_8):
+    if isinstance(grid, Grid):
+        idx = grid.index(node_pos)
+        return [(grid.position(idx + offset), move_cost)
+                for offset, move_cost in grid.neighbor_table[grid.mask[idx]]]
     rows, cols = len(grid), len(grid[0])
     row, col = node_pos
-    directions = [
-        (-1, 0), (1, 0), (0, -1), (0, 1),
-        (-1, -1), (-1, 1), (1, -1), (1, 1)
-    ]
+    def free(r, c):
+        return 0 <= r < rows and 0 <= c < cols and grid[r][c] == 0
     neighbors = []
-    for dr, dc in directions:
+    for dr, dc in DIRECTIONS:
+        if dr and dc:
+            if connectivity == CONNECT_4:
+                continue
+            if connectivity == CONNECT_8_NO_CUT and not (free(row + dr, col) and free(row, col + dc)):
+                continue
         r, c = row + dr, col + dc
-        if 0 <= r < rows and 0 <= c < cols and grid[r][c] == 0:
+        if free(r, c):
             move_cost = math.sqrt(2) if dr and dc else 1
             neighbors.append(((r, c), move_cost))
     return neighbors
 
+# Vectorized 8-bit neighbor mask, one byte per cell. Bits are only set for
+# moves the connectivity allows, so 4-connected masks never hold a diagonal.
+def build_neighbor_mask(cells, connectivity=CONNECT_8):
+    rows, cols = cells.shape
+    # A ring of walls around the map keeps every shifted view in bounds
+    free = np.zeros((rows + 2, cols + 2), dtype=np.uint8)
+    free[1:-1, 1:-1] = cells == 0
+    def shifted(dr, dc):
+        return free[1 + dr:rows + 1 + dr, 1 + dc:cols + 1 + dc]
+    mask = np.zeros((rows, cols), dtype=np.uint8)
+    for bit, (dr, dc) in enumerate(DIRECTIONS):
+        allowed = shifted(dr, dc)
+        if dr and dc:
+            if connectivity == CONNECT_4:
+                continue
+            if connectivity == CONNECT_8_NO_CUT:
+                allowed = allowed & shifted(dr, 0) & shifted(0, dc)
+        mask |= allowed << bit
+    return mask
+
+# Content hash of a cell array, its optional cost layer and its connectivity;
+# Grid.fingerprint() without building a Grid. The default connectivity adds
+# nothing, so plain maps keep the fingerprints they always had.
+def grid_fingerprint(cells, costs=None, connectivity=CONNECT_8):
+    cells = np.ascontiguousarray(cells, dtype=np.uint8)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{cells.shape[0]}x{cells.shape[1]}".encode())
+    if connectivity != CONNECT_8:
+        digest.update(f"connectivity={connectivity}".encode())
+    digest.update(cells.data)
+    if costs is not None:
+        costs = np.ascontiguousarray(costs)
+        digest.update(costs.dtype.str.encode())
+        digest.update(costs.data)
+    return digest.hexdigest()
+
+# Compact grid: uint8 cells, flat cell ids (row * cols + col) and a neighbor
+# mask built once per map. Solvers look up neighbor_table[mask[idx]] to get
+# (flat offset, move cost) pairs instead of bounds-checking eight directions.
+# An optional terrain layer (uint8 or float32, shaped like the cells) gives
+# the cost of entering each cell: a move costs its base 1 or sqrt(2) times the
+# cost of the cell it enters. cost_list is the same layer as a flat list for
+# the hot loops, and min_cost/max_cost bound the costs of free cells.
+# connectivity is one of CONNECTIVITIES and decides which moves the mask holds.
+class Grid:
+    __slots__ = ('cells', 'rows', 'cols', 'size', 'offsets', 'neighbor_table', 'mask', 'components',
+                 'costs', 'cost_list', 'min_cost', 'max_cost', 'connectivity', 'watchers')
+    def __init__(self, cells, costs=None, connectivity=CONNECT_8):
+        cells = np.asarray(cells, dtype=np.uint8)
+        if cells.ndim != 2 or cells.size == 0:
+            raise ValueError(f"Grid needs a non-empty 2D cell array, got shape {cells.shape}")
+        if connectivity not in CONNECTIVITIES:
+            raise ValueError(f"connectivity must be one of {CONNECTIVITIES}, got {connectivity!r}")
+        self.connectivity = connectivity
+        self.cells = cells
+        self.rows, self.cols = cells.shape
+        self.size = self.rows * self.cols
+        self.offsets = tuple(dr * self.cols + dc for dr, dc in DIRECTIONS)
+        self.neighbor_table = tuple(
+            tuple((self.offsets[bit], MOVE_COSTS[bit]) for bit in range(8) if bits >> bit & 1)
+            for bits in range(256)
+        )
+        # bytearray indexing yields plain ints, which is what the hot loops want
+        self.mask = bytearray(build_neighbor_mask(cells, connectivity).tobytes())
+        # Optional components.ComponentIndex; solvers use it to reject
+        # unreachable goals without searching, and set_cell keeps it current
+        self.components = None
+        # Callables run as watcher(idx) after set_cell or set_cost changed the
+        # cell with flat id idx, for caches that must drop what the edit stales
+        self.watchers = []
+        self.costs = self.cost_list = None
+        self.min_cost = self.max_cost = 1
+        if costs is not None:
+            costs = np.asarray(costs)
+            if costs.dtype != np.uint8:
+                costs = costs.astype(np.float32, copy=False)
+            if costs.shape != cells.shape:
+                raise ValueError(f"cost layer shape {costs.shape} does not match the map {cells.shape}")
+            free_costs = costs[cells == 0]
+            if not (np.isfinite(free_costs).all() and (free_costs > 0).all()):
+                raise ValueError("terrain costs of free cells must be positive and finite")
+            self.costs = costs
+            self.cost_list = costs.reshape(-1).tolist()
+            if free_costs.size:
+                self.min_cost, self.max_cost = free_costs.min().item(), free_costs.max().item()
+
+    @property
+    def neighbor_mask(self):
+        return np.frombuffer(self.mask, dtype=np.uint8).reshape(self.rows, self.cols)
+
+    def index(self, pos):
+        return pos[0] * self.cols + pos[1]
+
+    def position(self, idx):
+        return divmod(idx, self.cols)
+
+    def in_bounds(self, pos):
+        return 0 <= pos[0] < self.rows and 0 <= pos[1] < self.cols
+
+    # Flat ids of the in-bounds 8-neighbors of a cell, walls included
+    def adjacent(self, idx):
+        row, col = divmod(idx, self.cols)
+        return [idx + offset for (dr, dc), offset in zip(DIRECTIONS, self.offsets)
+                if 0 <= row + dr < self.rows and 0 <= col + dc < self.cols]
+
+    def _is_free(self, row, col):
+        return 0 <= row < self.rows and 0 <= col < self.cols and self.cells[row, col] == 0
+
+    # One cell's mask byte under the grid's connectivity
+    def _cell_mask(self, row, col):
+        bits = 0
+        for bit, (dr, dc) in enumerate(DIRECTIONS):
+            if dr and dc:
+                if self.connectivity == CONNECT_4:
+                    continue
+                if self.connectivity == CONNECT_8_NO_CUT and not (
+                        self._is_free(row + dr, col) and self._is_free(row, col + dc)):
+                    continue
+            if self._is_free(row + dr, col + dc):
+                bits |= 1 << bit
+        return bits
+
+    # Edit one cell and patch the mask bits of the cells that point at it.
+    # Without corner cutting the cell also gates diagonal moves between its
+    # neighbors, so their mask bytes are recomputed instead.
+    def set_cell(self, pos, value):
+        row, col = pos
+        self.cells[row, col] = value
+        for bit, (dr, dc) in enumerate(DIRECTIONS):
+            r, c = row - dr, col - dc
+            if 0 <= r < self.rows and 0 <= c < self.cols:
+                if self.connectivity == CONNECT_8_NO_CUT:
+                    self.mask[r * self.cols + c] = self._cell_mask(r, c)
+                elif dr and dc and self.connectivity == CONNECT_4:
+                    continue
+                elif value == 0:
+                    self.mask[r * self.cols + c] |= 1 << bit
+                else:
+                    self.mask[r * self.cols + c] &= ~(1 << bit) & 0xFF
+        if value == 0 and self.costs is not None:
+            # Walls may carry a 0 cost in the sidecar; they cost 1 once opened
+            cost = self.cost_list[row * self.cols + col]
+            if not (cost > 0 and math.isfinite(cost)):
+                self.costs[row, col] = 1
+                self.cost_list[row * self.cols + col] = cost = 1
+            self._cover_cost(cost)
+        if self.components is not None:
+            self.components.cell_changed(row * self.cols + col, value)
+        for watcher in self.watchers:
+            watcher(row * self.cols + col)
+
+    # Change the cost of entering one cell, adding a cost layer (all ones) to
+    # a uniform grid on first use
+    def set_cost(self, pos, value):
+        if not (value > 0 and math.isfinite(value)):
+            raise ValueError(f"terrain cost must be positive and finite, got {value}")
+        if self.costs is None:
+            self.costs = np.ones((self.rows, self.cols), dtype=np.uint8)
+            self.cost_list = [1] * self.size
+        if self.costs.dtype == np.uint8 and not (float(value).is_integer() and value <= 255):
+            self.costs = self.costs.astype(np.float32)
+        row, col = pos
+        self.costs[row, col] = value
+        self.cost_list[row * self.cols + col] = self.costs[row, col].item()
+        if self.cells[row, col] == 0:
+            self._cover_cost(self.cost_list[row * self.cols + col])
+        for watcher in self.watchers:
+            watcher(row * self.cols + col)
+
+    # min_cost only ever moves down, so heuristics scaled by it stay admissible
+    def _cover_cost(self, cost):
+        if cost < self.min_cost:
+            self.min_cost = cost
+        if cost > self.max_cost:
+            self.max_cost = cost
+
+    # Content hash used to tie saved preprocessing data to this exact map
+    def fingerprint(self):
+        return grid_fingerprint(self.cells, self.costs, self.connectivity)
+
+    # Row access so code written against list-of-lists grids keeps working
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, row):
+        return self.cells[row]
+
+# Anything a solver can take as a map: a Grid, nested lists, a 2D array, or a
+# path to a .txt or binary map file
+def as_grid(grid):
+    if isinstance(grid, Grid):
+        return grid
+    if isinstance(grid, (str, os.PathLike)):
+        grid, meta = load_map(grid)
+        return Grid(grid, meta["costs"])
+    return Grid(grid)
+
 # Node for A*, Dijkstra, Greedy
 class Node:
     __slots__ = ('pos', 'g_cost', 'h_cost', 'parent')
@@ -39,131 +287,1196 @@ class Node:
     def __lt__(self, other):
         return self.f_cost < other.f_cost
 
-# Shared path recovery
-def reconstruct_path(node):
+# Outcome of one solver run. Timing uses perf_counter, and visited_nodes (the
+# expansion order) is only collected when the solver is called with trace=True.
+# status is FOUND, NO_PATH, BUDGET_EXCEEDED when max_expansions or the deadline
+# ran out first, or CANCELLED when a progress callback stopped the search.
+# bound is the suboptimality bound of an anytime result (None elsewhere).
+# Unpacks as (path, visited_nodes) like the old tuple return.
+FOUND, NO_PATH, BUDGET_EXCEEDED, CANCELLED = "found", "no_path", "budget_exceeded", "cancelled"
+
+# Solvers given progress=callback call it as callback(expansions) every
+# PROGRESS_EVERY expansions; a truthy return stops the search. deadline is a
+# time.perf_counter() value, read every DEADLINE_CHECK_EVERY expansions.
+PROGRESS_EVERY = 4096
+DEADLINE_CHECK_EVERY = 256
+
+# Expansion count at which a solver next has to look at its budget; -1 = never
+def _next_check(expansions, max_expansions, deadline, progress):
+    steps = []
+    if max_expansions is not None:
+        steps.append(max_expansions - expansions)
+    if deadline is not None:
+        steps.append(DEADLINE_CHECK_EVERY - expansions % DEADLINE_CHECK_EVERY)
+    if progress is not None:
+        steps.append(PROGRESS_EVERY - expansions % PROGRESS_EVERY)
+    return expansions + max(min(steps), 0) if steps else -1
+
+# Where a solver looks at its budget first: before the first expansion when a
+# deadline is set, so one that has already passed stops the search at once
+def _first_check(max_expansions, deadline, progress):
+    return 0 if deadline is not None else _next_check(0, max_expansions, deadline, progress)
+
+def _budget_status(expansions, max_expansions, deadline, progress):
+    if max_expansions is not None and expansions >= max_expansions:
+        return BUDGET_EXCEEDED
+    if deadline is not None and time.perf_counter() >= deadline:
+        return BUDGET_EXCEEDED
+    if progress is not None and expansions and expansions % PROGRESS_EVERY == 0 and progress(expansions):
+        return CANCELLED
+    return None
+
+class SearchResult:
+    __slots__ = ('algorithm', 'path', 'cost', 'expansions', 'pushes', 'peak_open', 'duration', 'visited_nodes',
+                 'status', 'bound')
+    def __init__(self, algorithm, path, cost, expansions, pushes, peak_open, duration, visited_nodes=None,
+                 status=None, bound=None):
+        self.algorithm = algorithm
+        self.path = path
+        self.cost = cost
+        self.expansions = expansions
+        self.pushes = pushes
+        self.peak_open = peak_open
+        self.duration = duration
+        self.visited_nodes = visited_nodes
+        self.status = status or (FOUND if path is not None else NO_PATH)
+        self.bound = bound
+    @property
+    def found(self):
+        return self.path is not None
+    def __iter__(self):
+        return iter((self.path, self.visited_nodes))
+
+# True when the grid's component labels prove there is no path, so a solver
+# can answer without expanding anything
+def _unreachable(grid, start_idx, goal_idx):
+    return grid.components is not None and not grid.components.connected(start_idx, goal_idx)
+
+def _finish(result, verbose):
+    if verbose:
+        print_metrics(result)
+    return result
+
+# Shared path recovery; pass the grid to turn flat cell ids back into (row, col)
+def reconstruct_path(node, grid=None):
     path = []
     while node:
         path.append(node.pos)
         node = node.parent
-    return path[::-1]
+    path.reverse()
+    if grid is not None:
+        path = [grid.position(idx) for idx in path]
+    return path
 
-# A*, Dijkstra, Greedy
-def search(grid, start, goal, algorithm="a_star"):
-    start_time = time.time()
+# A*, Dijkstra, Greedy (and JPS, which has its own expansion rule).
+# heuristic is any admissible h(pos, goal); grid_heuristic by default (octile,
+# or Manhattan on 4-connected grids, scaled by the grid's cheapest terrain
+# cost on weighted grids so it stays admissible). The default is consistent,
+# so closed cells stay closed; a custom one may not be, so A* reopens a closed
+# cell when it finds a cheaper g for it and stays optimal either way. A weight
+# above 1 inflates h (weighted A*): paths cost at most weight times the
+# optimum, usually for far fewer expansions.
+def search(grid, start, goal, algorithm="a_star", heuristic=None, trace=False, verbose=False,
+           max_expansions=None, deadline=None, progress=None, weight=1.0):
+    if algorithm == "jps":
+        return jps(grid, start, goal, trace=trace, verbose=verbose,
+                   max_expansions=max_expansions, deadline=deadline, progress=progress)
+    start_time = time.perf_counter()
+    grid = as_grid(grid)
+    reopen = heuristic is not None and algorithm == 'a_star'
+    heuristic = heuristic or grid_heuristic(grid)
+    if weight != 1:
+        def heuristic(pos, goal, base=heuristic):
+            return weight * base(pos, goal)
+    cols, mask, neighbor_table, terrain = grid.cols, grid.mask, grid.neighbor_table, grid.cost_list
+    start_idx, goal_idx = grid.index(start), grid.index(goal)
     open_set = []
-    visited = {start: 0}
-    visited_nodes = []
+    visited = {start_idx: 0}
+    closed = set()
+    visited_nodes = [] if trace else None
+    expansions = 0
+    next_check = _first_check(max_expansions, deadline, progress)
+    if _unreachable(grid, start_idx, goal_idx):
+        return _finish(SearchResult(algorithm, None, None, 0, 0, 0, time.perf_counter() - start_time,
+                                    visited_nodes), verbose)
 
     use_g = algorithm in ['a_star', 'dijkstra']
     use_h = algorithm in ['a_star', 'greedy']
 
-    h = octile_distance(start, goal) if use_h else 0
-    start_node = Node(start, 0 if use_g else 0, h)
-    heapq.heappush(open_set, (start_node.f_cost, start_node))
+    # Ties on f are broken by push order so heap comparisons never reach Node
+    h = heuristic(start, goal) if use_h else 0
+    start_node = Node(start_idx, 0 if use_g else 0, h)
+    heapq.heappush(open_set, (start_node.f_cost, 0, start_node))
+    pushes = peak_open = 1
 
     while open_set:
-        _, current = heapq.heappop(open_set)
-        visited_nodes.append(current.pos)
+        _, _, current = heapq.heappop(open_set)
+        if current.g_cost > visited[current.pos]:
+            continue  # superseded by a cheaper push of the same cell
+        if expansions == next_check:
+            status = _budget_status(expansions, max_expansions, deadline, progress)
+            if status is not None:
+                return _finish(SearchResult(algorithm, None, None, expansions, pushes, peak_open,
+                                            time.perf_counter() - start_time, visited_nodes, status), verbose)
+            next_check = _next_check(expansions, max_expansions, deadline, progress)
+        closed.add(current.pos)
+        expansions += 1
+        if trace:
+            visited_nodes.append(divmod(current.pos, cols))
 
-        if current.pos == goal:
-            end_time = time.time()
-            path = reconstruct_path(current)
-            print_metrics(algorithm, visited_nodes, path, current.g_cost, end_time - start_time)
-            return path, visited_nodes
+        if current.pos == goal_idx:
+            path = reconstruct_path(current, grid)
+            # greedy search carries no g, so its cost is measured off the path
+            cost = current.g_cost if use_g else path_cost(path, grid)
+            return _finish(SearchResult(algorithm, path, cost, expansions, pushes, peak_open,
+                                        time.perf_counter() - start_time, visited_nodes), verbose)
 
-        for neighbor_pos, move_cost in get_neighbors(grid, current.pos):
+        for offset, move_cost in neighbor_table[mask[current.pos]]:
+            neighbor_idx = current.pos + offset
+            if neighbor_idx in closed and not reopen:
+                continue
+            if terrain is not None:
+                move_cost *= terrain[neighbor_idx]
             g_cost = current.g_cost + move_cost if use_g else 0
-            if neighbor_pos not in visited or g_cost < visited[neighbor_pos]:
-                visited[neighbor_pos] = g_cost
-                h_cost = octile_distance(neighbor_pos, goal) if use_h else 0
-                neighbor_node = Node(neighbor_pos, g_cost, h_cost, current)
-                heapq.heappush(open_set, (neighbor_node.f_cost, neighbor_node))
+            if neighbor_idx not in visited or g_cost < visited[neighbor_idx]:
+                visited[neighbor_idx] = g_cost
+                closed.discard(neighbor_idx)
+                h_cost = heuristic(divmod(neighbor_idx, cols), goal) if use_h else 0
+                neighbor_node = Node(neighbor_idx, g_cost, h_cost, current)
+                heapq.heappush(open_set, (neighbor_node.f_cost, pushes, neighbor_node))
+                pushes += 1
+        if len(open_set) > peak_open:
+            peak_open = len(open_set)
+
+    return _finish(SearchResult(algorithm, None, None, expansions, pushes, peak_open,
+                                time.perf_counter() - start_time, visited_nodes), verbose)
+
+# A*, Dijkstra, Greedy on flat per-cell arrays instead of Node objects.
+# g-cost, parent and open/closed state are preallocated and indexed by cell id,
+# and the heap only holds (f, tiebreak, idx) tuples. state[idx] is UNSEEN,
+# CLOSED, or the tiebreak of the cell's newest heap entry, so superseded entries
+# are recognised on pop. Pushes and pops follow the same rules and tie order as
+# search(), so paths and costs match it exactly. When a custom heuristic makes
+# A* reopen a cell, cells reached through it trace back through its newest
+# parent, so their paths may be a different, equally cheap one.
+UNSEEN, CLOSED = -1, -2
+
+def flat_search(grid, start, goal, algorithm="a_star", heuristic=None, trace=False, verbose=False,
+                max_expansions=None, deadline=None, progress=None):
+    start_time = time.perf_counter()
+    grid = as_grid(grid)
+    cols, mask, neighbor_table, terrain = grid.cols, grid.mask, grid.neighbor_table, grid.cost_list
+    start_idx, goal_idx = grid.index(start), grid.index(goal)
+    goal_row, goal_col = goal
+    h_extra = diagonal_extra(grid)
+    h_scale = grid.min_cost
+    visited_nodes = [] if trace else None
+    # Checked before the per-cell arrays are allocated
+    if _unreachable(grid, start_idx, goal_idx):
+        return _finish(SearchResult(algorithm, None, None, 0, 0, 0, time.perf_counter() - start_time,
+                                    visited_nodes), verbose)
+
+    # Push ids are bounded by 8 per cell, so int32 covers maps up to ~250M cells
+    index_type = 'i' if grid.size * 9 < 2 ** 31 else 'q'
+    g_costs = array('d', [math.inf]) * grid.size
+    parents = array(index_type, [-1]) * grid.size
+    state = array(index_type, [UNSEEN]) * grid.size
+    expansions = 0
+    next_check = _first_check(max_expansions, deadline, progress)
+
+    use_g = algorithm in ['a_star', 'dijkstra']
+    use_h = algorithm in ['a_star', 'greedy']
+    reopen = heuristic is not None and algorithm == 'a_star'
+
+    g_costs[start_idx] = 0
+    state[start_idx] = 0
+    open_set = [((heuristic or grid_heuristic(grid))(start, goal) if use_h else 0, 0, start_idx)]
+    pushes = peak_open = 1
+
+    while open_set:
+        _, push_id, current = heapq.heappop(open_set)
+        if push_id != state[current]:
+            continue
+        if expansions == next_check:
+            status = _budget_status(expansions, max_expansions, deadline, progress)
+            if status is not None:
+                return _finish(SearchResult(algorithm, None, None, expansions, pushes, peak_open,
+                                            time.perf_counter() - start_time, visited_nodes, status), verbose)
+            next_check = _next_check(expansions, max_expansions, deadline, progress)
+        state[current] = CLOSED
+        expansions += 1
+        if trace:
+            visited_nodes.append(divmod(current, cols))
+
+        if current == goal_idx:
+            path = trace_parents(grid, parents, current)
+            cost = g_costs[current] if use_g else path_cost(path, grid)
+            return _finish(SearchResult(algorithm, path, cost, expansions, pushes, peak_open,
+                                        time.perf_counter() - start_time, visited_nodes), verbose)
+
+        current_g = g_costs[current]
+        for offset, move_cost in neighbor_table[mask[current]]:
+            neighbor = current + offset
+            if terrain is not None:
+                move_cost *= terrain[neighbor]
+            g_cost = current_g + move_cost if use_g else 0
+            if g_cost < g_costs[neighbor] and (reopen or state[neighbor] != CLOSED):
+                g_costs[neighbor] = g_cost
+                parents[neighbor] = current
+                state[neighbor] = pushes
+                h_cost = 0
+                if use_h:
+                    row, col = divmod(neighbor, cols)
+                    if heuristic is None:
+                        dx, dy = abs(row - goal_row), abs(col - goal_col)
+                        h_cost = (max(dx, dy) + h_extra * min(dx, dy)) * h_scale
+                    else:
+                        h_cost = heuristic((row, col), goal)
+                heapq.heappush(open_set, (g_cost + h_cost, pushes, neighbor))
+                pushes += 1
+        if len(open_set) > peak_open:
+            peak_open = len(open_set)
+
+    return _finish(SearchResult(algorithm, None, None, expansions, pushes, peak_open,
+                                time.perf_counter() - start_time, visited_nodes), verbose)
+
+# Walk a flat parent array (-1 marks the root) back to the start
+def trace_parents(grid, parents, current):
+    path = []
+    while current != -1:
+        path.append(grid.position(current))
+        current = parents[current]
+    return path[::-1]
+
+# Dijkstra on a bucket queue instead of a binary heap. Buckets are
+# bucket_width = the cheapest possible move (grid.min_cost) wide, so a cell
+# can never improve another cell in its own bucket: once the scan reaches a
+# bucket every cell in it is final, and cells are taken out in any order
+# with O(1) pushes and pops. The buckets are reused cyclically; with small
+# integer terrain costs (or none) only a handful are ever live. Cost ranges
+# needing more than MAX_BUCKETS buckets should use "dijkstra" instead.
+MAX_BUCKETS = 1 << 16
+
+def bucket_dijkstra(grid, start, goal, trace=False, verbose=False, max_expansions=None, deadline=None,
+                    progress=None):
+    start_time = time.perf_counter()
+    grid = as_grid(grid)
+    cols, mask, neighbor_table, terrain = grid.cols, grid.mask, grid.neighbor_table, grid.cost_list
+    start_idx, goal_idx = grid.index(start), grid.index(goal)
+    visited_nodes = [] if trace else None
+    if _unreachable(grid, start_idx, goal_idx):
+        return _finish(SearchResult("bucket_dijkstra", None, None, 0, 0, 0, time.perf_counter() - start_time,
+                                    visited_nodes), verbose)
+    bucket_width = grid.min_cost
+    # Pushes land at most one costliest move past the scan; the spare bucket
+    # keeps rounding from wrapping one around onto the bucket being scanned
+    bucket_count = int(SQRT2 * grid.max_cost / bucket_width) + 3
+    if bucket_count > MAX_BUCKETS:
+        raise ValueError(f"terrain costs {grid.min_cost}..{grid.max_cost} need {bucket_count} buckets; "
+                         f"use dijkstra instead")
+
+    index_type = 'i' if grid.size < 2 ** 31 else 'q'
+    g_costs = array('d', [math.inf]) * grid.size
+    parents = array(index_type, [-1]) * grid.size
+    closed = bytearray(grid.size)
+    buckets = [[] for _ in range(bucket_count)]
+    expansions = 0
+    next_check = _first_check(max_expansions, deadline, progress)
+
+    g_costs[start_idx] = 0
+    buckets[0].append(start_idx)
+    pushes = peak_open = queued = 1
+    position = 0  # bucket number under the scan, not wrapped
+
+    while queued:
+        bucket = buckets[position % bucket_count]
+        if not bucket:
+            position += 1
+            continue
+        current = bucket.pop()
+        queued -= 1
+        if closed[current]:
+            continue  # an older entry of a cell that was lowered meanwhile
+        if expansions == next_check:
+            status = _budget_status(expansions, max_expansions, deadline, progress)
+            if status is not None:
+                return _finish(SearchResult("bucket_dijkstra", None, None, expansions, pushes, peak_open,
+                                            time.perf_counter() - start_time, visited_nodes, status), verbose)
+            next_check = _next_check(expansions, max_expansions, deadline, progress)
+        closed[current] = 1
+        expansions += 1
+        if trace:
+            visited_nodes.append(divmod(current, cols))
+
+        if current == goal_idx:
+            path = trace_parents(grid, parents, current)
+            return _finish(SearchResult("bucket_dijkstra", path, g_costs[current], expansions, pushes, peak_open,
+                                        time.perf_counter() - start_time, visited_nodes), verbose)
+
+        current_g = g_costs[current]
+        for offset, move_cost in neighbor_table[mask[current]]:
+            neighbor = current + offset
+            if terrain is not None:
+                move_cost *= terrain[neighbor]
+            g_cost = current_g + move_cost
+            if g_cost < g_costs[neighbor] and not closed[neighbor]:
+                g_costs[neighbor] = g_cost
+                parents[neighbor] = current
+                # Rounding may land a cell in the bucket under the scan; it
+                # is still final there, since nothing in the bucket improves it
+                buckets[max(int(g_cost / bucket_width), position) % bucket_count].append(neighbor)
+                pushes += 1
+                queued += 1
+        if queued > peak_open:
+            peak_open = queued
+
+    return _finish(SearchResult("bucket_dijkstra", None, None, expansions, pushes, peak_open,
+                                time.perf_counter() - start_time, visited_nodes), verbose)
+
+# Jump Point Search for uniform-cost 8-connected grids (diagonals may pass
+# between two walls, exactly as get_neighbors allows). Symmetric path prefixes
+# are pruned and straight/diagonal runs are skipped, so only jump points enter
+# the open set. Every check a jump makes is against a neighbor of the cell it
+# is standing on, so the precomputed neighbor mask doubles as the walkability
+# and bounds test.
+def _sign(value):
+    return (value > 0) - (value < 0)
+
+def _jps_successor_dirs(bits, dr, dc):
+    free = lambda d: bits & DIRECTION_BITS[d]
+    if dr and dc:
+        dirs = [d for d in ((0, dc), (dr, 0), (dr, dc)) if free(d)]
+        if not free((-dr, 0)) and free((-dr, dc)):
+            dirs.append((-dr, dc))
+        if not free((0, -dc)) and free((dr, -dc)):
+            dirs.append((dr, -dc))
+        return dirs
+    dirs = [(dr, dc)] if free((dr, dc)) else []
+    for pr, pc in ((dc, dr), (-dc, -dr)):  # the two perpendicular directions
+        if not free((pr, pc)) and free((dr + pr, dc + pc)):
+            dirs.append((dr + pr, dc + pc))
+    return dirs
+
+def _jump_straight(grid, idx, dr, dc, goal_idx):
+    mask = grid.mask
+    step = DIRECTION_BITS[(dr, dc)]
+    side_a, side_b = DIRECTION_BITS[(dc, dr)], DIRECTION_BITS[(-dc, -dr)]
+    ahead_a, ahead_b = DIRECTION_BITS[(dr + dc, dc + dr)], DIRECTION_BITS[(dr - dc, dc - dr)]
+    offset = dr * grid.cols + dc
+    while True:
+        if idx == goal_idx:
+            return idx
+        bits = mask[idx]
+        if (not bits & side_a and bits & ahead_a) or (not bits & side_b and bits & ahead_b):
+            return idx
+        if not bits & step:
+            return -1
+        idx += offset
+
+def _jump_diagonal(grid, idx, dr, dc, goal_idx):
+    mask = grid.mask
+    step = DIRECTION_BITS[(dr, dc)]
+    vertical, horizontal = DIRECTION_BITS[(dr, 0)], DIRECTION_BITS[(0, dc)]
+    back_row, back_col = DIRECTION_BITS[(-dr, 0)], DIRECTION_BITS[(0, -dc)]
+    forced_row, forced_col = DIRECTION_BITS[(-dr, dc)], DIRECTION_BITS[(dr, -dc)]
+    cols = grid.cols
+    offset = dr * cols + dc
+    while True:
+        if idx == goal_idx:
+            return idx
+        bits = mask[idx]
+        if (bits & forced_row and not bits & back_row) or (bits & forced_col and not bits & back_col):
+            return idx
+        if bits & vertical and _jump_straight(grid, idx + dr * cols, dr, 0, goal_idx) != -1:
+            return idx
+        if bits & horizontal and _jump_straight(grid, idx + dc, 0, dc, goal_idx) != -1:
+            return idx
+        if not bits & step:
+            return -1
+        idx += offset
 
-    end_time = time.time()
-    print_metrics(algorithm, visited_nodes, None, 0, end_time - start_time)
-    return None, visited_nodes
+# Fill in the cells between consecutive jump points
+def _expand_jump_path(grid, jump_points):
+    path = [grid.position(jump_points[0])]
+    for idx in jump_points[1:]:
+        row, col = grid.position(idx)
+        prev_row, prev_col = path[-1]
+        dr, dc = _sign(row - prev_row), _sign(col - prev_col)
+        while (prev_row, prev_col) != (row, col):
+            prev_row, prev_col = prev_row + dr, prev_col + dc
+            path.append((prev_row, prev_col))
+    return path
+
+def jps(grid, start, goal, trace=False, verbose=False, max_expansions=None, deadline=None, progress=None):
+    start_time = time.perf_counter()
+    grid = as_grid(grid)
+    if grid.costs is not None:
+        raise ValueError("jps needs uniform move costs; use a_star on terrain grids")
+    if grid.connectivity != CONNECT_8:
+        raise ValueError(f"jps prunes for 8-connected grids with corner cutting, not {grid.connectivity!r}")
+    cols, mask = grid.cols, grid.mask
+    start_idx, goal_idx = grid.index(start), grid.index(goal)
+    g_costs = {start_idx: 0}
+    parents = {start_idx: -1}
+    closed = set()
+    visited_nodes = [] if trace else None
+    expansions = 0
+    next_check = _first_check(max_expansions, deadline, progress)
+    if _unreachable(grid, start_idx, goal_idx):
+        return _finish(SearchResult("jps", None, None, 0, 0, 0, time.perf_counter() - start_time,
+                                    visited_nodes), verbose)
+
+    open_set = [(octile_distance(start, goal), 0, start_idx)]
+    pushes = peak_open = 1
+
+    while open_set:
+        _, _, current = heapq.heappop(open_set)
+        if current in closed:
+            continue
+        if expansions == next_check:
+            status = _budget_status(expansions, max_expansions, deadline, progress)
+            if status is not None:
+                return _finish(SearchResult("jps", None, None, expansions, pushes, peak_open,
+                                            time.perf_counter() - start_time, visited_nodes, status), verbose)
+            next_check = _next_check(expansions, max_expansions, deadline, progress)
+        closed.add(current)
+        expansions += 1
+        row, col = divmod(current, cols)
+        if trace:
+            visited_nodes.append((row, col))
+
+        if current == goal_idx:
+            jump_points = []
+            while current != -1:
+                jump_points.append(current)
+                current = parents[current]
+            path = _expand_jump_path(grid, jump_points[::-1])
+            return _finish(SearchResult("jps", path, g_costs[goal_idx], expansions, pushes, peak_open,
+                                        time.perf_counter() - start_time, visited_nodes), verbose)
+
+        parent = parents[current]
+        if parent == -1:
+            directions = [d for d in DIRECTIONS if mask[current] & DIRECTION_BITS[d]]
+        else:
+            parent_row, parent_col = divmod(parent, cols)
+            directions = _jps_successor_dirs(mask[current], _sign(row - parent_row), _sign(col - parent_col))
+
+        for dr, dc in directions:
+            if dr and dc:
+                jump_idx = _jump_diagonal(grid, current + dr * cols + dc, dr, dc, goal_idx)
+            else:
+                jump_idx = _jump_straight(grid, current + dr * cols + dc, dr, dc, goal_idx)
+            if jump_idx == -1 or jump_idx in closed:
+                continue
+            jump_pos = divmod(jump_idx, cols)
+            g_cost = g_costs[current] + octile_distance((row, col), jump_pos)
+            if jump_idx not in g_costs or g_cost < g_costs[jump_idx]:
+                g_costs[jump_idx] = g_cost
+                parents[jump_idx] = current
+                heapq.heappush(open_set, (g_cost + octile_distance(jump_pos, goal), pushes, jump_idx))
+                pushes += 1
+        if len(open_set) > peak_open:
+            peak_open = len(open_set)
+
+    return _finish(SearchResult("jps", None, None, expansions, pushes, peak_open,
+                                time.perf_counter() - start_time, visited_nodes), verbose)
+
+# Walk a came_from map of flat ids back to the start
+def _trace_came_from(grid, came_from, current):
+    path = []
+    while current is not None:
+        path.append(grid.position(current))
+        current = came_from.get(current)
+    return path[::-1]
 
 # BFS
-def bfs(grid, start, goal):
-    start_time = time.time()
+def bfs(grid, start, goal, trace=False, verbose=False, max_expansions=None, deadline=None, progress=None):
+    start_time = time.perf_counter()
+    grid = as_grid(grid)
+    cols, mask, neighbor_table = grid.cols, grid.mask, grid.neighbor_table
+    start_idx, goal_idx = grid.index(start), grid.index(goal)
     queue = deque()
     visited = set()
     came_from = {}
-    visited_nodes = []
+    visited_nodes = [] if trace else None
+    expansions = 0
+    next_check = _first_check(max_expansions, deadline, progress)
+    if _unreachable(grid, start_idx, goal_idx):
+        return _finish(SearchResult("bfs", None, None, 0, 0, 0, time.perf_counter() - start_time,
+                                    visited_nodes), verbose)
 
-    queue.append(start)
-    visited.add(start)
+    queue.append(start_idx)
+    visited.add(start_idx)
+    pushes = peak_open = 1
 
     while queue:
         current = queue.popleft()
-        visited_nodes.append(current)
-
-        if current == goal:
-            path = []
-            while current:
-                path.append(current)
-                current = came_from.get(current)
-            end_time = time.time()
-            path = path[::-1]
-            print_metrics("bfs", visited_nodes, path, len(path), end_time - start_time)
-            return path, visited_nodes
-
-        for neighbor, _ in get_neighbors(grid, current):
+        if expansions == next_check:
+            status = _budget_status(expansions, max_expansions, deadline, progress)
+            if status is not None:
+                return _finish(SearchResult("bfs", None, None, expansions, pushes, peak_open,
+                                            time.perf_counter() - start_time, visited_nodes, status), verbose)
+            next_check = _next_check(expansions, max_expansions, deadline, progress)
+        expansions += 1
+        if trace:
+            visited_nodes.append(divmod(current, cols))
+
+        if current == goal_idx:
+            path = _trace_came_from(grid, came_from, current)
+            return _finish(SearchResult("bfs", path, path_cost(path, grid), expansions, pushes, peak_open,
+                                        time.perf_counter() - start_time, visited_nodes), verbose)
+
+        for offset, _ in neighbor_table[mask[current]]:
+            neighbor = current + offset
             if neighbor not in visited:
                 visited.add(neighbor)
                 came_from[neighbor] = current
                 queue.append(neighbor)
+                pushes += 1
+        if len(queue) > peak_open:
+            peak_open = len(queue)
 
-    end_time = time.time()
-    print_metrics("bfs", visited_nodes, None, 0, end_time - start_time)
-    return None, visited_nodes
+    return _finish(SearchResult("bfs", None, None, expansions, pushes, peak_open,
+                                time.perf_counter() - start_time, visited_nodes), verbose)
 
 # DFS
-def dfs(grid, start, goal):
-    start_time = time.time()
-    stack = [start]
+def dfs(grid, start, goal, trace=False, verbose=False, max_expansions=None, deadline=None, progress=None):
+    start_time = time.perf_counter()
+    grid = as_grid(grid)
+    cols, mask, neighbor_table = grid.cols, grid.mask, grid.neighbor_table
+    start_idx, goal_idx = grid.index(start), grid.index(goal)
+    stack = [start_idx]
     visited = set()
     came_from = {}
-    visited_nodes = []
+    visited_nodes = [] if trace else None
+    expansions = 0
+    next_check = _first_check(max_expansions, deadline, progress)
+    if _unreachable(grid, start_idx, goal_idx):
+        return _finish(SearchResult("dfs", None, None, 0, 0, 0, time.perf_counter() - start_time,
+                                    visited_nodes), verbose)
+    pushes = peak_open = 1
 
     while stack:
         current = stack.pop()
         if current in visited:
             continue
+        if expansions == next_check:
+            status = _budget_status(expansions, max_expansions, deadline, progress)
+            if status is not None:
+                return _finish(SearchResult("dfs", None, None, expansions, pushes, peak_open,
+                                            time.perf_counter() - start_time, visited_nodes, status), verbose)
+            next_check = _next_check(expansions, max_expansions, deadline, progress)
         visited.add(current)
-        visited_nodes.append(current)
-
-        if current == goal:
-            path = []
-            while current:
-                path.append(current)
-                current = came_from.get(current)
-            end_time = time.time()
-            path = path[::-1]
-            print_metrics("dfs", visited_nodes, path, len(path), end_time - start_time)
-            return path, visited_nodes
-
-        for neighbor, _ in get_neighbors(grid, current):
+        expansions += 1
+        if trace:
+            visited_nodes.append(divmod(current, cols))
+
+        if current == goal_idx:
+            path = _trace_came_from(grid, came_from, current)
+            return _finish(SearchResult("dfs", path, path_cost(path, grid), expansions, pushes, peak_open,
+                                        time.perf_counter() - start_time, visited_nodes), verbose)
+
+        for offset, _ in neighbor_table[mask[current]]:
+            neighbor = current + offset
             if neighbor not in visited:
                 came_from[neighbor] = current
                 stack.append(neighbor)
+                pushes += 1
+        if len(stack) > peak_open:
+            peak_open = len(stack)
 
-    end_time = time.time()
-    print_metrics("dfs", visited_nodes, None, 0, end_time - start_time)
-    return None, visited_nodes
-
-# Log metrics
-def print_metrics(name, visited_nodes, path, cost, duration):
-    print(f"\n--- {name.upper()} Performance ---")
-    print(f"Time taken: {duration:.6f} sec")
-    print(f"Nodes expanded: {len(visited_nodes)}")
-    if path:
-        print(f"Path length: {len(path)}")
-        print(f"Total cost: {cost:.2f}")
+    return _finish(SearchResult("dfs", None, None, expansions, pushes, peak_open,
+                                time.perf_counter() - start_time, visited_nodes), verbose)
+
+# Bidirectional A* ("bi_a_star") and Dijkstra ("bi_dijkstra"). One search
+# grows from the start and one from the goal, always expanding the side with
+# the smaller open list, and every edge a side relaxes into a cell the other
+# side has reached is a candidate meeting. A* uses the average potential
+# p(v) = (h(v, goal) - h(v, start)) / 2 forwards and -p(v) backwards, so both
+# searches work on the same consistent reduced costs; the search stops once
+# the two smallest open keys add up to the best meeting cost, which makes the
+# path optimal (same cost as search()). Moves between free cells are
+# symmetric, so the backward side follows the same neighbor mask; on terrain
+# grids it pays the cost of the cell it expands from, which is the cell the
+# forward move enters.
+# Meeting in the middle only pays off for uninformed search: bi_dijkstra
+# settles roughly half the cells dijkstra does on open maps. It is no
+# substitute for A*, which expands over 10x fewer cells than bi_dijkstra on
+# open and random maps; bi_a_star lands within about 25% of a_star either way,
+# as its averaged potential is weaker than A*'s own heuristic.
+def bidirectional_search(grid, start, goal, algorithm="bi_a_star", trace=False, verbose=False,
+                         max_expansions=None, deadline=None, progress=None):
+    start_time = time.perf_counter()
+    grid = as_grid(grid)
+    cols, mask, neighbor_table, terrain = grid.cols, grid.mask, grid.neighbor_table, grid.cost_list
+    start_idx, goal_idx = grid.index(start), grid.index(goal)
+    visited_nodes = [] if trace else None
+    # Nothing steps into a wall, so a walled-in goal is out of reach of both sides
+    if _unreachable(grid, start_idx, goal_idx) or (start_idx != goal_idx and grid.cells.flat[goal_idx] != 0):
+        return _finish(SearchResult(algorithm, None, None, 0, 0, 0, time.perf_counter() - start_time,
+                                    visited_nodes), verbose)
+    expansions = 0
+    next_check = _first_check(max_expansions, deadline, progress)
+
+    use_h = algorithm == "bi_a_star"
+    (start_row, start_col), (goal_row, goal_col) = start, goal
+    h_extra = diagonal_extra(grid)
+    half_scale = grid.min_cost / 2
+    def potential(idx):
+        row, col = divmod(idx, cols)
+        dx, dy = abs(row - goal_row), abs(col - goal_col)
+        to_goal = max(dx, dy) + h_extra * min(dx, dy)
+        dx, dy = abs(row - start_row), abs(col - start_col)
+        return (to_goal - max(dx, dy) - h_extra * min(dx, dy)) * half_scale
+
+    # Side 0 searches from the start, side 1 from the goal; state holds the
+    # push id of a cell's live heap entry, or CLOSED
+    g_costs = ({start_idx: 0}, {goal_idx: 0})
+    parents = ({start_idx: -1}, {goal_idx: -1})
+    state = ({start_idx: 0}, {goal_idx: 1})
+    signs = (1, -1)
+    open_sets = ([(potential(start_idx) if use_h else 0, 0, start_idx)],
+                 [(-potential(goal_idx) if use_h else 0, 1, goal_idx)])
+    pushes = peak_open = 2
+    best, meeting = math.inf, None
+
+    while True:
+        for side in (0, 1):
+            open_set = open_sets[side]
+            while open_set and open_set[0][1] != state[side].get(open_set[0][2]):
+                heapq.heappop(open_set)  # superseded or already closed
+        if not open_sets[0] or not open_sets[1]:
+            break
+        if open_sets[0][0][0] + open_sets[1][0][0] >= best:
+            break
+        side = 0 if len(open_sets[0]) <= len(open_sets[1]) else 1
+        _, _, current = heapq.heappop(open_sets[side])
+        if expansions == next_check:
+            status = _budget_status(expansions, max_expansions, deadline, progress)
+            if status is not None:
+                return _finish(SearchResult(algorithm, None, None, expansions, pushes, peak_open,
+                                            time.perf_counter() - start_time, visited_nodes, status), verbose)
+            next_check = _next_check(expansions, max_expansions, deadline, progress)
+        own_g, own_state, other_g = g_costs[side], state[side], g_costs[1 - side]
+        own_state[current] = CLOSED
+        expansions += 1
+        if trace:
+            visited_nodes.append(divmod(current, cols))
+
+        if current in other_g and own_g[current] + other_g[current] < best:
+            best, meeting = own_g[current] + other_g[current], current
+        current_g = own_g[current]
+        for offset, move_cost in neighbor_table[mask[current]]:
+            neighbor = current + offset
+            if terrain is not None:
+                move_cost *= terrain[current if side else neighbor]
+            g_cost = current_g + move_cost
+            if neighbor in other_g and g_cost + other_g[neighbor] < best:
+                best, meeting = g_cost + other_g[neighbor], (current, neighbor) if side == 0 else (neighbor, current)
+            if own_state.get(neighbor) != CLOSED and g_cost < own_g.get(neighbor, math.inf):
+                own_g[neighbor] = g_cost
+                parents[side][neighbor] = current
+                own_state[neighbor] = pushes
+                key = g_cost + signs[side] * potential(neighbor) if use_h else g_cost
+                heapq.heappush(open_sets[side], (key, pushes, neighbor))
+                pushes += 1
+        open_size = len(open_sets[0]) + len(open_sets[1])
+        if open_size > peak_open:
+            peak_open = open_size
+
+    if meeting is None:
+        return _finish(SearchResult(algorithm, None, None, expansions, pushes, peak_open,
+                                    time.perf_counter() - start_time, visited_nodes), verbose)
+    forward_end, backward_end = meeting if isinstance(meeting, tuple) else (meeting, meeting)
+    path = _join_paths(grid, parents, forward_end, backward_end)
+    return _finish(SearchResult(algorithm, path, best, expansions, pushes, peak_open,
+                                time.perf_counter() - start_time, visited_nodes), verbose)
+
+# Start -> forward_end from the forward tree, then backward_end -> goal from
+# the backward tree (the two ends are the same cell or adjacent)
+def _join_paths(grid, parents, forward_end, backward_end):
+    path = trace_parents(grid, parents[0], forward_end)
+    if backward_end == forward_end:
+        backward_end = parents[1][backward_end]
+    while backward_end != -1:
+        path.append(grid.position(backward_end))
+        backward_end = parents[1][backward_end]
+    return path
+
+# Bidirectional BFS: fewest moves, like bfs(). The side with the smaller
+# frontier expands one whole layer at a time; the first layer that touches
+# the other side's visited cells holds the shortest meeting, so the search
+# stops after finishing it.
+def bidirectional_bfs(grid, start, goal, trace=False, verbose=False, max_expansions=None, deadline=None,
+                      progress=None):
+    start_time = time.perf_counter()
+    grid = as_grid(grid)
+    cols, mask, neighbor_table = grid.cols, grid.mask, grid.neighbor_table
+    start_idx, goal_idx = grid.index(start), grid.index(goal)
+    visited_nodes = [] if trace else None
+    if _unreachable(grid, start_idx, goal_idx) or (start_idx != goal_idx and grid.cells.flat[goal_idx] != 0):
+        return _finish(SearchResult("bi_bfs", None, None, 0, 0, 0, time.perf_counter() - start_time,
+                                    visited_nodes), verbose)
+    expansions = 0
+    next_check = _first_check(max_expansions, deadline, progress)
+
+    # depth[side][idx] is the move count from that side's root
+    depths = ({start_idx: 0}, {goal_idx: 0})
+    parents = ({start_idx: -1}, {goal_idx: -1})
+    frontiers = ([start_idx], [goal_idx])
+    pushes = peak_open = 2
+    best, meeting = math.inf, None
+    if start_idx == goal_idx:
+        best, meeting = 0, start_idx
+
+    while meeting is None and frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        own_depth, other_depth = depths[side], depths[1 - side]
+        next_frontier = []
+        for current in frontiers[side]:
+            if expansions == next_check:
+                status = _budget_status(expansions, max_expansions, deadline, progress)
+                if status is not None:
+                    return _finish(SearchResult("bi_bfs", None, None, expansions, pushes, peak_open,
+                                                time.perf_counter() - start_time, visited_nodes, status), verbose)
+                next_check = _next_check(expansions, max_expansions, deadline, progress)
+            expansions += 1
+            if trace:
+                visited_nodes.append(divmod(current, cols))
+            depth = own_depth[current] + 1
+            for offset, _ in neighbor_table[mask[current]]:
+                neighbor = current + offset
+                if neighbor in other_depth and depth + other_depth[neighbor] < best:
+                    best, meeting = depth + other_depth[neighbor], (current, neighbor) if side == 0 else (neighbor, current)
+                if neighbor not in own_depth:
+                    own_depth[neighbor] = depth
+                    parents[side][neighbor] = current
+                    next_frontier.append(neighbor)
+                    pushes += 1
+        frontiers[side][:] = next_frontier
+        open_size = len(frontiers[0]) + len(frontiers[1])
+        if open_size > peak_open:
+            peak_open = open_size
+
+    if meeting is None:
+        return _finish(SearchResult("bi_bfs", None, None, expansions, pushes, peak_open,
+                                    time.perf_counter() - start_time, visited_nodes), verbose)
+    forward_end, backward_end = meeting if isinstance(meeting, tuple) else (meeting, meeting)
+    path = _join_paths(grid, parents, forward_end, backward_end)
+    return _finish(SearchResult("bi_bfs", path, path_cost(path, grid), expansions, pushes, peak_open,
+                                time.perf_counter() - start_time, visited_nodes), verbose)
+
+# One-to-all distance fields. Instead of one heap pop at a time, whole
+# frontiers are expanded at once over flat NumPy index arrays: "unit" counts
+# moves breadth-first layer by layer, "octile" runs delta-stepping with bands
+# a few diagonals wide, relaxing each band to a fixpoint before moving on.
+# "octile" distances pay terrain costs like search() (a move costs its length
+# times the cost of the cell it enters); "unit" counts moves like bfs and
+# ignores them. Both return (dist, pred) arrays shaped like the grid; pred
+# holds the flat id of each cell's predecessor (-1 for the source and
+# unreached cells). terrain is the flat float64 cost layer or None.
+def _relax_frontier(grid, mask_flat, frontier, dist, terrain=None):
+    sources, targets, costs = [], [], []
+    bits = mask_flat[frontier]
+    for bit, (offset, move_cost) in enumerate(zip(grid.offsets, MOVE_COSTS)):
+        movers = frontier[(bits >> bit) & 1 == 1]
+        sources.append(movers)
+        targets.append(movers + offset)
+        costs.append(dist[movers] + (move_cost if terrain is None else move_cost * terrain[movers + offset]))
+    sources, targets, costs = np.concatenate(sources), np.concatenate(targets), np.concatenate(costs)
+    # Keep the cheapest candidate per target
+    order = np.lexsort((costs, targets))
+    targets, costs, sources = targets[order], costs[order], sources[order]
+    first = np.ones(targets.size, dtype=bool)
+    first[1:] = targets[1:] != targets[:-1]
+    return sources[first], targets[first], costs[first]
+
+# Corridors and mazes keep frontiers tiny, where per-pass NumPy overhead
+# dominates; after this many consecutive small passes the field is finished
+# one cell at a time from the cells still waiting to be relaxed.
+SMALL_FRONTIER = 32
+SMALL_FRONTIER_PASSES = 64
+
+def _finish_field(grid, dist, pred, seeds, unit):
+    mask, neighbor_table, terrain = grid.mask, grid.neighbor_table, grid.cost_list
+    seeds = np.unique(seeds).tolist()
+    if unit:
+        queue = deque(seeds)
+        while queue:
+            current = queue.popleft()
+            level = dist.item(current) + 1
+            for offset, _ in neighbor_table[mask[current]]:
+                neighbor = current + offset
+                if dist.item(neighbor) == math.inf:
+                    dist[neighbor] = level
+                    pred[neighbor] = current
+                    queue.append(neighbor)
+        return
+    open_set = [(dist.item(idx), idx) for idx in seeds]
+    heapq.heapify(open_set)
+    while open_set:
+        current_cost, current = heapq.heappop(open_set)
+        if current_cost > dist.item(current):
+            continue
+        for offset, move_cost in neighbor_table[mask[current]]:
+            neighbor = current + offset
+            new_cost = current_cost + (move_cost if terrain is None else move_cost * terrain[neighbor])
+            if new_cost < dist.item(neighbor):
+                dist[neighbor] = new_cost
+                pred[neighbor] = current
+                heapq.heappush(open_set, (new_cost, neighbor))
+
+def distance_field(grid, source, metric="octile"):
+    grid = as_grid(grid)
+    mask_flat = np.frombuffer(grid.mask, dtype=np.uint8)
+    dist = np.full(grid.size, np.inf)
+    pred = np.full(grid.size, -1, dtype=np.int32 if grid.size < 2 ** 31 else np.int64)
+    source_idx = grid.index(source)
+    dist[source_idx] = 0
+    frontier = np.array([source_idx], dtype=np.int64)
+    small_passes = 0
+
+    if metric == "unit":
+        level = 0
+        while frontier.size:
+            small_passes = small_passes + 1 if frontier.size < SMALL_FRONTIER else 0
+            if small_passes > SMALL_FRONTIER_PASSES:
+                _finish_field(grid, dist, pred, frontier, unit=True)
+                break
+            level += 1
+            sources, targets, _ = _relax_frontier(grid, mask_flat, frontier, dist)
+            new = np.isinf(dist[targets])
+            frontier = targets[new]
+            dist[frontier] = level
+            pred[frontier] = sources[new]
+    elif metric == "octile":
+        terrain = grid.costs.reshape(-1).astype(np.float64) if grid.costs is not None else None
+        band_width = 4 * SQRT2 * grid.min_cost  # wider bands trade a few re-relaxations for fewer passes
+        limit = band_width
+        pending = frontier
+        while pending.size:
+            in_band = dist[pending] < limit
+            frontier, pending = np.unique(pending[in_band]), pending[~in_band]
+            while frontier.size:
+                small_passes = small_passes + 1 if frontier.size < SMALL_FRONTIER else 0
+                if small_passes > SMALL_FRONTIER_PASSES:
+                    _finish_field(grid, dist, pred, np.concatenate((frontier, pending)), unit=False)
+                    return dist.reshape(grid.rows, grid.cols), pred.reshape(grid.rows, grid.cols)
+                sources, targets, costs = _relax_frontier(grid, mask_flat, frontier, dist, terrain)
+                better = costs < dist[targets]
+                targets, costs = targets[better], costs[better]
+                dist[targets] = costs
+                pred[targets] = sources[better]
+                in_band = costs < limit
+                frontier = targets[in_band]
+                pending = np.concatenate((pending, targets[~in_band]))
+            limit += band_width
+    else:
+        raise ValueError(f"Unknown metric: {metric}")
+    return dist.reshape(grid.rows, grid.cols), pred.reshape(grid.rows, grid.cols)
+
+# Read a single path out of a distance field without searching again
+def field_path(dist, pred, target):
+    if not np.isfinite(dist[target[0], target[1]]):
+        return None
+    cols = pred.shape[1]
+    pred_flat = pred.reshape(-1)
+    current = target[0] * cols + target[1]
+    path = []
+    while current != -1:
+        path.append(divmod(current, cols))
+        current = int(pred_flat[current])
+    return path[::-1]
+
+# Solvers that run straight off a grid, and a single place to dispatch them
+ALGORITHMS = ["a_star", "dijkstra", "greedy", "bfs", "dfs", "jps", "bi_a_star", "bi_dijkstra", "bi_bfs",
+              "bucket_dijkstra"]
+
+# Algorithms that assume every move costs 1 or sqrt(2) and refuse terrain grids
+UNIFORM_COST_ALGORITHMS = ["jps", "hpa", "alt"]
+# Algorithms that only support CONNECT_8
+CORNER_CUTTING_ALGORITHMS = ["jps"]
+
+# Bump whenever a solver's paths or metrics change, so cached results expire
+SOLVER_VERSION = 2
+
+# Extra keyword arguments (trace, verbose, budgets, progress) are passed
+# through to the solver
+def run_algorithm(grid, start, goal, algorithm, **options):
+    if algorithm in ["a_star", "dijkstra", "greedy", "jps"]:
+        return search(grid, start, goal, algorithm=algorithm, **options)
+    if algorithm == "anytime":
+        return anytime_search(grid, start, goal, **options)
+    if algorithm == "bfs":
+        return bfs(grid, start, goal, **options)
+    if algorithm == "dfs":
+        return dfs(grid, start, goal, **options)
+    if algorithm in ["bi_a_star", "bi_dijkstra"]:
+        return bidirectional_search(grid, start, goal, algorithm=algorithm, **options)
+    if algorithm == "bi_bfs":
+        return bidirectional_bfs(grid, start, goal, **options)
+    if algorithm == "bucket_dijkstra":
+        return bucket_dijkstra(grid, start, goal, **options)
+    raise ValueError(f"Unknown algorithm: {algorithm}")
+
+# Anytime weighted A*: weighted A* restarted with shrinking weights, keeping
+# the cheapest path so far. A first path bounded by weights[0] times the
+# optimum comes back quickly and then improves while the budget lasts. The
+# result is FOUND once every pass has run (the last weight, 1.0, is plain A*)
+# or BUDGET_EXCEEDED / CANCELLED with the best path found before that; bound
+# is the weight of the last completed pass. on_improve(result) is called with
+# each pass that finds a cheaper path.
+ANYTIME_WEIGHTS = (3.0, 2.0, 1.5, 1.25, 1.0)
+
+def anytime_search(grid, start, goal, heuristic=None, weights=ANYTIME_WEIGHTS, trace=False, verbose=False,
+                   max_expansions=None, deadline=None, progress=None, on_improve=None):
+    start_time = time.perf_counter()
+    grid = as_grid(grid)
+    best, bound, status = None, None, NO_PATH
+    expansions = pushes = peak_open = 0
+    visited_nodes = [] if trace else None
+    for weight in weights:
+        remaining = None if max_expansions is None else max_expansions - expansions
+        result = search(grid, start, goal, "a_star", heuristic, trace=trace, max_expansions=remaining,
+                        deadline=deadline, progress=progress, weight=weight)
+        expansions += result.expansions
+        pushes += result.pushes
+        peak_open = max(peak_open, result.peak_open)
+        if trace:
+            visited_nodes.extend(result.visited_nodes)
+        if result.status in (BUDGET_EXCEEDED, CANCELLED):
+            status = result.status
+            break
+        if result.path is None:
+            break  # unreachable, and no weight changes that
+        if best is None or result.cost < best.cost:
+            best = result
+            if on_improve is not None:
+                on_improve(result)
+        bound, status = weight, FOUND
+    return _finish(SearchResult("anytime", best.path if best else None, best.cost if best else None,
+                                expansions, pushes, peak_open, time.perf_counter() - start_time,
+                                visited_nodes, status, bound), verbose)
+
+# Octile cost of a cell path (1 per straight step, sqrt(2) per diagonal),
+# times the cost of each entered cell when the grid has terrain costs
+def path_cost(path, grid=None):
+    if grid is None or grid.costs is None:
+        return sum(SQRT2 if r1 != r2 and c1 != c2 else 1 for (r1, c1), (r2, c2) in zip(path, path[1:]))
+    costs = grid.costs
+    return sum((SQRT2 if r1 != r2 and c1 != c2 else 1) * costs[r2, c2].item()
+               for (r1, c1), (r2, c2) in zip(path, path[1:]))
+
+# Log metrics of a SearchResult; solvers only call this when verbose=True
+def print_metrics(result):
+    print(f"\n--- {result.algorithm.upper()} Performance ---")
+    print(f"Time taken: {result.duration:.6f} sec")
+    print(f"Nodes expanded: {result.expansions}")
+    print(f"Peak open set: {result.peak_open}")
+    if result.path:
+        print(f"Path length: {len(result.path)}")
+        print(f"Total cost: {result.cost:.2f}")
+        if result.bound is not None:
+            print(f"Suboptimality bound: {result.bound:g}")
+    elif result.status == BUDGET_EXCEEDED:
+        print("Budget exceeded before a path was found.")
+    elif result.status == CANCELLED:
+        print("Search stopped early.")
     else:
         print("No path found.")
 
-# Load grid from txt
+# Streaming parser for the text map format: one row per line, single digit
+# cells separated by spaces. The input is read in chunks and written straight
+# into a preallocated uint8 array, so peak memory stays close to the array
+# itself. Blank lines are skipped; every other line must have the same width.
+TXT_CHUNK_SIZE = 1 << 20
+_DIGIT = np.zeros(256, dtype=bool)
+_DIGIT[ord('0'):ord('9') + 1] = True
+_TXT_ALLOWED = _DIGIT.copy()
+_TXT_ALLOWED[[ord(' '), ord('\t'), ord('\r'), ord('\n')]] = True
+
+def _parse_txt_lines(block, first_line):
+    data = np.frombuffer(block, dtype=np.uint8)
+    bad = np.flatnonzero(~_TXT_ALLOWED[data])
+    if bad.size:
+        line = first_line + block.count(b"\n", 0, int(bad[0]))
+        raise ValueError(f"line {line}: unexpected character {chr(data[bad[0]])!r} in map")
+    digit = _DIGIT[data]
+    joined = np.flatnonzero(digit[:-1] & digit[1:])
+    if joined.size:
+        line = first_line + block.count(b"\n", 0, int(joined[0]))
+        raise ValueError(f"line {line}: cells must be single digits separated by spaces")
+    # Cells per line; every line slice ends in its newline, so none is empty
+    starts = np.flatnonzero(data == ord('\n'))[:-1] + 1
+    counts = np.add.reduceat(digit, np.concatenate(([0], starts)), dtype=np.int32)
+    return data[digit] - ord('0'), counts
+
+def parse_grid_txt(source, chunk_size=TXT_CHUNK_SIZE):
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            return parse_grid_txt(f, chunk_size)
+    # Seekable inputs get an exact row count up front; anything else collects
+    # rows per chunk and joins them at the end
+    max_rows = None
+    if source.seekable():
+        begin = source.tell()
+        max_rows = 1
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            max_rows += chunk.count(b"\n")
+        source.seek(begin)
+
+    cells, parts, cols, rows, line = None, [], None, 0, 1
+    tail = b""
+    while True:
+        chunk = source.read(chunk_size)
+        block = tail + chunk
+        if chunk:
+            cut = block.rfind(b"\n") + 1
+            block, tail = block[:cut], block[cut:]
+        elif block and not block.endswith(b"\n"):
+            block += b"\n"
+        if block:
+            values, counts = _parse_txt_lines(block, line)
+            filled = counts > 0
+            if cols is None and filled.any():
+                cols = int(counts[filled][0])
+                if max_rows is not None:
+                    cells = np.empty((max_rows, cols), dtype=np.uint8)
+            wrong = np.flatnonzero(filled & (counts != cols))
+            if wrong.size:
+                raise ValueError(f"line {line + int(wrong[0])}: expected {cols} cells, got {counts[wrong[0]]}")
+            new_rows = int(filled.sum())
+            if new_rows:
+                if cells is not None:
+                    cells[rows:rows + new_rows] = values.reshape(new_rows, cols)
+                else:
+                    parts.append(values.reshape(new_rows, cols))
+                rows += new_rows
+            line += len(counts)
+        if not chunk:
+            break
+
+    if not rows:
+        raise ValueError("map has no cells")
+    return cells[:rows] if cells is not None else np.concatenate(parts)
+
+# Load grid from txt as a uint8 array
 def load_grid_from_txt(file_path):
-    with open(file_path, 'r') as f:
-        return [[int(cell) for cell in line.strip().split()] for line in f]
+    return parse_grid_txt(file_path)
+
+# Terrain for a .txt map lives in a <map>.costs.txt sidecar in the same
+# format, one digit cost (1-9) per cell; walls may hold any digit
+COSTS_TXT_SUFFIX = ".costs.txt"
+
+def costs_txt_path(txt_path):
+    return os.path.splitext(txt_path)[0] + COSTS_TXT_SUFFIX
+
+# The map's cost layer as uint8, or None when it has no sidecar
+def load_costs_txt(txt_path):
+    costs_path = costs_txt_path(txt_path)
+    return parse_grid_txt(costs_path) if os.path.exists(costs_path) else None
+
+def save_costs_txt(txt_path, costs):
+    costs = np.asarray(costs)
+    if not (np.equal(np.mod(costs, 1), 0).all() and costs.min() >= 0 and costs.max() <= 9):
+        raise ValueError("text cost layers hold single digit costs; save float costs as a binary map")
+    with open(costs_txt_path(txt_path), 'w') as f:
+        for row in costs.astype(np.uint8):
+            f.write(" ".join(map(str, row.tolist())) + "\n")
+
+# Binary maps: a fixed header (magic, version, flags, rows, cols, start and
+# goal with -1 for unset) padded to MAP_DATA_OFFSET, then the cells row-major
+# as uint8, or bit-packed eight cells per byte with MAP_PACKED. A terrain
+# layer (MAP_COSTS_U8 or MAP_COSTS_F32, little-endian) follows the cells at
+# the next 8-byte boundary. Unpacked cells and the cost layer load as
+# copy-on-write memory maps: no parsing or copying up front, and edits made
+# through Grid.set_cell never reach the file.
+MAP_MAGIC = b"GMAP"
+MAP_VERSION = 1
+MAP_PACKED = 1
+MAP_COSTS_U8 = 2
+MAP_COSTS_F32 = 4
+MAP_HEADER = struct.Struct("<4sBBxxIIiiii")
+MAP_DATA_OFFSET = 64
+MAP_SUFFIX = ".gmap"
+
+def _costs_offset(flags, rows, cols):
+    cell_bytes = (rows * cols + 7) // 8 if flags & MAP_PACKED else rows * cols
+    return MAP_DATA_OFFSET + (cell_bytes + 7) // 8 * 8
+
+# costs defaults to the Grid's own cost layer when cells is a Grid
+def save_grid_bin(file_path, cells, start=None, goal=None, packed=False, costs=None):
+    if isinstance(cells, Grid):
+        costs = cells.costs if costs is None else costs
+        cells = cells.cells
+    cells = np.ascontiguousarray(cells, dtype=np.uint8)
+    rows, cols = cells.shape
+    start_r, start_c = start if start is not None else (-1, -1)
+    goal_r, goal_c = goal if goal is not None else (-1, -1)
+    flags = MAP_PACKED if packed else 0
+    if costs is not None:
+        costs = np.asarray(costs)
+        costs = costs if costs.dtype == np.uint8 else costs.astype('<f4')
+        flags |= MAP_COSTS_U8 if costs.dtype == np.uint8 else MAP_COSTS_F32
+    header = MAP_HEADER.pack(MAP_MAGIC, MAP_VERSION, flags, rows, cols, start_r, start_c, goal_r, goal_c)
+    with open(file_path, 'wb') as f:
+        f.write(header.ljust(MAP_DATA_OFFSET, b"\0"))
+        f.write(np.packbits(cells != 0).tobytes() if packed else cells.tobytes())
+        if costs is not None:
+            f.write(b"\0" * (_costs_offset(flags, rows, cols) - f.tell()))
+            f.write(np.ascontiguousarray(costs).tobytes())
+
+def is_grid_bin(file_path):
+    with open(file_path, 'rb') as f:
+        return f.read(len(MAP_MAGIC)) == MAP_MAGIC
+
+# Returns (cells, meta) with meta holding "start", "goal" and "costs" (None
+# when unset)
+def load_grid_bin(file_path):
+    with open(file_path, 'rb') as f:
+        header = f.read(MAP_HEADER.size)
+    if len(header) < MAP_HEADER.size or header[:len(MAP_MAGIC)] != MAP_MAGIC:
+        raise ValueError(f"{file_path} is not a binary map")
+    _, version, flags, rows, cols, start_r, start_c, goal_r, goal_c = MAP_HEADER.unpack(header)
+    if version != MAP_VERSION:
+        raise ValueError(f"{file_path} has unsupported map version {version}")
+    if flags & MAP_PACKED:
+        packed = np.fromfile(file_path, dtype=np.uint8, offset=MAP_DATA_OFFSET)
+        cells = np.unpackbits(packed, count=rows * cols).reshape(rows, cols)
+    else:
+        cells = np.memmap(file_path, dtype=np.uint8, mode='c', offset=MAP_DATA_OFFSET, shape=(rows, cols))
+    costs = None
+    if flags & (MAP_COSTS_U8 | MAP_COSTS_F32):
+        costs = np.memmap(file_path, dtype=np.uint8 if flags & MAP_COSTS_U8 else '<f4', mode='c',
+                          offset=_costs_offset(flags, rows, cols), shape=(rows, cols))
+    meta = {
+        "start": (start_r, start_c) if start_r >= 0 else None,
+        "goal": (goal_r, goal_c) if goal_r >= 0 else None,
+        "costs": costs,
+    }
+    return cells, meta
+
+# Start/goal from the JSON sidecar the grid editor writes next to a .txt map
+def load_map_meta(txt_path):
+    meta_path = os.path.splitext(txt_path)[0] + ".json"
+    meta = {"start": None, "goal": None}
+    if os.path.exists(meta_path):
+        with open(meta_path) as f:
+            data = json.load(f)
+        for key in meta:
+            value = data.get(key)
+            if value is not None and None not in value:
+                meta[key] = tuple(value)
+    return meta
+
+# Load a binary or .txt map by content; returns (cells, meta) either way, with
+# the terrain layer (or None) in meta["costs"]
+def load_map(file_path):
+    if is_grid_bin(file_path):
+        return load_grid_bin(file_path)
+    meta = load_map_meta(file_path)
+    meta["costs"] = load_costs_txt(file_path)
+    return load_grid_from_txt(file_path), meta
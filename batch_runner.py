@@ -0,0 +1,212 @@
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+import numpy as np
+from a_star_pathfinding_multi import (BUDGET_EXCEEDED, CANCELLED, CONNECT_8, Grid, SearchResult, load_map,
+                                      run_algorithm, search)
+from components import ComponentIndex, load_or_build_components
+from hpa_star import AbstractGraph, hpa_search, load_or_build_abstract_graph
+from landmarks import LandmarkHeuristic, load_or_build_landmarks
+
+# Many-to-many query runner. Each distinct map is copied once into a shared
+# memory segment; tasks only carry the segment name, and every worker process
+# attaches to a segment the first time it sees it and keeps the Grid around
+# for the rest of the batch. Results are yielded as soon as each job finishes.
+# Every worker grid carries connected-component labels (components.py), so
+# queries between disconnected cells come back without a search.
+
+COMPONENTS_SUFFIX = ".cc.npz"
+
+# Modes that need per-map preprocessing: cache file suffix, builder used by the
+# parent to refresh the on-disk copy, and the class workers load it with
+PREPROCESSED = {
+    "hpa": (".hpa.npz", load_or_build_abstract_graph, AbstractGraph),
+    "alt": (".alt.npz", load_or_build_landmarks, LandmarkHeuristic),
+}
+
+# On-disk cache next to a map file; other connectivities get their own file
+# so switching modes does not keep rebuilding one cache
+def _cache_path(map_key, suffix, connectivity):
+    if connectivity == CONNECT_8:
+        return f"{map_key}{suffix}"
+    return f"{map_key}.{connectivity}{suffix}"
+
+# Per-worker caches, keyed by shared memory segment name
+_worker_grids = {}
+_worker_preprocessed = {}
+
+# A terrain layer goes in the same segment, right after the cells at the next
+# 8-byte boundary; cost_dtype is None for uniform maps. The connectivity
+# travels with the segment name so workers build the same neighbor mask.
+def _costs_offset(shape):
+    return (shape[0] * shape[1] + 7) // 8 * 8
+
+def _share_grid(grid):
+    costs = grid.costs if isinstance(grid, Grid) else None
+    cells = np.ascontiguousarray(grid.cells if isinstance(grid, Grid) else grid, dtype=np.uint8)
+    size = cells.nbytes if costs is None else _costs_offset(cells.shape) + costs.nbytes
+    segment = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    np.ndarray(cells.shape, dtype=np.uint8, buffer=segment.buf)[:] = cells
+    if costs is not None:
+        np.ndarray(cells.shape, dtype=costs.dtype, buffer=segment.buf, offset=_costs_offset(cells.shape))[:] = costs
+    connectivity = grid.connectivity if isinstance(grid, Grid) else CONNECT_8
+    return segment, cells.shape, None if costs is None else costs.dtype.str, connectivity
+
+# components_path is the saved labels of a map file; in-memory maps have none
+# and their labels are built here, once per worker
+def _attach_grid(segment_name, shape, cost_dtype=None, components_path=None, connectivity=CONNECT_8):
+    if segment_name not in _worker_grids:
+        # Pool workers share the parent's resource tracker, so attaching here
+        # does not hand ownership of the segment to the worker
+        segment = shared_memory.SharedMemory(name=segment_name)
+        cells = np.ndarray(shape, dtype=np.uint8, buffer=segment.buf)
+        costs = None
+        if cost_dtype is not None:
+            costs = np.ndarray(shape, dtype=cost_dtype, buffer=segment.buf, offset=_costs_offset(shape))
+        grid = Grid(cells, costs, connectivity)
+        grid.components = ComponentIndex.load(components_path, grid) if components_path else ComponentIndex.build(grid)
+        _worker_grids[segment_name] = (segment, grid)
+    return _worker_grids[segment_name][1]
+
+def _preprocessed(grid, segment_name, cache_path, algorithm):
+    key = (segment_name, algorithm)
+    if key not in _worker_preprocessed:
+        kind = PREPROCESSED[algorithm][2]
+        _worker_preprocessed[key] = kind.load(cache_path, grid) if cache_path else kind.build(grid)
+    return _worker_preprocessed[key]
+
+def _solve(grid, segment_name, cache_path, start, goal, algorithm, **limits):
+    if algorithm == "hpa":
+        limits.pop("progress", None)
+        return hpa_search(grid, start, goal, _preprocessed(grid, segment_name, cache_path, algorithm), **limits)
+    if algorithm == "alt":
+        heuristic = _preprocessed(grid, segment_name, cache_path, algorithm)
+        return search(grid, start, goal, "a_star", heuristic=heuristic, **limits)
+    return run_algorithm(grid, start, goal, algorithm, **limits)
+
+# Progress callback for one solver run. `progress` is a shared mapping (such as
+# a multiprocessing.Manager dict) that receives job id -> (expansions, elapsed
+# seconds), and setting the Event-like `cancel` stops the search.
+def _make_monitor(job_id, progress, cancel):
+    if progress is None and cancel is None:
+        return None
+    start_time = time.perf_counter()
+    def monitor(expansions):
+        elapsed = time.perf_counter() - start_time
+        if progress is not None:
+            progress[job_id] = (expansions, elapsed)
+        return cancel is not None and cancel.is_set()
+    return monitor
+
+# Solver keyword arguments for one timed run; budget is (seconds, expansions)
+# with None for no limit
+def _limits(job_id, progress, cancel, budget):
+    max_seconds, max_expansions = budget or (None, None)
+    limits = {"progress": _make_monitor(job_id, progress, cancel), "max_expansions": max_expansions}
+    if max_seconds is not None:
+        limits["deadline"] = time.perf_counter() + max_seconds
+    return limits
+
+def _run_job(job_id, segment_name, shape, cache_path, start, goal, algorithm, repeats=1, warmup=0,
+             progress=None, cancel=None, budget=None, components_path=None, cost_dtype=None,
+             connectivity=CONNECT_8, trace=False):
+    grid = _attach_grid(segment_name, shape, cost_dtype, components_path, connectivity)
+    if progress is not None:
+        progress[job_id] = (0, 0.0)
+    if cancel is not None and cancel.is_set():
+        result = SearchResult(algorithm, None, None, 0, 0, 0, 0.0, status=CANCELLED)
+        times = [0.0]
+    else:
+        # Warmup runs get the same budget and cancel token as timed ones, so a
+        # bounded job never runs unbounded before its first timed run
+        for _ in range(warmup):
+            limits = _limits(job_id, progress, cancel, budget)
+            if _solve(grid, segment_name, cache_path, start, goal, algorithm, **limits).status in (
+                    BUDGET_EXCEEDED, CANCELLED):
+                break
+        times = []
+        for _ in range(max(repeats, 1)):
+            limits = _limits(job_id, progress, cancel, budget)
+            result = _solve(grid, segment_name, cache_path, start, goal, algorithm, trace=trace, **limits)
+            times.append(result.duration)
+            if result.status in (BUDGET_EXCEEDED, CANCELLED):
+                break
+    if progress is not None:
+        progress[job_id] = (result.expansions, result.duration)
+    # The expansion order goes back as one (n, 2) array, far cheaper to
+    # pickle than a list of tuples
+    visited = None
+    if trace:
+        visited = np.array(result.visited_nodes or (), dtype=np.int32 if max(shape) < 2 ** 31 else np.int64)
+    return {
+        "job": job_id,
+        "algorithm": algorithm,
+        "start": start,
+        "goal": goal,
+        "status": result.status,
+        "path": result.path,
+        "nodes_expanded": result.expansions,
+        "pushes": result.pushes,
+        "peak_open": result.peak_open,
+        "cost": result.cost,
+        "time": statistics.median(times),
+        "times": times,
+        "visited": visited,
+    }
+
+# jobs: iterable of (map, start, goal, algorithm). map is a key into `maps`
+# (any grid form) or else a .txt or binary map path. Yields one result dict per job in
+# completion order; the "job" field is the job's position in the input.
+# Each job is solved `warmup` times untimed and then `repeats` times; "times"
+# lists every timed run and "time" is their median.
+# progress and cancel are shared with every worker (see _make_monitor), and
+# budgets maps an algorithm to its (seconds, expansions) limit. Jobs stopped by
+# a budget come back with status "budget_exceeded", cancelled ones "cancelled".
+# connectivity applies to maps loaded from files; Grids in `maps` keep their own.
+# With trace=True every result also carries "visited", the last timed run's
+# expansion order as an (n, 2) array of cells (None otherwise).
+def run_batch(jobs, maps=None, workers=None, repeats=1, warmup=0, progress=None, cancel=None, budgets=None,
+              connectivity=CONNECT_8, trace=False):
+    maps = maps or {}
+    grids = {}
+    segments = {}
+    cache_paths = {}
+    pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count())
+    try:
+        futures = {}
+        for job_id, (map_key, start, goal, algorithm) in enumerate(jobs):
+            if map_key not in segments:
+                if map_key in maps:
+                    grids[map_key] = maps[map_key]
+                else:
+                    cells, meta = load_map(map_key)
+                    grids[map_key] = Grid(cells, meta["costs"], connectivity)
+                segments[map_key] = _share_grid(grids[map_key])
+                if map_key not in maps:
+                    cache_paths[map_key] = _cache_path(map_key, COMPONENTS_SUFFIX, connectivity)
+                    load_or_build_components(grids[map_key], cache_paths[map_key])
+            if algorithm in PREPROCESSED and (map_key, algorithm) not in cache_paths:
+                # Build or refresh the on-disk tables once here so workers only load them
+                cache_path = None
+                if map_key not in maps:
+                    suffix, load_or_build, _ = PREPROCESSED[algorithm]
+                    cache_path = _cache_path(map_key, suffix, connectivity)
+                    load_or_build(grids[map_key], cache_path)
+                cache_paths[(map_key, algorithm)] = cache_path
+            segment, shape, cost_dtype, grid_connectivity = segments[map_key]
+            future = pool.submit(_run_job, job_id, segment.name, shape, cache_paths.get((map_key, algorithm)),
+                                 tuple(start), tuple(goal), algorithm, repeats, warmup,
+                                 progress, cancel, (budgets or {}).get(algorithm), cache_paths.get(map_key),
+                                 cost_dtype, grid_connectivity, trace)
+            futures[future] = map_key
+        for future in as_completed(futures):
+            result = future.result()
+            result["map"] = futures[future]
+            yield result
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+        for segment, *_ in segments.values():
+            segment.close()
+            segment.unlink()
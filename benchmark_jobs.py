@@ -0,0 +1,107 @@
+import itertools
+import multiprocessing
+import threading
+import time
+from batch_runner import run_batch
+
+# Benchmark jobs that run off the caller's thread. Each BenchmarkJob drives
+# run_batch from a daemon thread; workers write (expansions, elapsed) into a
+# Manager dict and watch a Manager Event for cancellation, so a UI can poll
+# snapshot() on every refresh without ever waiting on a solver.
+
+MAX_JOBS = 32  # finished jobs kept around for late polls
+
+_manager = None
+_manager_lock = threading.Lock()
+
+def _get_manager():
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = multiprocessing.Manager()
+        return _manager
+
+class BenchmarkJob:
+    # budgets: algorithm -> (seconds, expansions), None for no limit.
+    # on_result(result) is called on the job thread as each algorithm finishes.
+    # trace=True keeps each run's expansion order (see run_batch).
+    def __init__(self, map_name, grid, start, goal, algorithms, budgets=None, workers=None, on_result=None,
+                 trace=False):
+        manager = _get_manager()
+        self.map_name = map_name
+        self.start = tuple(start)
+        self.goal = tuple(goal)
+        self.algorithms = list(algorithms)
+        self.budgets = budgets
+        self.progress = manager.dict()
+        self.cancel_event = manager.Event()
+        self.results = {}
+        self.error = None
+        self.started = time.time()
+        self.finished = None
+        self._grid = grid
+        self._workers = workers
+        self._on_result = on_result
+        self._trace = trace
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        jobs = [(self.map_name, self.start, self.goal, algo) for algo in self.algorithms]
+        try:
+            for result in run_batch(jobs, maps={self.map_name: self._grid}, workers=self._workers,
+                                    progress=self.progress, cancel=self.cancel_event, budgets=self.budgets,
+                                    trace=self._trace):
+                self.results[result["algorithm"]] = result
+                if self._on_result is not None:
+                    self._on_result(result)
+        except Exception as e:
+            self.error = e
+        finally:
+            self._grid = None
+            self.finished = time.time()
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    # One row per algorithm: state is queued, running, or the result status
+    def snapshot(self):
+        progress = dict(self.progress)
+        rows = []
+        for job_id, algo in enumerate(self.algorithms):
+            result = self.results.get(algo)
+            expansions, elapsed = progress.get(job_id, (0, 0.0))
+            if result is not None:
+                state, expansions, elapsed = result["status"], result["nodes_expanded"], result["time"]
+            elif job_id in progress:
+                state = "running"
+            else:
+                state = "queued"
+            rows.append({"algorithm": algo, "state": state, "expansions": expansions, "elapsed": elapsed})
+        return rows
+
+# Process-wide registry so any session (or rerun) can find a job by id
+class JobManager:
+    def __init__(self, max_jobs=MAX_JOBS):
+        self.max_jobs = max_jobs
+        self._jobs = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, *args, **kwargs):
+        job = BenchmarkJob(*args, **kwargs)
+        with self._lock:
+            job_id = next(self._ids)
+            self._jobs[job_id] = job
+            finished = [jid for jid, j in self._jobs.items() if not j.running]
+            for jid in finished[:max(0, len(self._jobs) - self.max_jobs)]:
+                del self._jobs[jid]
+        return job_id
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
@@ -1,8 +1,19 @@
 import os
-import csv
-from a_star_pathfinding_multi import load_grid_from_txt, search, bfs, dfs
+import json
+import sys
+import time
+import platform
+import argparse
+import numpy as np
+from a_star_pathfinding_multi import (CONNECT_8, CONNECTIVITIES, CORNER_CUTTING_ALGORITHMS, UNIFORM_COST_ALGORITHMS, Grid,
+                                      costs_txt_path, distance_field, is_grid_bin, load_grid_bin, load_map_meta)
+from batch_runner import run_batch
+from map_generators import generate_map
+from multi_agent import MAPF_METHODS, plan_agents, random_agents
+from results_store import DEFAULT_DB, open_store
 
-# 📂 Define your maps here
+# 📂 Define your maps here (.txt or binary). Entries without start/goal take
+# them from the binary header or the .txt map's .json sidecar.
 maps = [
     {"file": "map.txt", "start": (0, 0), "goal": (9, 9)},
     {"file": "maze1.txt", "start": (0, 0), "goal": (4, 6)},
@@ -11,63 +22,256 @@ maps = [
 ]
 
 # 📌 Supported algorithms
-algorithms = ["a_star", "dijkstra", "greedy", "bfs", "dfs"]
+algorithms = ["a_star", "dijkstra", "greedy", "bfs", "dfs", "jps", "bi_a_star", "bi_dijkstra", "bi_bfs",
+              "bucket_dijkstra", "hpa", "alt"]
 
-# Output file
-output_csv = "results.csv"
+# Output database
+results_db = DEFAULT_DB
 
-# CSV headers
-headers = ["Map", "Algorithm", "Time(s)", "Nodes Expanded", "Path Length", "Total Cost", "Found"]
+# Generated suite defaults: map kinds as "kind" or "random:<density>"
+SUITE_SIZES = [64, 256]
+SUITE_KINDS = ["open", "random:0.1", "random:0.2", "random:0.3", "maze", "rooms"]
+DEFAULT_RESULTS = "benchmark_results.json"
+DEFAULT_TOLERANCE = 0.10
+DEFAULT_MIN_DELTA = 0.001  # seconds; sub-millisecond swings are timer noise
+DEFAULT_AGENT_TIME_LIMIT = 30.0  # seconds per multi-agent plan
 
-def benchmark():
-    results = []
+def _map_endpoints(map_data):
+    if "start" in map_data and "goal" in map_data:
+        return map_data["start"], map_data["goal"]
+    grid_file = map_data["file"]
+    meta = load_grid_bin(grid_file)[1] if is_grid_bin(grid_file) else load_map_meta(grid_file)
+    return meta["start"], meta["goal"]
 
-    for map_data in maps:
-        grid_file = map_data["file"]
-        start = map_data["start"]
-        goal = map_data["goal"]
+def _has_terrain(grid_file):
+    if is_grid_bin(grid_file):
+        return load_grid_bin(grid_file)[1]["costs"] is not None
+    return os.path.exists(costs_txt_path(grid_file))
+
+def _skip_reason(algo, terrain, connectivity):
+    if terrain and algo in UNIFORM_COST_ALGORITHMS:
+        return "it needs uniform move costs"
+    if connectivity != CONNECT_8 and algo in CORNER_CUTTING_ALGORITHMS:
+        return f"it does not support {connectivity}-connected grids"
+    return None
 
-        try:
-            grid = load_grid_from_txt(grid_file)
-        except FileNotFoundError:
+def benchmark(workers=None, repeats=1, warmup=0, map_list=None, db_file=None, connectivity=CONNECT_8):
+    jobs = []
+    for map_data in map_list or maps:
+        grid_file = map_data["file"]
+        if not os.path.exists(grid_file):
             print(f"❌ Map file not found: {grid_file}")
             continue
-
+        start, goal = _map_endpoints(map_data)
+        if start is None or goal is None:
+            print(f"❌ No start/goal stored for {grid_file}")
+            continue
+        terrain = _has_terrain(grid_file)
         for algo in algorithms:
-            print(f"\n▶ Running {algo.upper()} on {grid_file}")
-
-            # Run the correct algorithm
-            if algo in ["a_star", "dijkstra", "greedy"]:
-                path, visited = search(grid, start, goal, algorithm=algo)
-            elif algo == "bfs":
-                path, visited = bfs(grid, start, goal)
-            elif algo == "dfs":
-                path, visited = dfs(grid, start, goal)
-            else:
+            reason = _skip_reason(algo, terrain, connectivity)
+            if reason:
+                print(f"ℹ️ Skipping {algo} on {grid_file}: {reason}")
                 continue
+            jobs.append((grid_file, start, goal, algo))
+
+    # Jobs run across a process pool; rows are put back in job order
+    rows = {}
+    for result in run_batch(jobs, workers=workers, repeats=repeats, warmup=warmup, connectivity=connectivity):
+        print(f"▶ {result['algorithm'].upper()} on {result['map']} done")
+        path = result["path"]
+        found = bool(path)
+        path_len = len(path) if path else 0
+
+        rows[result["job"]] = [
+            result["map"],
+            result["algorithm"],
+            f"{result['time']:.6f}",
+            result["nodes_expanded"],
+            path_len,
+            f"{result['cost']:.2f}" if found else "-",
+            "Yes" if found else "No"
+        ]
+    results = [rows[job] for job in sorted(rows)]
+
+    store = open_store(db_file or results_db)
+    store.add_runs(results)
+    print(f"\n✅ Results saved to {store.path}")
+
+def _parse_kind(spec):
+    kind, _, density = spec.partition(":")
+    return kind, float(density) if density else None
+
+# Start at the first free cell and aim for the reachable cell farthest from
+# it, so every generated case has a path and a long one
+def _pick_endpoints(grid):
+    free = np.flatnonzero(grid.cells.reshape(-1) == 0)
+    start = divmod(int(free[0]), grid.cols)
+    dist, _ = distance_field(grid, start)
+    goal = np.unravel_index(int(np.argmax(np.where(np.isfinite(dist), dist, -1))), dist.shape)
+    return start, (int(goal[0]), int(goal[1]))
+
+# Timed cases over generated maps. Returns one record per (map, algorithm) with
+# median/p95 timings over `repeats` runs after `warmup` untimed runs.
+def run_suite(sizes=SUITE_SIZES, kinds=SUITE_KINDS, algos=algorithms, repeats=5, warmup=1, workers=1, seed=0,
+              connectivity=CONNECT_8):
+    grids, cases, jobs = {}, {}, []
+    for size in sizes:
+        for spec in kinds:
+            kind, density = _parse_kind(spec)
+            name = f"{spec}-{size}" if connectivity == CONNECT_8 else f"{spec}-{size}-{connectivity}"
+            grids[name] = Grid(generate_map(kind, size, seed, density), connectivity=connectivity)
+            start, goal = _pick_endpoints(grids[name])
+            for algo in algos:
+                if _skip_reason(algo, False, connectivity):
+                    continue
+                cases[len(jobs)] = {"map": name, "kind": kind, "density": density, "size": size}
+                jobs.append((name, start, goal, algo))
+
+    records = {}
+    for result in run_batch(jobs, maps=grids, workers=workers, repeats=repeats, warmup=warmup):
+        times = result["times"]
+        found = result["path"] is not None
+        record = dict(cases[result["job"]])
+        record.update({
+            "algorithm": result["algorithm"],
+            "start": list(result["start"]),
+            "goal": list(result["goal"]),
+            "median": float(np.median(times)),
+            "p95": float(np.percentile(times, 95)),
+            "mean": float(np.mean(times)),
+            "min": float(np.min(times)),
+            "repeats": len(times),
+            "nodes_expanded": result["nodes_expanded"],
+            "peak_open": result["peak_open"],
+            "path_length": len(result["path"]) if found else 0,
+            "cost": result["cost"] if found else None,
+            "found": found,
+        })
+        records[result["job"]] = record
+        print(f"▶ {record['algorithm'].upper():<8} {record['map']:<16} median {record['median']:.6f}s  "
+              f"p95 {record['p95']:.6f}s")
+    return [records[job] for job in sorted(records)]
+
+# Multi-agent cases: `counts` random agents per generated map, planned with
+# each method in MAPF_METHODS. Plans run in this process, one at a time, and
+# records match run_suite's so the same baselines apply; "path_length" is the
+# makespan and "cost" the sum of the agents' costs.
+def run_agent_suite(sizes=SUITE_SIZES, kinds=SUITE_KINDS, counts=(10,), methods=MAPF_METHODS, repeats=3, warmup=0,
+                    seed=0, time_limit=DEFAULT_AGENT_TIME_LIMIT, connectivity=CONNECT_8):
+    records = []
+    for size in sizes:
+        for spec in kinds:
+            kind, density = _parse_kind(spec)
+            grid = Grid(generate_map(kind, size, seed, density), connectivity=connectivity)
+            for count in counts:
+                name = f"{spec}-{size}-{count}agents"
+                if connectivity != CONNECT_8:
+                    name += f"-{connectivity}"
+                agents = random_agents(grid, count, seed)
+                for method in methods:
+                    for _ in range(warmup):
+                        plan_agents(grid, agents, method, time_limit)
+                    results = [plan_agents(grid, agents, method, time_limit) for _ in range(max(repeats, 1))]
+                    times = [result.duration for result in results]
+                    result = results[-1]
+                    record = {"map": name, "kind": kind, "density": density, "size": size, "agents": count,
+                              "algorithm": method, "status": result.status,
+                              "median": float(np.median(times)), "p95": float(np.percentile(times, 95)),
+                              "mean": float(np.mean(times)), "min": float(np.min(times)), "repeats": len(times),
+                              "nodes_expanded": result.expansions, "high_level_nodes": result.nodes,
+                              "path_length": result.makespan or 0, "cost": result.cost, "found": result.found}
+                    records.append(record)
+                    print(f"▶ {method.upper():<11} {name:<24} median {record['median']:.6f}s  {result.status}")
+    return records
+
+def save_results(records, file_path, settings):
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "settings": settings,
+        "results": records,
+    }
+    with open(file_path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+# Cases whose median got slower than the baseline by more than `tolerance`
+# (relative) and `min_delta` seconds, plus cases whose path cost changed.
+# Cases missing from the baseline are ignored.
+def compare_to_baseline(records, baseline_path, tolerance=DEFAULT_TOLERANCE, min_delta=DEFAULT_MIN_DELTA):
+    with open(baseline_path) as f:
+        baseline = {(r["map"], r["algorithm"]): r for r in json.load(f)["results"]}
+    regressions = []
+    for record in records:
+        old = baseline.get((record["map"], record["algorithm"]))
+        if old is None:
+            continue
+        ratio = record["median"] / old["median"] if old["median"] else 1.0
+        cost_changed = (old["cost"] is None) != (record["cost"] is None) or (
+            record["cost"] is not None and abs(record["cost"] - old["cost"]) > 1e-6)
+        slower = ratio > 1 + tolerance and record["median"] - old["median"] > min_delta
+        if slower or cost_changed:
+            regressions.append((record, old, ratio, cost_changed))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pathfinding benchmarks")
+    parser.add_argument("--suite", action="store_true", help="run the generated map suite instead of the map files")
+    parser.add_argument("--db", default=DEFAULT_DB, help="results database for the map file benchmark")
+    parser.add_argument("--maps", nargs="+", help="map files (.txt with .json sidecar, or binary) to use instead of the built-in list")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SUITE_SIZES)
+    parser.add_argument("--kinds", nargs="+", default=SUITE_KINDS, help="open, maze, rooms, random or random:<density>")
+    parser.add_argument("--algorithms", nargs="+", default=algorithms)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--workers", type=int, help="parallel workers; the suite uses 1 by default since timings get noisier")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--agents", type=int, nargs="+",
+                        help="with --suite, plan this many agents per map with the multi-agent methods instead")
+    parser.add_argument("--mapf-methods", nargs="+", choices=MAPF_METHODS, default=MAPF_METHODS)
+    parser.add_argument("--time-limit", type=float, default=DEFAULT_AGENT_TIME_LIMIT,
+                        help="seconds per multi-agent plan")
+    parser.add_argument("--connectivity", choices=CONNECTIVITIES, default=CONNECT_8,
+                        help="8 (diagonals may cut wall corners), 8-no-cut or 4")
+    parser.add_argument("--output", default=DEFAULT_RESULTS)
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--save-baseline", help="also write the results to this baseline file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed relative slowdown")
+    parser.add_argument("--min-delta", type=float, default=DEFAULT_MIN_DELTA, help="ignore slowdowns below this many seconds")
+    args = parser.parse_args(argv)
+
+    if not args.suite:
+        map_list = [{"file": file} for file in args.maps] if args.maps else None
+        benchmark(args.workers, args.repeats, args.warmup, map_list, args.db, args.connectivity)
+        return 0
+
+    args.workers = args.workers or 1
+    if args.agents:
+        records = run_agent_suite(args.sizes, args.kinds, args.agents, args.mapf_methods, args.repeats, args.warmup,
+                                  args.seed, args.time_limit, args.connectivity)
+        keys = ("sizes", "kinds", "agents", "mapf_methods", "repeats", "warmup", "seed", "time_limit", "connectivity")
+    else:
+        records = run_suite(args.sizes, args.kinds, args.algorithms, args.repeats, args.warmup, args.workers,
+                            args.seed, args.connectivity)
+        keys = ("sizes", "kinds", "algorithms", "repeats", "warmup", "workers", "seed", "connectivity")
+    settings = {key: getattr(args, key) for key in keys}
+    save_results(records, args.output, settings)
+    print(f"\n✅ {len(records)} results saved to {args.output}")
+    if args.save_baseline:
+        save_results(records, args.save_baseline, settings)
+        print(f"✅ Baseline saved to {args.save_baseline}")
 
-            found = bool(path)
-            path_len = len(path) if path else 0
-            cost = sum([1 for _ in path]) if path else "-"
-            nodes_exp = len(visited)
-
-            results.append([
-                grid_file,
-                algo,
-                "",  # Time already printed in function
-                nodes_exp,
-                path_len,
-                f"{cost:.2f}" if found else "-",
-                "Yes" if found else "No"
-            ])
-
-    # Save CSV
-    with open(output_csv, 'w', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(headers)
-        writer.writerows(results)
-
-    print(f"\n✅ Results saved to {output_csv}")
+    if args.baseline:
+        regressions = compare_to_baseline(records, args.baseline, args.tolerance, args.min_delta)
+        for record, old, ratio, cost_changed in regressions:
+            reason = "cost changed" if cost_changed else f"{ratio:.2f}x slower"
+            print(f"⚠️ {record['algorithm']} on {record['map']}: {reason} "
+                  f"({old['median']:.6f}s -> {record['median']:.6f}s)")
+        if regressions:
+            print(f"❌ {len(regressions)} regressions against {args.baseline}")
+            return 1
+        print(f"✅ No regressions against {args.baseline}")
+    return 0
 
 if __name__ == "__main__":
-    benchmark()
+    sys.exit(main())
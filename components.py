@@ -0,0 +1,226 @@
+import os
+from collections import deque
+import numpy as np
+from a_star_pathfinding_multi import DIRECTIONS, as_grid
+
+# Connected-component labels for a grid, so a query whose start and goal sit
+# in different components is rejected without a search. Labels follow the
+# grid's own neighbor mask (the exact moves the solvers may take) and are
+# built with vectorized hook-and-shortcut union-find over every free-to-free
+# move. Attach an index to a grid (grid.components = index) and the solvers
+# check it first; Grid.set_cell then keeps the labels current by merging
+# components when a cell opens and relabeling only the affected component
+# when a wall may have split one.
+
+WALL = -1
+SPLIT_LIMIT = 1 << 16  # cells the local split search may visit before a relabel
+
+# Half of the moves; the neighbor mask is symmetric between free cells
+_FORWARD = [bit for bit, (dr, dc) in enumerate(DIRECTIONS) if (dr, dc) in ((1, 0), (0, 1), (1, 1), (1, -1))]
+
+def _free_moves(grid, cells=None):
+    free = np.asarray(grid.cells).reshape(-1) == 0
+    mask = grid.neighbor_mask.reshape(-1)
+    sources, targets = [], []
+    for bit in _FORWARD:
+        moves = free & (mask >> bit & 1).astype(bool)
+        if cells is not None:
+            moves &= cells
+        u = np.flatnonzero(moves)
+        sources.append(u)
+        targets.append(u + grid.offsets[bit])
+    return free, np.concatenate(sources), np.concatenate(targets)
+
+# Each round hooks the larger root of every edge that still crosses two trees
+# onto the smaller one, then shortcuts until every cell points at its root
+def _union_roots(parent, u, v):
+    while u.size:
+        pu, pv = parent[u], parent[v]
+        crossing = pu != pv
+        u, v, pu, pv = u[crossing], v[crossing], pu[crossing], pv[crossing]
+        if not u.size:
+            break
+        np.minimum.at(parent, np.maximum(pu, pv), np.minimum(pu, pv))
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+    return parent
+
+def label_components(grid):
+    grid = as_grid(grid)
+    label_type = np.int32 if 2 * grid.size < 2 ** 31 else np.int64
+    free, u, v = _free_moves(grid)
+    parent = _union_roots(np.arange(grid.size, dtype=label_type), u, v)
+    return np.where(free, parent, WALL).astype(label_type)
+
+class ComponentIndex:
+    def __init__(self, grid, labels, fingerprint=None):
+        self.grid = grid
+        self.labels = labels
+        self.fingerprint = fingerprint or grid.fingerprint()
+        # Labels are root cell ids; merges may hand out fresh ones past the grid
+        self.next_label = max(int(labels.max()) + 1, grid.size)
+
+    @classmethod
+    def build(cls, grid):
+        grid = as_grid(grid)
+        return cls(grid, label_components(grid))
+
+    def save(self, file_path):
+        with open(file_path, 'wb') as f:
+            np.savez_compressed(f, fingerprint=self.fingerprint, labels=self.labels)
+
+    @classmethod
+    def load(cls, file_path, grid):
+        grid = as_grid(grid)
+        with np.load(file_path) as data:
+            fingerprint = str(data["fingerprint"])
+            if fingerprint != grid.fingerprint():
+                raise ValueError(f"{file_path} was built for a different map")
+            return cls(grid, data["labels"], fingerprint)
+
+    def component(self, idx):
+        return int(self.labels[idx])
+
+    # Whether a search from start_idx can reach goal_idx. A goal on a wall is
+    # never entered; a start on a wall can step onto any free neighbor.
+    def connected(self, start_idx, goal_idx):
+        if start_idx == goal_idx:
+            return True
+        goal_label = self.labels[goal_idx]
+        if goal_label == WALL:
+            return False
+        if self.labels[start_idx] != WALL:
+            return self.labels[start_idx] == goal_label
+        return any(self.labels[start_idx + offset] == goal_label
+                   for offset, _ in self.grid.neighbor_table[self.grid.mask[start_idx]])
+
+    # Called by Grid.set_cell after the cell and the neighbor mask changed
+    def cell_changed(self, idx, value):
+        labels, mask, neighbor_table = self.labels, self.grid.mask, self.grid.neighbor_table
+        neighbors = [idx + offset for offset, _ in neighbor_table[mask[idx]]]
+        if value == 0:
+            if labels[idx] != WALL:
+                return
+            joined = sorted({int(labels[n]) for n in neighbors})
+            if not joined:
+                labels[idx] = self.next_label
+                self.next_label += 1
+                return
+            labels[idx] = joined[0]
+            if len(joined) > 1:
+                labels[np.isin(labels, joined[1:])] = joined[0]
+            return
+
+        old = int(labels[idx])
+        if old == WALL:
+            return
+        labels[idx] = WALL
+        if len(neighbors) > 1 and not self._locally_connected(neighbors) and not self._split(neighbors):
+            self._relabel(old)
+
+    # The cells around a new wall still reach each other without it, so its
+    # component cannot have split
+    def _locally_connected(self, cells):
+        mask, neighbor_table = self.grid.mask, self.grid.neighbor_table
+        remaining = set(cells)
+        stack = [remaining.pop()]
+        while stack:
+            current = stack.pop()
+            for offset, _ in neighbor_table[mask[current]]:
+                if current + offset in remaining:
+                    remaining.discard(current + offset)
+                    stack.append(current + offset)
+        return not remaining
+
+    # Interleaved searches, one per neighbor of the new wall, advanced a cell at
+    # a time; searches that meet are merged. A search that runs dry has found a
+    # piece that broke off and takes a fresh label, and once a single search
+    # is left it holds the rest of the component, which keeps the old label.
+    # The work is bounded by the smaller pieces; past SPLIT_LIMIT cells this
+    # gives up (returns False) and the caller relabels the component instead.
+    def _split(self, cells, limit=SPLIT_LIMIT):
+        mask, neighbor_table = self.grid.mask, self.grid.neighbor_table
+        owner = {cell: i for i, cell in enumerate(cells)}
+        queues = [deque([cell]) for cell in cells]
+        members = [[cell] for cell in cells]
+        merged = list(range(len(cells)))
+        def find(i):
+            while merged[i] != i:
+                merged[i] = merged[merged[i]]
+                i = merged[i]
+            return i
+        live = set(range(len(cells)))
+        finished = []
+        while len(live) > 1:
+            if len(owner) > limit:
+                return False
+            for i in list(live):
+                if i not in live:
+                    continue
+                if not queues[i]:
+                    live.discard(i)
+                    finished.append(i)
+                    continue
+                current = queues[i].popleft()
+                for offset, _ in neighbor_table[mask[current]]:
+                    neighbor = current + offset
+                    j = owner.get(neighbor)
+                    if j is None:
+                        owner[neighbor] = i
+                        queues[i].append(neighbor)
+                        members[i].append(neighbor)
+                        continue
+                    j = find(j)
+                    if j != i:
+                        # Same piece after all: fold the smaller search into the larger
+                        keep, drop = (i, j) if len(members[i]) >= len(members[j]) else (j, i)
+                        merged[drop] = keep
+                        queues[keep].extend(queues[drop])
+                        members[keep].extend(members[drop])
+                        queues[drop], members[drop] = None, None
+                        live.discard(drop)
+                        i = keep
+        for i in finished:
+            self.labels[members[i]] = self.next_label
+            self.next_label += 1
+        return True
+
+    # Re-run the labeling over one component's cells only
+    def _relabel(self, label):
+        members = self.labels == label
+        _, u, v = _free_moves(self.grid, members.reshape(-1))
+        parent = _union_roots(np.arange(self.grid.size, dtype=self.labels.dtype), u, v)
+        # Every piece keeps a root id; the piece holding the old root keeps `label`
+        self.labels[members] = parent[members]
+
+# Reuse saved labels when they match the map, otherwise build and save them
+def load_or_build_components(grid, cache_path):
+    grid = as_grid(grid)
+    if os.path.exists(cache_path):
+        try:
+            return ComponentIndex.load(cache_path, grid)
+        except ValueError:
+            pass
+    index = ComponentIndex.build(grid)
+    index.save(cache_path)
+    return index
+
+# Attach component labels to a grid so the solvers reject unreachable goals up
+# front; cache_path keeps them on disk next to the map
+def attach_components(grid, cache_path=None):
+    grid = as_grid(grid)
+    if grid.components is None:
+        grid.components = load_or_build_components(grid, cache_path) if cache_path else ComponentIndex.build(grid)
+    return grid
+
+# Precompute and save component labels for a map: python components.py map.txt
+if __name__ == "__main__":
+    import sys
+    from a_star_pathfinding_multi import load_map
+    map_file = sys.argv[1]
+    index = load_or_build_components(load_map(map_file)[0], f"{map_file}.cc.npz")
+    count = len(np.unique(index.labels[index.labels != WALL]))
+    print(f"✅ {count} components for {map_file} saved to {map_file}.cc.npz")
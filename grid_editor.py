@@ -2,10 +2,14 @@ import tkinter as tk
 from tkinter import filedialog, messagebox
 import json
 import os
+from a_star_pathfinding_multi import Grid, costs_txt_path, load_costs_txt, save_costs_txt
+from incremental_planner import IncrementalPlanner
 
 GRID_ROWS = 10
 GRID_COLS = 10
 CELL_SIZE = 40
+# Fill for terrain costs 2-9 (cost 1 stays white), light to dark
+COST_COLORS = ['#f5eedc', '#ecdfc0', '#e2cfa3', '#d8bf87', '#cdae6b', '#c29d50', '#b68c36', '#a97b1d']
 
 class GridEditor:
     def __init__(self, root):
@@ -16,13 +20,21 @@ class GridEditor:
         self.canvas.pack()
 
         self.grid = [[0 for _ in range(GRID_COLS)] for _ in range(GRID_ROWS)]
+        self.costs = [[1 for _ in range(GRID_COLS)] for _ in range(GRID_ROWS)]
+        self.brush = None  # None toggles walls; 1-9 paints that terrain cost
         self.start = None
         self.goal = None
         self.last_clicked = None
         self.filename = None
+        self.planner = None
+        self.path = set()
 
         self.canvas.bind("<Button-1>", self.on_click)
+        self.canvas.bind("<B1-Motion>", self.on_drag)
         self.root.bind("s", self.set_start)
+        self.root.bind("w", self.set_brush)
+        for key in "123456789":
+            self.root.bind(key, self.set_brush)
         self.root.bind("g", self.set_goal)
         self.root.bind("<Return>", self.save_grid)
 
@@ -41,31 +53,74 @@ class GridEditor:
                 x1, y1 = c * CELL_SIZE, r * CELL_SIZE
                 x2, y2 = x1 + CELL_SIZE, y1 + CELL_SIZE
 
-                fill = 'white'
+                cost = self.costs[r][c]
+                fill = 'white' if cost == 1 else COST_COLORS[min(cost, 9) - 2]
                 if self.grid[r][c] == 1:
                     fill = 'black'
                 elif (r, c) == self.start:
                     fill = 'green'
                 elif (r, c) == self.goal:
                     fill = 'red'
+                elif (r, c) in self.path:
+                    fill = 'lightblue'
 
                 self.canvas.create_rectangle(x1, y1, x2, y2, fill=fill, outline='gray')
+                if cost != 1 and self.grid[r][c] == 0:
+                    self.canvas.create_text((x1 + x2) // 2, (y1 + y2) // 2, text=str(cost), fill='gray25')
 
     def on_click(self, event):
         col = event.x // CELL_SIZE
         row = event.y // CELL_SIZE
         if 0 <= row < GRID_ROWS and 0 <= col < GRID_COLS:
             self.last_clicked = (row, col)
-            if (row, col) != self.start and (row, col) != self.goal:
+            if self.brush is not None:
+                self.paint_cost(row, col)
+            elif (row, col) != self.start and (row, col) != self.goal:
                 self.grid[row][col] = 1 - self.grid[row][col]
+                if self.planner:
+                    self.planner.update_cells([((row, col), self.grid[row][col])])
+                self.replan()
         self.draw_grid()
 
+    # Dragging paints terrain; walls are only toggled by clicks
+    def on_drag(self, event):
+        col = event.x // CELL_SIZE
+        row = event.y // CELL_SIZE
+        if self.brush is not None and 0 <= row < GRID_ROWS and 0 <= col < GRID_COLS:
+            if self.costs[row][col] != self.brush:
+                self.paint_cost(row, col)
+                self.draw_grid()
+
+    def paint_cost(self, row, col):
+        if self.grid[row][col] != 0:
+            return
+        self.costs[row][col] = self.brush
+        if self.planner:
+            self.planner.update_costs([((row, col), self.brush)])
+        self.replan()
+
+    # "w" goes back to toggling walls, 1-9 pick the terrain cost to paint
+    def set_brush(self, event):
+        self.brush = None if event.char == "w" else int(event.char)
+        print("Brush: walls" if self.brush is None else f"Brush: terrain cost {self.brush}")
+
+    # Path preview; the planner is kept per goal and repaired after each edit
+    def replan(self):
+        if not self.start or not self.goal or None in self.start + self.goal:
+            self.path = set()
+            return
+        if self.planner is None or self.planner.goal != self.goal:
+            self.planner = IncrementalPlanner(Grid(self.grid, self.costs), self.goal)
+        path, _ = self.planner.plan(self.start)
+        self.path = set(path or [])
+
     def set_start(self, event):
         if self.last_clicked:
             row, col = self.last_clicked
             if self.grid[row][col] == 0 and (row, col) != self.goal:
                 self.start = (row, col)
                 print(f"Start set to: {self.start}")
+                self.replan()
             self.draw_grid()
 
     def set_goal(self, event):
@@ -74,6 +129,7 @@ class GridEditor:
             if self.grid[row][col] == 0 and (row, col) != self.start:
                 self.goal = (row, col)
                 print(f"Goal set to: {self.goal}")
+                self.replan()
             self.draw_grid()
 
     def save_grid(self, event=None):
@@ -88,6 +144,10 @@ class GridEditor:
         with open(filepath, "w") as f:
             for row in self.grid:
                 f.write(" ".join(map(str, row)) + "\n")
+        # An all-ones layer is only written over an older sidecar, to reset it
+        if any(cost != 1 for row in self.costs for cost in row) or os.path.exists(costs_txt_path(filepath)):
+            save_costs_txt(filepath, self.costs)
+            print(f"✅ Terrain costs saved next to {filepath}")
 
         # Save start/goal metadata
         meta_path = filepath.replace(".txt", ".json")
@@ -112,8 +172,13 @@ class GridEditor:
             grid.append(row)
 
         self.grid = grid
+        costs = load_costs_txt(filepath)
+        # Walls may carry a 0 cost in the sidecar; they cost 1 once opened
+        self.costs = [[max(cost, 1) for cost in row] for row in costs.tolist()] if costs is not None \
+            else [[1] * len(row) for row in grid]
         self.start = None
         self.goal = None
+        self.planner = None
         self.filename = filepath
 
         # Update grid dimensions (optional)
@@ -135,6 +200,7 @@ class GridEditor:
         else:
             print("ℹ️ No metadata file found for start/goal")
 
+        self.replan()
         self.draw_grid()
 
 # Run the editor
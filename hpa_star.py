@@ -0,0 +1,296 @@
+import heapq
+import os
+import time
+import numpy as np
+from a_star_pathfinding_multi import (BUDGET_EXCEEDED, CONNECT_8, DIRECTIONS, FOUND, NO_PATH, SQRT2, SearchResult,
+                                       as_grid, octile_distance, print_metrics)
+
+# Hierarchical pathfinding (HPA*). The grid is cut into square clusters and
+# every free crossing between neighbouring clusters is summarised by a few
+# entrance cells. Entrances form an abstract graph whose intra-cluster edges
+# carry the exact in-cluster shortest distance, so a query searches the small
+# abstract graph and only refines the clusters on the chosen route.
+
+DEFAULT_CLUSTER_SIZE = 16
+LONG_ENTRANCE = 6  # runs at least this long get an entrance at each end
+
+def _cluster_bounds(grid, cluster_size, cell):
+    row, col = divmod(cell, grid.cols)
+    r0, c0 = row - row % cluster_size, col - col % cluster_size
+    return r0, min(r0 + cluster_size, grid.rows), c0, min(c0 + cluster_size, grid.cols)
+
+# Neighbor mask with every move that leaves its cluster switched off, so
+# in-cluster searches reuse the grid's neighbor table without bounds checks
+def _cluster_confined_mask(grid, cluster_size):
+    mask = grid.neighbor_mask.copy()
+    row_phase = np.arange(grid.rows) % cluster_size
+    col_phase = np.arange(grid.cols) % cluster_size
+    edge = {-1: 0, 0: None, 1: cluster_size - 1}
+    for bit, (dr, dc) in enumerate(DIRECTIONS):
+        leaves = np.zeros((grid.rows, grid.cols), dtype=bool)
+        if dr:
+            leaves |= (row_phase == edge[dr])[:, None]
+        if dc:
+            leaves |= (col_phase == edge[dc])[None, :]
+        mask[leaves] &= np.uint8(~(1 << bit) & 0xFF)
+    return bytearray(mask.tobytes())
+
+# Dijkstra over a cluster-confined mask; stops once every target is settled
+def _cluster_dijkstra(neighbor_table, mask, source, targets=()):
+    remaining = set(targets)
+    remaining.discard(source)
+    g_costs = {source: 0}
+    parents = {source: -1}
+    closed = set()
+    open_set = [(0, source)]
+    while open_set and remaining:
+        g_cost, current = heapq.heappop(open_set)
+        if current in closed:
+            continue
+        closed.add(current)
+        remaining.discard(current)
+        for offset, move_cost in neighbor_table[mask[current]]:
+            neighbor = current + offset
+            if neighbor in closed:
+                continue
+            new_cost = g_cost + move_cost
+            if new_cost < g_costs.get(neighbor, float('inf')):
+                g_costs[neighbor] = new_cost
+                parents[neighbor] = current
+                heapq.heappush(open_set, (new_cost, neighbor))
+    return {t: g_costs[t] for t in targets if t in closed or t == source}, parents
+
+# Entrance pairs (cell on side a, cell on side b, move cost) along one border
+def _scan_border(side_a, side_b, cluster_size, cell_a, cell_b, diagonal_entrances=True):
+    length = len(side_a)
+    positions = np.arange(length)
+    crossing = side_a & side_b
+    before = np.r_[False, crossing[:-1]]
+    after = np.r_[crossing[1:], False]
+    run_starts = np.flatnonzero(crossing & (~before | (positions % cluster_size == 0)))
+    run_ends = np.flatnonzero(crossing & (~after | (positions % cluster_size == cluster_size - 1)))
+
+    transitions = []
+    for first, last in zip(run_starts.tolist(), run_ends.tolist()):
+        picks = (first, last) if last - first + 1 >= LONG_ENTRANCE else ((first + last) // 2,)
+        transitions.extend((cell_a(i), cell_b(i), 1) for i in picks)
+
+    # Diagonal crossings squeezed between two walls have no straight
+    # alternative, so each one becomes an entrance of its own. They cut both
+    # wall corners, so only grids that allow corner cutting have them.
+    if not diagonal_entrances:
+        return transitions
+    a_now, a_next = side_a[:-1], side_a[1:]
+    b_now, b_next = side_b[:-1], side_b[1:]
+    for i in np.flatnonzero(a_now & b_next & ~a_next & ~b_now).tolist():
+        transitions.append((cell_a(i), cell_b(i + 1), SQRT2))
+    for i in np.flatnonzero(a_next & b_now & ~a_now & ~b_next).tolist():
+        transitions.append((cell_a(i + 1), cell_b(i), SQRT2))
+    return transitions
+
+class AbstractGraph:
+    def __init__(self, grid, cluster_size, edges, fingerprint=None):
+        self.grid = grid
+        self.cluster_size = cluster_size
+        self.fingerprint = fingerprint or grid.fingerprint()
+        # edges[cell] -> list of (neighbor cell, cost, refine) where refine is
+        # True for intra-cluster edges that need a local search to expand
+        self.edges = edges
+        self.confined_mask = _cluster_confined_mask(grid, cluster_size)
+        self.cluster_entrances = {}
+        for cell in edges:
+            self.cluster_entrances.setdefault(self._bounds(cell), []).append(cell)
+
+    def _bounds(self, cell):
+        return _cluster_bounds(self.grid, self.cluster_size, cell)
+
+    def _local_search(self, source, targets):
+        return _cluster_dijkstra(self.grid.neighbor_table, self.confined_mask, source, targets)
+
+    @classmethod
+    def build(cls, grid, cluster_size=DEFAULT_CLUSTER_SIZE):
+        grid = as_grid(grid)
+        if grid.costs is not None:
+            raise ValueError("HPA* assumes uniform move costs; use a_star on terrain grids")
+        free = np.asarray(grid.cells) == 0
+        rows, cols = grid.rows, grid.cols
+        diagonal_entrances = grid.connectivity == CONNECT_8
+        transitions = []
+        for r in range(cluster_size - 1, rows - 1, cluster_size):
+            transitions += _scan_border(free[r], free[r + 1], cluster_size,
+                                        lambda i, r=r: r * cols + i, lambda i, r=r: (r + 1) * cols + i, diagonal_entrances)
+        for c in range(cluster_size - 1, cols - 1, cluster_size):
+            transitions += _scan_border(free[:, c], free[:, c + 1], cluster_size,
+                                        lambda i, c=c: i * cols + c, lambda i, c=c: i * cols + c + 1, diagonal_entrances)
+
+        edges = {}
+        for a, b, cost in transitions:
+            edges.setdefault(a, []).append((b, cost, False))
+            edges.setdefault(b, []).append((a, cost, False))
+        graph = cls(grid, cluster_size, edges)
+
+        for bounds, entrances in graph.cluster_entrances.items():
+            for i, source in enumerate(entrances[:-1]):
+                costs, _ = graph._local_search(source, entrances[i + 1:])
+                for target, cost in costs.items():
+                    if target != source:
+                        edges[source].append((target, cost, True))
+                        edges[target].append((source, cost, True))
+        return graph
+
+    def save(self, file_path):
+        src, dst, cost, refine = [], [], [], []
+        for a, neighbors in self.edges.items():
+            for b, edge_cost, edge_refine in neighbors:
+                src.append(a)
+                dst.append(b)
+                cost.append(edge_cost)
+                refine.append(edge_refine)
+        with open(file_path, 'wb') as f:
+            np.savez_compressed(
+                f, cluster_size=self.cluster_size, fingerprint=self.fingerprint,
+                src=np.array(src, dtype=np.int64), dst=np.array(dst, dtype=np.int64),
+                cost=np.array(cost, dtype=np.float64), refine=np.array(refine, dtype=bool)
+            )
+
+    @classmethod
+    def load(cls, file_path, grid):
+        grid = as_grid(grid)
+        with np.load(file_path) as data:
+            fingerprint = str(data["fingerprint"])
+            if fingerprint != grid.fingerprint():
+                raise ValueError(f"{file_path} was built for a different map")
+            edges = {}
+            for a, b, cost, refine in zip(data["src"].tolist(), data["dst"].tolist(),
+                                          data["cost"].tolist(), data["refine"].tolist()):
+                edges.setdefault(a, []).append((b, cost, refine))
+            return cls(grid, int(data["cluster_size"]), edges, fingerprint)
+
+    # Connect a query endpoint to the entrances of its own cluster
+    def _attach(self, cell, other):
+        bounds = self._bounds(cell)
+        targets = list(self.cluster_entrances.get(bounds, []))
+        if self._bounds(other) == bounds:
+            targets.append(other)
+        costs, _ = self._local_search(cell, targets)
+        return [(target, cost, True) for target, cost in costs.items() if target != cell]
+
+    def _refine(self, a, b):
+        _, parents = self._local_search(a, (b,))
+        segment = []
+        while b != -1:
+            segment.append(b)
+            b = parents[b]
+        return segment[::-1]
+
+    # Returns (path, cost, stats) where stats is (expansions, pushes, peak open
+    # set size, visited nodes, status); abstract nodes are only listed when
+    # trace=True. max_expansions and deadline (a perf_counter value) bound the
+    # abstract search the same way they bound the grid solvers.
+    def query(self, start, goal, trace=False, max_expansions=None, deadline=None):
+        grid = self.grid
+        start_idx, goal_idx = grid.index(start), grid.index(goal)
+        if start_idx == goal_idx:
+            return [start], 0, (1, 1, 1, [start] if trace else None, FOUND)
+        if grid.cells[goal[0], goal[1]] != 0:
+            return None, None, (0, 0, 0, [] if trace else None, NO_PATH)  # search() never steps onto a wall either
+
+        extra = {}
+        sources = [start_idx]
+        if grid.cells[start[0], start[1]] != 0:
+            # A start on a wall can only step off it, possibly into another cluster
+            extra[start_idx] = [(start_idx + offset, cost, False)
+                                for offset, cost in grid.neighbor_table[grid.mask[start_idx]]]
+            sources = [neighbor for neighbor, _, _ in extra[start_idx]]
+        for source in sources:
+            extra.setdefault(source, []).extend(self._attach(source, goal_idx))
+        for entrance, cost, _ in self._attach(goal_idx, start_idx):
+            extra.setdefault(entrance, []).append((goal_idx, cost, True))
+
+        g_costs = {start_idx: 0}
+        parents = {start_idx: (-1, False)}
+        closed = set()
+        visited_nodes = [] if trace else None
+        expansions = 0
+        open_set = [(octile_distance(start, goal), 0, start_idx)]
+        pushes = peak_open = 1
+        while open_set:
+            _, _, current = heapq.heappop(open_set)
+            if current in closed:
+                continue
+            if ((max_expansions is not None and expansions >= max_expansions)
+                    or (deadline is not None and time.perf_counter() >= deadline)):
+                return None, None, (expansions, pushes, peak_open, visited_nodes, BUDGET_EXCEEDED)
+            closed.add(current)
+            expansions += 1
+            if trace:
+                visited_nodes.append(grid.position(current))
+            if current == goal_idx:
+                break
+            for neighbor, cost, refine in self.edges.get(current, []) + extra.get(current, []):
+                if neighbor in closed:
+                    continue
+                g_cost = g_costs[current] + cost
+                if g_cost < g_costs.get(neighbor, float('inf')):
+                    g_costs[neighbor] = g_cost
+                    parents[neighbor] = (current, refine)
+                    f_cost = g_cost + octile_distance(grid.position(neighbor), goal)
+                    heapq.heappush(open_set, (f_cost, pushes, neighbor))
+                    pushes += 1
+            if len(open_set) > peak_open:
+                peak_open = len(open_set)
+        else:
+            return None, None, (expansions, pushes, peak_open, visited_nodes, NO_PATH)
+
+        hops = []
+        current = goal_idx
+        while current != start_idx:
+            parent, refine = parents[current]
+            hops.append((parent, current, refine))
+            current = parent
+        path = [start_idx]
+        for a, b, refine in reversed(hops):
+            path += self._refine(a, b)[1:] if refine else [b]
+        stats = (expansions, pushes, peak_open, visited_nodes, FOUND)
+        return [grid.position(idx) for idx in path], g_costs[goal_idx], stats
+
+# Reuse a saved abstract graph when it matches the map, otherwise build and save one
+def load_or_build_abstract_graph(grid, cache_path, cluster_size=DEFAULT_CLUSTER_SIZE):
+    grid = as_grid(grid)
+    if os.path.exists(cache_path):
+        try:
+            graph = AbstractGraph.load(cache_path, grid)
+            if graph.cluster_size == cluster_size:
+                return graph
+        except ValueError:
+            pass
+    graph = AbstractGraph.build(grid, cluster_size)
+    graph.save(cache_path)
+    return graph
+
+def hpa_search(grid, start, goal, graph=None, trace=False, verbose=False, max_expansions=None, deadline=None):
+    start_time = time.perf_counter()
+    if graph is None:
+        graph = AbstractGraph.build(grid)
+    components = graph.grid.components
+    if components is not None and not components.connected(graph.grid.index(start), graph.grid.index(goal)):
+        # Different components: no path, and nothing worth inserting into the graph
+        path, cost, (expansions, pushes, peak_open, visited_nodes, status) = (
+            None, None, (0, 0, 0, [] if trace else None, NO_PATH))
+    else:
+        path, cost, (expansions, pushes, peak_open, visited_nodes, status) = graph.query(
+            start, goal, trace, max_expansions, deadline)
+    result = SearchResult("hpa", path, cost, expansions, pushes, peak_open,
+                          time.perf_counter() - start_time, visited_nodes, status)
+    if verbose:
+        print_metrics(result)
+    return result
+
+# Precompute and save the abstract graph for a map: python hpa_star.py map.txt [cluster_size]
+if __name__ == "__main__":
+    import sys
+    from a_star_pathfinding_multi import load_map
+    map_file = sys.argv[1]
+    cluster_size = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_CLUSTER_SIZE
+    graph = load_or_build_abstract_graph(load_map(map_file)[0], f"{map_file}.hpa.npz", cluster_size)
+    print(f"✅ Abstract graph for {map_file}: {len(graph.edges)} entrance nodes, saved to {map_file}.hpa.npz")
@@ -0,0 +1,155 @@
+import heapq
+import math
+from a_star_pathfinding_multi import as_grid, diagonal_extra
+
+# Incremental replanning with D* Lite. The search runs backwards from a fixed
+# goal and keeps g/rhs values between calls, so after a batch of cell edits
+# only vertices whose shortest distance actually changed are re-expanded, and
+# the start may move between calls without a restart. Terrain costs are
+# supported: a move pays the cost of the cell it enters, and the heuristic is
+# scaled by the cheapest terrain cost seen when the search (re)started.
+
+INF = math.inf
+KEY_EPS = 1e-9
+
+class IncrementalPlanner:
+    def __init__(self, grid, goal):
+        self.grid = as_grid(grid)
+        self.goal = tuple(goal)
+        self.goal_idx = self.grid.index(goal)
+        self._restart()
+
+    def _restart(self):
+        self.h_scale = self.grid.min_cost
+        self.h_extra = diagonal_extra(self.grid)
+        self.start_idx = None
+        self.km = 0
+        self.g = {}
+        self.rhs = {self.goal_idx: 0}
+        self.open_set = []
+        self.queued = {}  # idx -> push id of its live heap entry
+        self.pushes = 0
+
+    def _h(self, a, b):
+        (ra, ca), (rb, cb) = divmod(a, self.grid.cols), divmod(b, self.grid.cols)
+        dx, dy = abs(ra - rb), abs(ca - cb)
+        return (max(dx, dy) + self.h_extra * min(dx, dy)) * self.h_scale
+
+    def _key(self, idx):
+        best = min(self.g.get(idx, INF), self.rhs.get(idx, INF))
+        return (best + self._h(self.start_idx, idx) + self.km, best)
+
+    def _push(self, idx):
+        k1, k2 = self._key(idx)
+        self.queued[idx] = self.pushes
+        heapq.heappush(self.open_set, (k1, k2, self.pushes, idx))
+        self.pushes += 1
+
+    # Cells that can step into idx: every neighbor when idx is free, none otherwise
+    def _predecessors(self, idx):
+        return self.grid.adjacent(idx) if self.grid.cells.flat[idx] == 0 else []
+
+    def _update_vertex(self, idx):
+        if idx != self.goal_idx:
+            g, best, terrain = self.g, INF, self.grid.cost_list
+            for offset, move_cost in self.grid.neighbor_table[self.grid.mask[idx]]:
+                if terrain is not None:
+                    move_cost *= terrain[idx + offset]
+                cost = move_cost + g.get(idx + offset, INF)
+                if cost < best:
+                    best = cost
+            self.rhs[idx] = best
+        self.queued.pop(idx, None)
+        if self.g.get(idx, INF) != self.rhs.get(idx, INF):
+            self._push(idx)
+
+    def _compute_shortest_path(self):
+        expanded = []
+        g, rhs, queued, start = self.g, self.rhs, self.queued, self.start_idx
+        while self.open_set:
+            k1, k2, push_id, idx = self.open_set[0]
+            if queued.get(idx) != push_id:
+                heapq.heappop(self.open_set)
+                continue
+            start_k1, start_k2 = self._key(start)
+            # Keys that tie the start's up to float rounding still have to be
+            # processed, or _extract_path can walk into a stale g and cycle
+            if (k1 > start_k1 + KEY_EPS or (k1 >= start_k1 - KEY_EPS and k2 >= start_k2)) \
+                    and rhs.get(start, INF) == g.get(start, INF):
+                break
+            heapq.heappop(self.open_set)
+            del queued[idx]
+            if (k1, k2) < self._key(idx):
+                self._push(idx)
+            elif g.get(idx, INF) > rhs.get(idx, INF):
+                g[idx] = rhs[idx]
+                expanded.append(idx)
+                for pred in self._predecessors(idx):
+                    self._update_vertex(pred)
+            else:
+                g[idx] = INF
+                expanded.append(idx)
+                for pred in self._predecessors(idx) + [idx]:
+                    self._update_vertex(pred)
+        return expanded
+
+    def _extract_path(self):
+        g, mask, neighbor_table, terrain = self.g, self.grid.mask, self.grid.neighbor_table, self.grid.cost_list
+        current = self.start_idx
+        if g.get(current, INF) == INF:
+            return None
+        path = [current]
+        while current != self.goal_idx:
+            _, current = min((move_cost * (terrain[current + offset] if terrain is not None else 1)
+                              + g.get(current + offset, INF), current + offset)
+                             for offset, move_cost in neighbor_table[mask[current]])
+            path.append(current)
+        return [self.grid.position(idx) for idx in path]
+
+    # Path from start to the goal after repairing outstanding changes; the
+    # second value lists the cells expanded by this call only
+    def plan(self, start):
+        start_idx = self.grid.index(start)
+        if self.start_idx is None:
+            self.start_idx = start_idx
+            self._push(self.goal_idx)
+        elif start_idx != self.start_idx:
+            self.km += self._h(self.start_idx, start_idx)
+            self.start_idx = start_idx
+        components = self.grid.components
+        if components is not None and not components.connected(start_idx, self.goal_idx):
+            # Pending repairs stay queued for the next call that can reach the goal
+            return None, []
+        expanded = self._compute_shortest_path()
+        return self._extract_path(), [self.grid.position(idx) for idx in expanded]
+
+    # Apply a batch of ((row, col), value) edits; only the edited cells'
+    # neighbors are re-evaluated, the rest of the search tree is kept
+    def update_cells(self, changes):
+        affected = set()
+        for pos, value in changes:
+            if self.grid.cells[pos[0], pos[1]] == value:
+                continue
+            self.grid.set_cell(pos, value)
+            affected.update(self.grid.adjacent(self.grid.index(pos)))
+        self._repair(affected)
+
+    # Apply a batch of ((row, col), cost) terrain edits; cells that step into
+    # a repainted cell are re-evaluated like after a wall edit
+    def update_costs(self, changes):
+        affected = set()
+        for pos, cost in changes:
+            if self.grid.costs is not None and self.grid.costs[pos[0], pos[1]] == cost:
+                continue
+            self.grid.set_cost(pos, cost)
+            affected.update(self.grid.adjacent(self.grid.index(pos)))
+        self._repair(affected)
+
+    def _repair(self, affected):
+        if self.grid.min_cost < self.h_scale:
+            # A cheaper cell would make the old heuristic overestimate
+            self._restart()
+        if self.start_idx is None:
+            return
+        for idx in affected:
+            self._update_vertex(idx)
@@ -0,0 +1,115 @@
+import os
+import numpy as np
+from a_star_pathfinding_multi import as_grid, distance_field
+
+# ALT heuristic (A*, landmarks, triangle inequality). A handful of landmark
+# cells are picked far apart and their full distance fields are stored as
+# float32. For any cell n and goal g, d(n, g) >= |d(L, g) - d(L, n)| for every
+# landmark L, which stays tight on maze-like maps where octile distance is far
+# too optimistic. The tables are saved per map so they are built only once.
+# Per goal the bound is taken for every cell at once with one NumPy max over
+# the landmarks, so a lookup in the search loop is a single index.
+
+DEFAULT_LANDMARKS = 8
+# Landmark picking stops early once the farthest cell left is this close
+# (relative to the first landmark's reach) to a landmark already picked
+MIN_SPREAD = 1 / 8
+
+class LandmarkHeuristic:
+    def __init__(self, grid, landmarks, distances, fingerprint=None):
+        self.grid = grid
+        self.landmarks = list(landmarks)
+        self.distances = np.ascontiguousarray(distances, dtype=np.float32)
+        self.fingerprint = fingerprint or grid.fingerprint()
+        finite = self.distances[np.isfinite(self.distances)]
+        # float32 rounding of both table entries, so the bound never overshoots
+        self.slack = 4 * np.finfo(np.float32).eps * (float(finite.max()) if finite.size else 0)
+        self._goal = None
+        self._table = None
+
+    # count is an upper bound: farthest-point picking stops at min_spread
+    @classmethod
+    def build(cls, grid, count=DEFAULT_LANDMARKS, min_spread=MIN_SPREAD):
+        grid = as_grid(grid)
+        if grid.costs is not None:
+            raise ValueError("ALT landmarks assume uniform move costs; use a_star on terrain grids")
+        free = np.flatnonzero(np.asarray(grid.cells).reshape(-1) == 0)
+        landmarks, fields = [], []
+        if free.size:
+            # Farthest-point selection: each new landmark is the reachable cell
+            # farthest from all landmarks picked so far
+            seed_dist, _ = distance_field(grid, grid.position(int(free[0])))
+            nearest = seed_dist.reshape(-1)
+            reach = None
+            for _ in range(count):
+                score = np.where(np.isfinite(nearest), nearest, -1)
+                landmark = int(np.argmax(score))
+                if score[landmark] <= 0 or (reach is not None and score[landmark] < min_spread * reach):
+                    break
+                reach = reach or float(score[landmark])
+                field, _ = distance_field(grid, grid.position(landmark))
+                field = field.reshape(-1)
+                landmarks.append(landmark)
+                fields.append(field.astype(np.float32))
+                nearest = field if len(fields) == 1 else np.minimum(nearest, field)
+        distances = np.stack(fields) if fields else np.zeros((0, grid.size), dtype=np.float32)
+        return cls(grid, landmarks, distances)
+
+    def save(self, file_path):
+        with open(file_path, 'wb') as f:
+            np.savez_compressed(f, fingerprint=self.fingerprint,
+                                landmarks=np.array(self.landmarks, dtype=np.int64), distances=self.distances)
+
+    @classmethod
+    def load(cls, file_path, grid):
+        grid = as_grid(grid)
+        with np.load(file_path) as data:
+            fingerprint = str(data["fingerprint"])
+            if fingerprint != grid.fingerprint():
+                raise ValueError(f"{file_path} was built for a different map")
+            return cls(grid, data["landmarks"].tolist(), data["distances"], fingerprint)
+
+    # h for every cell towards one goal: the best landmark bound, never below
+    # octile distance
+    def goal_table(self, goal):
+        goal_row, goal_col = goal
+        rows, cols = np.divmod(np.arange(self.grid.size), self.grid.cols)
+        dx, dy = np.abs(rows - goal_row), np.abs(cols - goal_col)
+        table = np.maximum(dx, dy) + (np.sqrt(2) - 1) * np.minimum(dx, dy)
+        goal_idx = self.grid.index(goal)
+        for row in self.distances:
+            if np.isfinite(row[goal_idx]):
+                bound = np.abs(row - row[goal_idx]).astype(np.float64) - self.slack
+                # Cells a landmark cannot reach (e.g. a start on a wall) give no bound
+                bound[~np.isfinite(bound)] = 0
+                np.maximum(table, bound, out=table)
+        return table
+
+    # h(pos, goal), usable as search(..., heuristic=landmarks). The table of
+    # the last goal is kept, as a memoryview that indexes straight to floats.
+    def __call__(self, pos, goal):
+        if goal != self._goal and tuple(goal) != self._goal:
+            self._goal = tuple(goal)
+            self._table = memoryview(self.goal_table(self._goal))
+        return self._table[pos[0] * self.grid.cols + pos[1]]
+
+# Reuse saved landmark tables when they match the map, otherwise build and save them
+def load_or_build_landmarks(grid, cache_path, count=DEFAULT_LANDMARKS):
+    grid = as_grid(grid)
+    if os.path.exists(cache_path):
+        try:
+            return LandmarkHeuristic.load(cache_path, grid)
+        except ValueError:
+            pass
+    heuristic = LandmarkHeuristic.build(grid, count)
+    heuristic.save(cache_path)
+    return heuristic
+
+# Precompute and save landmark tables for a map: python landmarks.py map.txt [count]
+if __name__ == "__main__":
+    import sys
+    from a_star_pathfinding_multi import load_map
+    map_file = sys.argv[1]
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_LANDMARKS
+    heuristic = load_or_build_landmarks(load_map(map_file)[0], f"{map_file}.alt.npz", count)
+    print(f"✅ {len(heuristic.landmarks)} landmarks for {map_file} saved to {map_file}.alt.npz")
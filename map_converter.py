@@ -0,0 +1,21 @@
+import os
+from a_star_pathfinding_multi import MAP_SUFFIX, load_map, save_grid_bin
+
+# Convert .txt maps (plus their .json start/goal and .costs.txt terrain
+# sidecars, when present) to the binary map format that loads with a memory
+# map instead of parsing text.
+
+def convert_map(txt_path, out_path=None, packed=False):
+    out_path = out_path or os.path.splitext(txt_path)[0] + MAP_SUFFIX
+    cells, meta = load_map(txt_path)
+    save_grid_bin(out_path, cells, meta["start"], meta["goal"], packed, meta["costs"])
+    return out_path
+
+# Convert maps: python map_converter.py map.txt [more.txt ...] [--packed]
+if __name__ == "__main__":
+    import sys
+    args = sys.argv[1:]
+    packed = "--packed" in args
+    for txt_path in [arg for arg in args if arg != "--packed"]:
+        out_path = convert_map(txt_path, packed=packed)
+        print(f"✅ {txt_path} -> {out_path} ({os.path.getsize(txt_path)} -> {os.path.getsize(out_path)} bytes)")
@@ -0,0 +1,88 @@
+import numpy as np
+
+# Synthetic maps for benchmarking. Every generator takes a size (square maps)
+# and a seed and returns a uint8 array (0 = free, 1 = wall), so the same
+# arguments always give the same map.
+
+MAP_KINDS = ["open", "random", "maze", "rooms"]
+DEFAULT_ROOM_SIZE = 16
+
+def open_map(size, seed=0):
+    return np.zeros((size, size), dtype=np.uint8)
+
+# Independent random walls with the given density
+def random_map(size, seed=0, density=0.2):
+    rng = np.random.default_rng(seed)
+    return (rng.random((size, size)) < density).astype(np.uint8)
+
+# Perfect maze (one route between any two cells) with one-cell corridors,
+# carved by an iterative depth-first backtracker on the odd coordinates
+def maze_map(size, seed=0):
+    rng = np.random.default_rng(seed)
+    cells = np.ones((size, size), dtype=np.uint8)
+    rooms = (size - 1) // 2
+    if rooms < 1:
+        return np.zeros((size, size), dtype=np.uint8)
+    seen = np.zeros((rooms, rooms), dtype=bool)
+    seen[0, 0] = True
+    cells[1, 1] = 0
+    stack = [(0, 0)]
+    steps = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    while stack:
+        r, c = stack[-1]
+        options = [(r + dr, c + dc) for dr, dc in steps
+                   if 0 <= r + dr < rooms and 0 <= c + dc < rooms and not seen[r + dr, c + dc]]
+        if not options:
+            stack.pop()
+            continue
+        nr, nc = options[rng.integers(len(options))]
+        seen[nr, nc] = True
+        cells[2 * nr + 1, 2 * nc + 1] = 0
+        cells[r + nr + 1, c + nc + 1] = 0  # the wall between the two rooms
+        stack.append((nr, nc))
+    return cells
+
+# Square rooms separated by one-cell walls, with one door in every wall
+# segment between neighbouring rooms
+def rooms_map(size, seed=0, room_size=DEFAULT_ROOM_SIZE):
+    rng = np.random.default_rng(seed)
+    cells = np.zeros((size, size), dtype=np.uint8)
+    pitch = room_size + 1
+    cells[pitch - 1::pitch, :] = 1
+    cells[:, pitch - 1::pitch] = 1
+    for wall in range(pitch - 1, size, pitch):
+        for start in range(0, size, pitch):
+            end = min(start + room_size, size)
+            if end > start:
+                door = int(rng.integers(start, end))
+                cells[wall, door] = 0
+                cells[door, wall] = 0
+    return cells
+
+GENERATORS = {
+    "open": open_map,
+    "random": random_map,
+    "maze": maze_map,
+    "rooms": rooms_map,
+}
+
+# Dispatch by kind; density only applies to "random" maps
+def generate_map(kind, size, seed=0, density=None):
+    if kind not in GENERATORS:
+        raise ValueError(f"Unknown map kind: {kind}")
+    if kind == "random" and density is not None:
+        return random_map(size, seed, density)
+    return GENERATORS[kind](size, seed)
+
+# Write a map in the same space separated format load_grid_from_txt reads
+def save_map_txt(cells, file_path):
+    np.savetxt(file_path, np.asarray(cells, dtype=np.uint8), fmt="%d", delimiter=" ")
+
+# Generate a map file: python map_generators.py maze 256 out.txt [seed] [density]
+if __name__ == "__main__":
+    import sys
+    kind, size, out_file = sys.argv[1], int(sys.argv[2]), sys.argv[3]
+    seed = int(sys.argv[4]) if len(sys.argv) > 4 else 0
+    density = float(sys.argv[5]) if len(sys.argv) > 5 else None
+    save_map_txt(generate_map(kind, size, seed, density), out_file)
+    print(f"✅ {kind} map {size}x{size} saved to {out_file}")
@@ -0,0 +1,387 @@
+import heapq
+import math
+import time
+from collections import OrderedDict
+import numpy as np
+from a_star_pathfinding_multi import BUDGET_EXCEEDED, CONNECT_4, DEADLINE_CHECK_EVERY, FOUND, NO_PATH, SQRT2, as_grid
+from components import WALL, label_components
+from query_cache import DEFAULT_MAX_BYTES, ReverseTree
+
+# Multi-agent pathfinding on a Grid. Agents move in lock step: every time step
+# each agent either takes one move the grid allows (paying the usual move and
+# terrain cost) or waits in place for WAIT_COST, and once at its goal it stays
+# there. Two agents may never be in the same cell at the same time nor swap
+# cells in one step.
+#
+# "prioritized" plans agents one after the other, each with a space-time A*
+# that avoids what the earlier agents reserved; it scales to hundreds of
+# agents but is not optimal and can fail where a plan exists, in which case
+# the failed agent is moved to the front and planning restarts. "cbs"
+# (conflict-based search) finds plans with the least total cost: it plans
+# every agent alone, then resolves the first collision by branching on which
+# of the two agents gets a constraint. Its cost grows quickly with the number
+# of interacting agents, so it suits small groups. Both use the exact
+# distance to the goal as their heuristic, read off a query_cache.ReverseTree
+# aimed at the agent's start, and stop at a deadline with status
+# BUDGET_EXCEEDED. Trees are kept while agents are replanned, up to
+# max_tree_bytes in all.
+
+WAIT_COST = 1
+DEFAULT_TIME_SLACK = 64  # time steps an agent may spend beyond its shortest path
+DEFAULT_RESTARTS = 5
+MAPF_METHODS = ["prioritized", "cbs"]
+
+# Moves other agents may not make, cell ids by time step. A vertex (cell, t)
+# is taken at time t, an edge (a, b, t) forbids moving from a to b between t
+# and t + 1, and a parked cell stays taken from its time on. After end_time
+# nothing changes any more, so searches treat all later time steps as one.
+class ReservationTable:
+    def __init__(self):
+        self.vertices = set()
+        self.edges = set()
+        self.parked = {}
+        self.last_time = {}  # cell -> latest time it is taken, parking aside
+        self.end_time = -1
+
+    def add_vertex(self, cell, t):
+        self.vertices.add((cell, t))
+        if t > self.last_time.get(cell, -1):
+            self.last_time[cell] = t
+        if t > self.end_time:
+            self.end_time = t
+
+    def add_edge(self, a, b, t):
+        self.edges.add((a, b, t))
+        if t + 1 > self.end_time:
+            self.end_time = t + 1
+
+    # Claim an agent's route for everyone planned after it: its cells, the
+    # reverse of each of its moves, and its goal from arrival on
+    def reserve_path(self, path):
+        for t, cell in enumerate(path):
+            self.add_vertex(cell, t)
+        for t in range(len(path) - 1):
+            if path[t] != path[t + 1]:
+                self.add_edge(path[t + 1], path[t], t)
+        self.parked[path[-1]] = len(path) - 1
+
+    def free(self, cell, t):
+        return (cell, t) not in self.vertices and self.parked.get(cell, math.inf) > t
+
+    # Whether an agent arriving at cell at time t can stay there for good
+    def can_stay(self, cell, t):
+        return cell not in self.parked and self.last_time.get(cell, -1) < t
+
+class MultiAgentResult:
+    __slots__ = ('method', 'paths', 'costs', 'expansions', 'nodes', 'duration', 'status')
+    def __init__(self, method, paths, costs, expansions, nodes, duration, status=None):
+        self.method = method
+        self.paths = paths  # one (row, col) per time step until each agent arrives
+        self.costs = costs
+        self.expansions = expansions  # low-level space-time expansions
+        self.nodes = nodes  # constraint tree nodes for cbs, planning passes for prioritized
+        self.duration = duration
+        self.status = status or (FOUND if paths is not None else NO_PATH)
+    @property
+    def found(self):
+        return self.paths is not None
+    @property
+    def cost(self):
+        return sum(self.costs) if self.costs is not None else None
+    @property
+    def makespan(self):
+        return max(len(path) for path in self.paths) - 1 if self.paths else None
+
+# Space-time A* for one agent. Returns (path of cell ids per time step, cost,
+# expansions, status); the path ends on the first time step from which the
+# agent can stay at its goal. States are (cell, t) with t capped at
+# table.end_time + 1, where waiting stops paying off and the search becomes
+# a plain one around the parked agents. The heuristic is the exact distance
+# to the goal, raised to what the trip costs on an empty map when it has to
+# last until the goal is free for good: each step beyond the fewest needed
+# turns a diagonal into two straight moves or, once none are left, waits.
+def space_time_search(grid, start_idx, goal_idx, tree, table, horizon, deadline=None):
+    cols, mask, neighbor_table, terrain = grid.cols, grid.mask, grid.neighbor_table, grid.cost_list
+    settle_time = max(table.last_time.get(goal_idx, -1) + 1, table.parked.get(goal_idx, -1) + 1)
+    last_step = table.end_time + 1
+    four = grid.connectivity == CONNECT_4
+    goal_row, goal_col = divmod(goal_idx, cols)
+    min_step = min(WAIT_COST, grid.min_cost)
+    unbend_step = min((2 - SQRT2) * grid.min_cost, min_step)
+
+    def heuristic(cell, t, distance):
+        remaining = settle_time - t
+        if remaining <= 0:
+            return distance
+        row, col = divmod(cell, cols)
+        dx, dy = abs(row - goal_row), abs(col - goal_col)
+        if four:
+            steps, diagonals, cost = dx + dy, 0, (dx + dy) * grid.min_cost
+        else:
+            steps, diagonals = max(dx, dy), min(dx, dy)
+            cost = (steps + (SQRT2 - 1) * diagonals) * grid.min_cost
+        extra = remaining - steps
+        if extra > 0:
+            cost += min(extra, diagonals) * unbend_step + max(extra - diagonals, 0) * min_step
+        return max(distance, cost)
+
+    g_costs = {(start_idx, 0): 0}
+    parents = {(start_idx, 0): None}
+    closed = set()
+    open_set = [(heuristic(start_idx, 0, tree.distance(start_idx)), 0, 0, start_idx, 0)]
+    pushes = 1
+    expansions = 0
+    while open_set:
+        _, _, _, cell, t = heapq.heappop(open_set)
+        if (cell, t) in closed:
+            continue
+        if deadline is not None and expansions % DEADLINE_CHECK_EVERY == 0 and time.perf_counter() >= deadline:
+            return None, None, expansions, BUDGET_EXCEEDED
+        closed.add((cell, t))
+        expansions += 1
+        g_cost = g_costs[(cell, t)]
+        if cell == goal_idx and table.can_stay(cell, t):
+            path = []
+            state = (cell, t)
+            while state is not None:
+                path.append(state[0])
+                state = parents[state]
+            return path[::-1], g_cost, expansions, FOUND
+        # Past last_step the search is a plain one and needs no time limit
+        if horizon <= t < last_step:
+            continue
+
+        next_t = min(t + 1, last_step)
+        moves = [(cell, WAIT_COST)] if next_t > t else []
+        for offset, move_cost in neighbor_table[mask[cell]]:
+            neighbor = cell + offset
+            moves.append((neighbor, move_cost * terrain[neighbor] if terrain is not None else move_cost))
+        for neighbor, move_cost in moves:
+            state = (neighbor, next_t)
+            if state in closed or not table.free(neighbor, t + 1) or (cell, neighbor, t) in table.edges:
+                continue
+            new_g = g_cost + move_cost
+            if new_g >= g_costs.get(state, math.inf):
+                continue
+            distance = tree.distance(neighbor)
+            if distance == math.inf:
+                continue
+            g_costs[state] = new_g
+            parents[state] = (cell, t)
+            # Ties go to the state closer to the goal, so an agent that has to
+            # wait for its goal heads there and waits instead of wandering
+            f_cost = new_g + heuristic(neighbor, next_t, distance)
+            heapq.heappush(open_set, (f_cost, distance, pushes, neighbor, next_t))
+            pushes += 1
+    return None, None, expansions, NO_PATH
+
+# Reverse trees by goal, least recently used first. Past max_bytes the oldest
+# are dropped and grown again if their agent is replanned; the tree just
+# asked for is never dropped.
+class _TreeCache:
+    def __init__(self, grid, max_bytes):
+        self.grid = grid
+        self.max_bytes = max_bytes
+        self.trees = OrderedDict()
+
+    def get(self, start_idx, goal_idx):
+        tree = self.trees.pop(goal_idx, None)
+        if tree is None:
+            tree = ReverseTree(self.grid, goal_idx, guide=start_idx)
+        self.trees[goal_idx] = tree
+        total = sum(tree.nbytes() for tree in self.trees.values())
+        while len(self.trees) > 1 and total > self.max_bytes:
+            _, old = self.trees.popitem(last=False)
+            total -= old.nbytes()
+        return tree
+
+# Flat (start, goal) ids per agent and whether every agent can reach its goal
+# at all. Starts and goals must be free and pairwise distinct, or no plan
+# could keep the agents apart.
+def _prepare(grid, agents):
+    ends = [(grid.index(start), grid.index(goal)) for start, goal in agents]
+    for kind, cells in (("start", [s for s, _ in ends]), ("goal", [g for _, g in ends])):
+        if len(set(cells)) != len(cells):
+            raise ValueError(f"two agents share a {kind} cell")
+        walls = [grid.position(cell) for cell in cells if grid.cells.flat[cell] != 0]
+        if walls:
+            raise ValueError(f"agent {kind} cells must be free, {walls[0]} is a wall")
+    labels = grid.components.labels if grid.components is not None else label_components(grid)
+    labels = labels.reshape(-1)
+    return ends, all(labels[start_idx] == labels[goal_idx] for start_idx, goal_idx in ends)
+
+# Latest time step an agent may still be on its way: its shortest path plus
+# time_slack, counted from when its goal is last taken by someone else
+def _horizon(tree, start_idx, goal_idx, table, time_slack):
+    tree.distance(start_idx)
+    steps = len(tree.path(start_idx)) - 1
+    return max(steps, table.last_time.get(goal_idx, -1) + 1) + time_slack
+
+def _result(grid, method, paths, costs, expansions, nodes, start_time, status=None):
+    if paths is not None:
+        paths = [[grid.position(cell) for cell in path] for path in paths]
+    return MultiAgentResult(method, paths, costs, expansions, nodes, time.perf_counter() - start_time, status)
+
+def prioritized_plan(grid, agents, deadline=None, time_slack=DEFAULT_TIME_SLACK, restarts=DEFAULT_RESTARTS,
+                     max_tree_bytes=DEFAULT_MAX_BYTES):
+    start_time = time.perf_counter()
+    grid = as_grid(grid)
+    ends, reachable = _prepare(grid, agents)
+    if not reachable:
+        return _result(grid, "prioritized", None, None, 0, 0, start_time)
+    order = list(range(len(ends)))
+    trees = _TreeCache(grid, max_tree_bytes)
+    expansions = passes = 0
+    for _ in range(restarts + 1):
+        passes += 1
+        table = ReservationTable()
+        paths, costs = [None] * len(ends), [None] * len(ends)
+        failed = None
+        for agent in order:
+            start_idx, goal_idx = ends[agent]
+            tree = trees.get(start_idx, goal_idx)
+            horizon = _horizon(tree, start_idx, goal_idx, table, time_slack)
+            path, cost, used, status = space_time_search(grid, start_idx, goal_idx, tree, table, horizon, deadline)
+            expansions += used
+            if status == BUDGET_EXCEEDED:
+                return _result(grid, "prioritized", None, None, expansions, passes, start_time, status)
+            if path is None:
+                failed = agent
+                break
+            table.reserve_path(path)
+            paths[agent], costs[agent] = path, cost
+        if failed is None:
+            return _result(grid, "prioritized", paths, costs, expansions, passes, start_time)
+        # Agents planned early rarely fail, so the one that did goes first
+        order.remove(failed)
+        order.insert(0, failed)
+    return _result(grid, "prioritized", None, None, expansions, passes, start_time)
+
+# First collision in a joint plan as (agent a, agent b, constraint for a,
+# constraint for b), or None. Constraints are ("vertex", cell, t) or
+# ("edge", from, to, t); agents that have arrived stay on their goal.
+def _first_conflict(paths):
+    makespan = max(len(path) for path in paths)
+    for t in range(makespan + 1):
+        occupied = {}
+        moves = {}
+        for agent, path in enumerate(paths):
+            cell = path[min(t, len(path) - 1)]
+            other = occupied.get(cell)
+            if other is not None:
+                return other, agent, ("vertex", cell, t), ("vertex", cell, t)
+            occupied[cell] = agent
+            if 0 < t < len(path) and path[t - 1] != cell:
+                other = moves.get((cell, path[t - 1]))
+                if other is not None:
+                    return other, agent, ("edge", cell, path[t - 1], t - 1), ("edge", path[t - 1], cell, t - 1)
+                moves[(path[t - 1], cell)] = agent
+    return None
+
+def _constraint_table(constraints):
+    table = ReservationTable()
+    for constraint in constraints:
+        if constraint[0] == "vertex":
+            table.add_vertex(*constraint[1:])
+        else:
+            table.add_edge(*constraint[1:])
+    return table
+
+# max_nodes caps the constraint tree on top of the deadline
+def cbs_plan(grid, agents, deadline=None, time_slack=DEFAULT_TIME_SLACK, max_nodes=None,
+             max_tree_bytes=DEFAULT_MAX_BYTES):
+    start_time = time.perf_counter()
+    grid = as_grid(grid)
+    ends, reachable = _prepare(grid, agents)
+    if not reachable:
+        return _result(grid, "cbs", None, None, 0, 0, start_time)
+    trees = _TreeCache(grid, max_tree_bytes)
+    expansions = nodes = 0
+
+    def replan(agent, constraints):
+        start_idx, goal_idx = ends[agent]
+        table = _constraint_table(constraints)
+        tree = trees.get(start_idx, goal_idx)
+        horizon = _horizon(tree, start_idx, goal_idx, table, time_slack)
+        return space_time_search(grid, start_idx, goal_idx, tree, table, horizon, deadline)
+
+    constraints = [()] * len(ends)
+    paths, costs = [], []
+    for agent in range(len(ends)):
+        path, cost, used, status = replan(agent, ())
+        expansions += used
+        if path is None:
+            return _result(grid, "cbs", None, None, expansions, nodes, start_time, status)
+        paths.append(path)
+        costs.append(cost)
+    open_set = [(sum(costs), 0, constraints, paths, costs)]
+    pushes = 1
+    while open_set:
+        if (max_nodes is not None and nodes >= max_nodes) or (
+                deadline is not None and time.perf_counter() >= deadline):
+            return _result(grid, "cbs", None, None, expansions, nodes, start_time, BUDGET_EXCEEDED)
+        _, _, constraints, paths, costs = heapq.heappop(open_set)
+        nodes += 1
+        conflict = _first_conflict(paths)
+        if conflict is None:
+            return _result(grid, "cbs", paths, costs, expansions, nodes, start_time)
+        for agent, constraint in ((conflict[0], conflict[2]), (conflict[1], conflict[3])):
+            child_constraints = list(constraints)
+            child_constraints[agent] = constraints[agent] + (constraint,)
+            path, cost, used, status = replan(agent, child_constraints[agent])
+            expansions += used
+            if status == BUDGET_EXCEEDED:
+                return _result(grid, "cbs", None, None, expansions, nodes, start_time, status)
+            if path is None:
+                continue
+            child_paths, child_costs = list(paths), list(costs)
+            child_paths[agent], child_costs[agent] = path, cost
+            heapq.heappush(open_set, (sum(child_costs), pushes, child_constraints, child_paths, child_costs))
+            pushes += 1
+    return _result(grid, "cbs", None, None, expansions, nodes, start_time)
+
+# agents is a list of (start, goal) pairs; time_limit is in seconds
+def plan_agents(grid, agents, method="prioritized", time_limit=None, **options):
+    deadline = time.perf_counter() + time_limit if time_limit is not None else None
+    if method == "prioritized":
+        return prioritized_plan(grid, agents, deadline, **options)
+    if method == "cbs":
+        return cbs_plan(grid, agents, deadline, **options)
+    raise ValueError(f"Unknown multi-agent method: {method}")
+
+# count agents with distinct random starts and goals, all inside the largest
+# connected component so every agent can reach its goal on its own
+def random_agents(grid, count, seed=0):
+    grid = as_grid(grid)
+    labels = label_components(grid).reshape(-1)
+    values, sizes = np.unique(labels[labels != WALL], return_counts=True)
+    if not values.size or sizes.max() < count:
+        raise ValueError(f"no connected region of the map holds {count} agents")
+    cells = np.flatnonzero(labels == values[np.argmax(sizes)])
+    rng = np.random.default_rng(seed)
+    starts = rng.choice(cells, count, replace=False)
+    goals = rng.choice(cells, count, replace=False)
+    return [(grid.position(int(start)), grid.position(int(goal))) for start, goal in zip(starts, goals)]
+
+def print_plan(result):
+    print(f"\n--- {result.method.upper()} ({len(result.paths) if result.paths else 0} agents) ---")
+    print(f"Time taken: {result.duration:.6f} sec")
+    print(f"Low-level expansions: {result.expansions}")
+    print(f"{'Constraint tree nodes' if result.method == 'cbs' else 'Planning passes'}: {result.nodes}")
+    if result.found:
+        print(f"Sum of costs: {result.cost:.2f}")
+        print(f"Makespan: {result.makespan}")
+    elif result.status == BUDGET_EXCEEDED:
+        print("Budget exceeded before a plan was found.")
+    else:
+        print("No plan found.")
+
+# Random agents on a map: python multi_agent.py map.txt [agents] [method] [seconds]
+if __name__ == "__main__":
+    import sys
+    map_file = sys.argv[1]
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    method = sys.argv[3] if len(sys.argv) > 3 else "prioritized"
+    time_limit = float(sys.argv[4]) if len(sys.argv) > 4 else None
+    grid = as_grid(map_file)
+    print_plan(plan_agents(grid, random_agents(grid, count), method, time_limit))
@@ -1,57 +1,117 @@
 import streamlit as st
-import os
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
 import json
+import time
 import io
-import csv
-from a_star_pathfinding_multi import load_grid_from_txt, search, bfs, dfs
+from matplotlib.figure import Figure
+from a_star_pathfinding_multi import (CONNECT_8, CONNECTIVITIES, CORNER_CUTTING_ALGORITHMS, FOUND, NO_PATH, Grid,
+                                      parse_grid_txt)
+from benchmark_jobs import JobManager
+from result_cache import ResultCache, result_key
+from results_store import DEFAULT_DB, HEADERS, open_store
+from search_view import ExplorationView
 import xlsxwriter
 from fpdf import FPDF
 
-@st.cache_data
-def load_results(csv_file="results.csv"):
-    if not os.path.exists(csv_file):
-        return pd.DataFrame()
-    return pd.read_csv(csv_file)
-
-def update_results_csv(new_entries, csv_file="results.csv"):
-    headers = ["Map", "Algorithm", "Time(s)", "Nodes Expanded", "Path Length", "Total Cost", "Found"]
-    file_exists = os.path.exists(csv_file)
-    with open(csv_file, 'a', newline='') as f:
-        writer = csv.writer(f)
-        if not file_exists:
-            writer.writerow(headers)
-        writer.writerows(new_entries)
-
-def run_benchmark_on_upload(map_name, grid, start, goal):
-    algorithms = ["a_star", "dijkstra", "greedy", "bfs", "dfs"]
-    results = []
+# Latest run per map/algorithm; an old results.csv is imported on first use.
+# version is the store's version(), so the store is read again only after
+# new runs were added.
+@st.cache_data(max_entries=4)
+def load_results(db_file=DEFAULT_DB, version=None):
+    rows = open_store(db_file).latest()
+    return pd.DataFrame(rows, columns=HEADERS) if rows else pd.DataFrame()
 
+def save_results(new_entries, db_file=DEFAULT_DB):
+    open_store(db_file).add_runs(new_entries)
+
+@st.cache_resource
+def get_result_cache():
+    return ResultCache()
+
+# bi_dijkstra is left out: next to A* it expands far more cells, and it only
+# beats plain Dijkstra, which is already on the list
+DASHBOARD_ALGORITHMS = ["a_star", "dijkstra", "greedy", "bfs", "dfs", "jps", "bi_a_star", "bi_bfs", "bucket_dijkstra"]
+POLL_SECONDS = 0.5
+METRICS = ["Nodes Expanded", "Path Length", "Total Cost"]
+RADAR_LABELS = ['Nodes', 'Length', 'Cost']
+ALGORITHM_COLORS = dict(zip(DASHBOARD_ALGORITHMS, ['green', 'blue', 'orange', 'purple', 'gray', 'red', 'olive',
+                                                    'brown', 'pink']))
+CHART_CACHE_ENTRIES = 256
+
+def result_row(map_name, result):
+    path = result["path"]
+    found = bool(path)
+    return [
+        map_name,
+        result["algorithm"],
+        f"{result['time']:.6f}",
+        result["nodes_expanded"],
+        len(path) if path else 0,
+        f"{result['cost']:.2f}" if found else "-",
+        "Yes" if found else "No"
+    ]
+
+# Dashboard algorithms that support the grid's connectivity
+def map_algorithms(grid):
+    return [algo for algo in DASHBOARD_ALGORITHMS
+            if grid.connectivity == CONNECT_8 or algo not in CORNER_CUTTING_ALGORITHMS]
+
+@st.cache_resource
+def get_job_manager():
+    return JobManager()
+
+# Called on the job thread as each algorithm finishes; runs stopped by a
+# budget or a cancel are neither cached nor stored
+def record_result(map_name, key, result):
+    if result["status"] not in (FOUND, NO_PATH):
+        return
+    get_result_cache().put(key, result)
+    save_results([result_row(map_name, result)])
+
+# Cached algorithms are recorded at once (when the store does not list the
+# map/algorithm yet); the rest go to a background job. Returns its id or None.
+# grid is a Grid, so its connectivity is part of the cache keys.
+def start_benchmark_on_upload(map_name, grid, start, goal, known=(), budgets=None):
+    cache = get_result_cache()
+    fingerprint = grid.fingerprint()
+    algorithms = map_algorithms(grid)
+    keys = {algo: result_key(fingerprint, start, goal, algo) for algo in algorithms}
+    new_rows, missing = [], []
     for algo in algorithms:
-        if algo in ["a_star", "dijkstra", "greedy"]:
-            path, visited = search(grid, start, goal, algorithm=algo)
-        elif algo == "bfs":
-            path, visited = bfs(grid, start, goal)
-        elif algo == "dfs":
-            path, visited = dfs(grid, start, goal)
-
-        found = bool(path)
-        path_len = len(path) if path else 0
-        cost = sum([1 for _ in path]) if path else "-"
-        nodes_exp = len(visited)
-
-        results.append([
-            map_name,
-            algo,
-            "",
-            nodes_exp,
-            path_len,
-            f"{cost:.2f}" if found else "-",
-            "Yes" if found else "No"
-        ])
-    return results
+        cached = cache.get(keys[algo])
+        if cached is None:
+            missing.append(algo)
+        elif (map_name, algo) not in known:
+            new_rows.append(result_row(map_name, cached))
+    if new_rows:
+        save_results(new_rows)
+    if not missing:
+        return None
+    return get_job_manager().submit(
+        map_name, grid, start, goal, missing, budgets,
+        on_result=lambda result: record_result(map_name, keys[result["algorithm"]], result))
+
+# Progress table and cancel button for a background job; True while it runs
+def show_job_progress(job_id):
+    job = get_job_manager().get(job_id) if job_id is not None else None
+    if job is None:
+        return False
+    st.sidebar.subheader(f"⏳ Benchmark: {job.map_name}")
+    progress = pd.DataFrame(job.snapshot())
+    progress["elapsed"] = progress["elapsed"].map(lambda seconds: f"{seconds:.2f}s")
+    st.sidebar.dataframe(progress, hide_index=True)
+    if job.running:
+        if st.sidebar.button("🛑 Cancel benchmark"):
+            job.cancel()
+        return True
+    if job.error is not None:
+        st.sidebar.error(f"❌ Benchmark failed: {job.error}")
+    elif any(result["status"] not in (FOUND, NO_PATH) for result in job.results.values()):
+        st.sidebar.warning("⚠️ Some runs were cancelled or hit their budget and were not saved.")
+    else:
+        st.sidebar.success("✅ Benchmark complete! Data added.")
+    return False
 
 def export_excel(df):
     output = io.BytesIO()
@@ -71,41 +131,102 @@ def export_pdf(df):
     pdf.output(output)
     return output.getvalue()
 
-def plot_radar_live(df, selected_map):
-    metrics = ["Nodes Expanded", "Path Length", "Total Cost"]
-    algorithms = ["a_star", "dijkstra", "greedy", "bfs", "dfs"]
-    labels = ['Nodes', 'Length', 'Cost']
-    colors = ['green', 'blue', 'orange', 'purple', 'gray']
+# Chart data of one results version, built once for all maps: the metrics
+# indexed by (Map, Algorithm), and the same values divided by the largest
+# value of each metric on their map (0 where that is 0 or missing)
+@st.cache_data(max_entries=4)
+def metric_tables(db_file, version):
+    values = load_results(db_file, version).set_index(["Map", "Algorithm"])[METRICS].astype(float)
+    filled = values.fillna(0)
+    peaks = filled.groupby(level="Map").transform("max")
+    return values, (filled / peaks.where(peaks > 0)).fillna(0)
+
+def _png(fig):
+    output = io.BytesIO()
+    fig.savefig(output, format="png", bbox_inches="tight")
+    return output.getvalue()
 
-    data = df[df["Map"] == selected_map]
+# Charts are rendered once per results version, map and metric and kept as
+# PNG bytes, so switching back to a map does not redraw it
+@st.cache_data(max_entries=CHART_CACHE_ENTRIES)
+def bar_chart_png(db_file, version, selected_map, metric):
+    values = metric_tables(db_file, version)[0].loc[selected_map, metric]
+    fig = Figure()
+    ax = fig.subplots()
+    ax.bar(values.index.str.upper(), values.to_numpy(), color='teal')
+    ax.set_title(f"{metric} for {selected_map}")
+    ax.set_ylabel(metric)
+    return _png(fig)
 
-    angles = np.linspace(0, 2 * np.pi, len(metrics), endpoint=False).tolist()
-    angles += angles[:1]  # Loop back to start
+@st.cache_data(max_entries=CHART_CACHE_ENTRIES)
+def radar_chart_png(db_file, version, selected_map):
+    normalized = metric_tables(db_file, version)[1].loc[selected_map]
 
-    fig, ax = plt.subplots(figsize=(6, 6), subplot_kw=dict(polar=True))
+    angles = np.linspace(0, 2 * np.pi, len(METRICS), endpoint=False)
+    angles = np.append(angles, angles[0])  # Loop back to start
 
-    for algo, color in zip(algorithms, colors):
-        subset = data[data["Algorithm"] == algo]
-        if subset.empty:
+    fig = Figure(figsize=(6, 6))
+    ax = fig.add_subplot(polar=True)
+    for algo, color in ALGORITHM_COLORS.items():
+        if algo not in normalized.index:
             continue
-        values = [
-            subset["Nodes Expanded"].values[0],
-            subset["Path Length"].values[0],
-            float(subset["Total Cost"].values[0]) if subset["Total Cost"].values[0] != "-" else 0
-        ]
-        max_vals = [max(df[m]) for m in metrics]
-        norm_values = [v / m if m > 0 else 0 for v, m in zip(values, max_vals)]
-        norm_values += norm_values[:1]
+        norm_values = normalized.loc[algo].to_numpy()
+        norm_values = np.append(norm_values, norm_values[0])
         ax.plot(angles, norm_values, label=algo.upper(), color=color)
         ax.fill(angles, norm_values, alpha=0.1, color=color)
 
     ax.set_title(f"Radar Chart: {selected_map}")
     ax.set_xticks(angles[:-1])
-    ax.set_xticklabels(labels)
+    ax.set_xticklabels(RADAR_LABELS)
     ax.set_yticks([0.25, 0.5, 0.75, 1.0])
     ax.set_yticklabels(['25%', '50%', '75%', '100%'])
     ax.legend(loc='upper right', bbox_to_anchor=(1.3, 1.1))
-    st.pyplot(fig)
+    return _png(fig)
+
+def plot_radar_live(db_file, version, selected_map):
+    st.image(radar_chart_png(db_file, version, selected_map))
+
+# Traced runs go through the same background jobs as the benchmark, so a
+# long search never blocks the page. The picture of a finished job is cached
+# by its id; _grid and _result are left out of the key.
+@st.cache_data(max_entries=32)
+def exploration_image(job_id, animate, _grid, _result):
+    view = ExplorationView(_grid, _result["visited"], _result["path"], _result["start"], _result["goal"])
+    return view.gif() if animate else view.png(), view.scale
+
+# Traced run of one algorithm on the uploaded map; True while it still runs
+def show_exploration(map_name, grid, start, goal, budget):
+    st.subheader("🔍 Search Exploration")
+    col1, col2 = st.columns([3, 1])
+    algorithm = col2.selectbox("Algorithm", map_algorithms(grid))
+    animate = col2.checkbox("Animate expansion")
+
+    # One job per map, endpoints, algorithm and budget, reused across reruns
+    jobs = st.session_state.setdefault("exploration_jobs", {})
+    key = (map_name, grid.fingerprint(), start, goal, algorithm, budget)
+    job = get_job_manager().get(jobs.get(key))
+    if job is None:
+        budgets = {algorithm: budget} if any(budget) else None
+        jobs[key] = get_job_manager().submit(map_name, grid, start, goal, [algorithm], budgets, trace=True)
+        job = get_job_manager().get(jobs[key])
+
+    if job.running:
+        progress = job.snapshot()[0]
+        col1.info(f"⏳ Tracing {algorithm.upper()}: {progress['expansions']} expansions, "
+                  f"{progress['elapsed']:.2f}s")
+        if col2.button("🛑 Cancel trace"):
+            job.cancel()
+        return True
+    if job.error is not None:
+        col1.error(f"❌ Trace failed: {job.error}")
+        return False
+    result = job.results[algorithm]
+    image, scale = exploration_image(jobs[key], animate, grid, result)
+    col1.image(image)
+    col2.caption(f"{result['nodes_expanded']} expansions, {result['status']}")
+    if scale > 1:
+        col2.caption(f"1 pixel = {scale}x{scale} cells")
+    return False
 
 def main():
     st.set_page_config(layout="wide")
@@ -115,47 +236,72 @@ def main():
     st.sidebar.header("📥 Upload New Grid Map")
     uploaded_txt = st.sidebar.file_uploader("Upload .txt Map", type="txt")
     uploaded_json = st.sidebar.file_uploader("Upload .json Metadata (optional)", type="json")
+    with st.sidebar.expander("⏱ Budget per algorithm"):
+        max_seconds = st.number_input("Time limit (s, 0 = none)", min_value=0.0, value=0.0, step=1.0)
+        max_expansions = st.number_input("Expansion limit (0 = none)", min_value=0, value=0, step=10000)
+    budget = (max_seconds or None, int(max_expansions) or None)
+    budgets = {algo: budget for algo in DASHBOARD_ALGORITHMS} if any(budget) else None
+    connectivity = st.sidebar.selectbox("Connectivity", CONNECTIVITIES,
+                                        help="8: diagonals may cut wall corners; 8-no-cut: they may not; 4: no diagonals")
 
+    uploaded = None
     if uploaded_txt:
         map_name = uploaded_txt.name
-        grid = [[int(cell) for cell in line.strip().split()] for line in uploaded_txt.getvalue().decode().splitlines()]
-        start, goal = (0, 0), (len(grid)-1, len(grid[0])-1)
+        try:
+            grid = Grid(parse_grid_txt(uploaded_txt), connectivity=connectivity)
+        except ValueError as e:
+            st.sidebar.error(f"❌ Could not read {map_name}: {e}")
+            return
+        # Results of other modes are listed as separate maps
+        if connectivity != CONNECT_8:
+            map_name = f"{map_name} [{connectivity}]"
+        start, goal = (0, 0), (grid.rows-1, grid.cols-1)
 
         if uploaded_json:
             meta = json.load(uploaded_json)
             start = tuple(meta.get("start", start))
             goal = tuple(meta.get("goal", goal))
 
-        st.sidebar.success(f"Running benchmark for {map_name}")
-        results = run_benchmark_on_upload(map_name, grid, start, goal)
-        update_results_csv(results)
-        st.sidebar.success("✅ Benchmark complete! Data added.")
+        # Reruns of the same upload reuse its job instead of starting another
+        upload_key = (map_name, grid.fingerprint(), start, goal)
+        if st.session_state.get("upload_key") != upload_key:
+            st.session_state["upload_key"] = upload_key
+            known = open_store().known_pairs()
+            st.session_state["job_id"] = start_benchmark_on_upload(map_name, grid, start, goal, known, budgets)
+            if st.session_state["job_id"] is None:
+                st.sidebar.info("♻️ Results for this map were already cached.")
+        uploaded = (map_name, grid, start, goal)
 
-        # 🔁 Force reload results after benchmark
-        df = pd.read_csv("results.csv")
-    else:
-        df = load_results()
+    polling = show_job_progress(st.session_state.get("job_id"))
+    version = open_store().version()
+    df = load_results(DEFAULT_DB, version)
 
     if df.empty:
         st.warning("⚠️ No results available. Upload a map to get started.")
-        return
+    else:
+        show_results(df, DEFAULT_DB, version)
+    if uploaded:
+        polling = show_exploration(*uploaded, budget) or polling
+
+    # Refresh while a background benchmark runs so its progress stays live
+    if polling:
+        time.sleep(POLL_SECONDS)
+        st.rerun()
 
+def show_results(df, db_file, version):
     # --- Visualization & Interaction Section ---
     maps = df['Map'].unique()
     selected_map = st.selectbox("Select a Map", maps)
 
     col1, col2 = st.columns([2, 1])
-    metric = col1.radio("Metric to Compare", ["Nodes Expanded", "Path Length", "Total Cost"])
-    filtered = df[df['Map'] == selected_map]
-    fig, ax = plt.subplots()
-    ax.bar(filtered['Algorithm'].str.upper(), filtered[metric], color='teal')
-    ax.set_title(f"{metric} for {selected_map}")
-    ax.set_ylabel(metric)
-    col1.pyplot(fig)
+    metric = col1.radio("Metric to Compare", METRICS)
+    col1.image(bar_chart_png(db_file, version, selected_map, metric))
 
     with col2:
         st.markdown("🕸 **Live Radar Chart**")
-        plot_radar_live(df, selected_map)
+        plot_radar_live(db_file, version, selected_map)
+
+    filtered = df[df['Map'] == selected_map]
 
     st.subheader("📋 Results Table")
     st.dataframe(filtered.reset_index(drop=True))
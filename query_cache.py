@@ -0,0 +1,233 @@
+import heapq
+import math
+import time
+from collections import OrderedDict
+from a_star_pathfinding_multi import (BUDGET_EXCEEDED, CLOSED, DEADLINE_CHECK_EVERY, SearchResult, as_grid,
+                                      diagonal_extra, print_metrics)
+
+# Per-map cache of reverse search trees for queries that share a goal, such as
+# many agents heading for one depot. Each goal gets a Dijkstra search run
+# backwards from it that pauses as soon as the asked-for start is settled and
+# resumes on later queries: a start the tree has already settled is answered
+# by walking parent links without any search, and other starts only pay for
+# the part of the tree they add. Trees are kept in LRU order and the oldest
+# are evicted once their combined size passes max_bytes. The cache watches its
+# grid (Grid.watchers): an edit next to a cell a tree has reached drops that
+# tree, and trees that never came near the edit are kept. Trees only store the
+# cells they have reached, so their size follows the search, not the map.
+
+DEFAULT_MAX_BYTES = 64 << 20
+HEAP_ENTRY_BYTES = 72  # one (cost, push id, cell) tuple in an open list, roughly
+REACHED_CELL_BYTES = 200  # one cell's entries in the g-cost, parent and state dicts, roughly
+
+# guide, a flat cell id, aims the search at that cell like A* (reverse
+# resumable A*): cells toward the guide settle first, and as the grid
+# heuristic is consistent every settled distance is still exact. Guided trees
+# assume the grid's cheapest terrain cost does not drop while they are used.
+class ReverseTree:
+    def __init__(self, grid, goal_idx, guide=None):
+        self.grid = grid
+        self.goal_idx = goal_idx
+        self.guide = guide
+        self.h_extra, self.h_scale = diagonal_extra(grid), grid.min_cost
+        # Keyed by the cells reached so far; a missing cell is unseen, at inf
+        self.g_costs = {goal_idx: 0}
+        # Next cell on the way to the goal; -1 at the goal
+        self.parents = {goal_idx: -1}
+        self.state = {goal_idx: 0}
+        self.open_set = [(self._h(goal_idx), 0, goal_idx)]
+        self.pushes = self.peak_open = 1
+        self.expansions = 0
+
+    def nbytes(self):
+        return REACHED_CELL_BYTES * len(self.g_costs) + HEAP_ENTRY_BYTES * len(self.open_set)
+
+    def reached(self, idx):
+        return idx in self.g_costs
+
+    def _h(self, idx):
+        if self.guide is None:
+            return 0
+        (row, col), (guide_row, guide_col) = divmod(idx, self.grid.cols), divmod(self.guide, self.grid.cols)
+        dx, dy = abs(row - guide_row), abs(col - guide_col)
+        return (max(dx, dy) + self.h_extra * min(dx, dy)) * self.h_scale
+
+    # Resume the search until every target is settled or nothing is left to
+    # expand. Returns the expansions this call made and BUDGET_EXCEEDED when
+    # max_expansions or the deadline stopped it first (None otherwise); the
+    # tree keeps its progress either way.
+    def grow(self, targets, max_expansions=None, deadline=None, visited_nodes=None):
+        grid = self.grid
+        cols, mask, neighbor_table, terrain = grid.cols, grid.mask, grid.neighbor_table, grid.cost_list
+        g_costs, parents, state, open_set = self.g_costs, self.parents, self.state, self.open_set
+        remaining = {target for target in targets if state.get(target) != CLOSED}
+        pushes, peak_open = self.pushes, self.peak_open
+        guided = self.guide is not None
+        if guided:
+            guide_row, guide_col = divmod(self.guide, cols)
+            h_extra, h_scale = self.h_extra, self.h_scale
+        expansions = 0
+        status = None
+        while remaining and open_set:
+            if max_expansions is not None and expansions >= max_expansions:
+                status = BUDGET_EXCEEDED
+                break
+            if deadline is not None and expansions % DEADLINE_CHECK_EVERY == 0 and time.perf_counter() >= deadline:
+                status = BUDGET_EXCEEDED
+                break
+            _, push_id, current = heapq.heappop(open_set)
+            if push_id != state[current]:
+                continue
+            state[current] = CLOSED
+            expansions += 1
+            remaining.discard(current)
+            if visited_nodes is not None:
+                visited_nodes.append(divmod(current, cols))
+
+            # Every move into current pays current's terrain cost
+            current_g = g_costs[current]
+            step = terrain[current] if terrain is not None else 1
+            for offset, move_cost in neighbor_table[mask[current]]:
+                neighbor = current + offset
+                g_cost = current_g + move_cost * step
+                if g_cost < g_costs.get(neighbor, math.inf) and state.get(neighbor) != CLOSED:
+                    g_costs[neighbor] = g_cost
+                    parents[neighbor] = current
+                    state[neighbor] = pushes
+                    if guided:
+                        row, col = divmod(neighbor, cols)
+                        dx, dy = abs(row - guide_row), abs(col - guide_col)
+                        heapq.heappush(open_set, (g_cost + (max(dx, dy) + h_extra * min(dx, dy)) * h_scale,
+                                                  pushes, neighbor))
+                    else:
+                        heapq.heappush(open_set, (g_cost, pushes, neighbor))
+                    pushes += 1
+            if len(open_set) > peak_open:
+                peak_open = len(open_set)
+        self.pushes, self.peak_open = pushes, peak_open
+        self.expansions += expansions
+        return expansions, status
+
+    # Exact cost from idx to the goal (inf when it cannot get there), growing
+    # the tree as far as needed; a perfect heuristic for searches to this goal
+    def distance(self, idx):
+        if self.state.get(idx) != CLOSED:
+            self.grow([idx])
+        return self.g_costs[idx] if self.state.get(idx) == CLOSED else math.inf
+
+    # Cells from idx to the goal along the settled tree
+    def path(self, idx):
+        path = []
+        while idx != -1:
+            path.append(self.grid.position(idx))
+            idx = self.parents[idx]
+        return path
+
+class QueryCache:
+    def __init__(self, grid, max_bytes=DEFAULT_MAX_BYTES):
+        self.grid = as_grid(grid)
+        self.max_bytes = max_bytes
+        self.trees = OrderedDict()  # goal idx -> ReverseTree, least recently used first
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+        self.grid.watchers.append(self._cell_changed)
+
+    # Stop watching the grid and drop every tree
+    def close(self):
+        if self._cell_changed in self.grid.watchers:
+            self.grid.watchers.remove(self._cell_changed)
+        self.trees.clear()
+
+    def nbytes(self):
+        return sum(tree.nbytes() for tree in self.trees.values())
+
+    # Same arguments and SearchResult as the solvers; expansions counts only
+    # the cells this query added to its goal's tree, so a hit reports 0
+    def search(self, start, goal, trace=False, verbose=False, max_expansions=None, deadline=None):
+        start_time = time.perf_counter()
+        grid = self.grid
+        start_idx, goal_idx = grid.index(start), grid.index(goal)
+        visited_nodes = [] if trace else None
+        def finish(path, cost, expansions=0, pushes=0, peak_open=0, status=None):
+            result = SearchResult("query_cache", path, cost, expansions, pushes, peak_open,
+                                  time.perf_counter() - start_time, visited_nodes, status)
+            if verbose:
+                print_metrics(result)
+            return result
+
+        if start_idx == goal_idx:
+            return finish([tuple(start)], 0)
+        # Nothing steps into a wall, so a walled-in goal is never reached
+        if grid.cells.flat[goal_idx] != 0 or (
+                grid.components is not None and not grid.components.connected(start_idx, goal_idx)):
+            return finish(None, None)
+
+        tree = self.trees.get(goal_idx)
+        if tree is None:
+            tree = self.trees[goal_idx] = ReverseTree(grid, goal_idx)
+        self.trees.move_to_end(goal_idx)
+        # A start on a wall steps onto one of its free neighbors first
+        if grid.cells.flat[start_idx] == 0:
+            first_steps = [(start_idx, 0)]
+        else:
+            terrain = grid.cost_list
+            first_steps = []
+            for offset, move_cost in grid.neighbor_table[grid.mask[start_idx]]:
+                cell = start_idx + offset
+                first_steps.append((cell, move_cost * (terrain[cell] if terrain is not None else 1)))
+        pushes_before = tree.pushes
+        expansions, status = tree.grow([cell for cell, _ in first_steps], max_expansions, deadline, visited_nodes)
+        if expansions:
+            self.misses += 1
+        else:
+            self.hits += 1
+        self._evict()
+        pushes = tree.pushes - pushes_before
+        if status is not None:
+            return finish(None, None, expansions, pushes, tree.peak_open, status)
+
+        cost, first = min(((tree.g_costs.get(cell, math.inf) + step, cell) for cell, step in first_steps), default=(math.inf, -1))
+        if cost == math.inf:
+            return finish(None, None, expansions, pushes, tree.peak_open)
+        path = tree.path(first)
+        if first != start_idx:
+            path.insert(0, tuple(start))
+        return finish(path, cost, expansions, pushes, tree.peak_open)
+
+    # The tree just used is never evicted, even when it alone is over budget
+    def _evict(self):
+        total = self.nbytes()
+        while len(self.trees) > 1 and total > self.max_bytes:
+            _, tree = self.trees.popitem(last=False)
+            total -= tree.nbytes()
+            self.evictions += 1
+
+    # Grid watcher. A tree whose reached cells all lie away from the edited
+    # cell and its neighbors never relaxed a move the edit added, removed or
+    # repriced, so it is still exactly the search the new grid would run.
+    def _cell_changed(self, idx):
+        nearby = [idx] + self.grid.adjacent(idx)
+        stale = [goal_idx for goal_idx, tree in self.trees.items() if any(tree.reached(cell) for cell in nearby)]
+        for goal_idx in stale:
+            del self.trees[goal_idx]
+        self.invalidations += len(stale)
+
+# Many starts, one goal: python query_cache.py map.txt [queries]
+if __name__ == "__main__":
+    import sys
+    import numpy as np
+    from a_star_pathfinding_multi import flat_search, load_map
+    map_file = sys.argv[1]
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    grid = as_grid(map_file)
+    goal = load_map(map_file)[1]["goal"]
+    free = np.flatnonzero(grid.cells.reshape(-1) == 0)
+    if goal is None:
+        goal = grid.position(int(free[-1]))
+    starts = [grid.position(int(idx)) for idx in np.random.default_rng(0).choice(free, queries)]
+
+    cache = QueryCache(grid)
+    cached_time = sum(cache.search(start, goal).duration for start in starts)
+    plain_time = sum(flat_search(grid, start, goal).duration for start in starts)
+    print(f"✅ {queries} queries to {goal}: {cache.hits} hits, {cache.misses} misses, "
+          f"{cache.nbytes() / 1024:.0f} KiB cached")
+    print(f"⏱ cached {cached_time:.4f}s vs a_star {plain_time:.4f}s")
@@ -0,0 +1,204 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from matplotlib import colormaps
+from matplotlib.figure import Figure
+from a_star_pathfinding_multi import ALGORITHMS
+from results_store import DEFAULT_DB, HEADERS, open_store
+
+# Report charts for the results store. The latest run of every map/algorithm
+# pair is loaded once and pivoted into one array of shape (maps, metrics,
+# algorithms), NaN where an algorithm has no run on a map. The algorithm axis
+# holds every algorithm found in the store, in ALGORITHM_ORDER and then by
+# name, and each keeps one color across all charts. Every chart is a
+# small picklable job holding its slice of that array, and the jobs are
+# rendered across a process pool, so hundreds of maps take seconds. Charts
+# are drawn on plain Figures, never through pyplot's global state.
+
+METRICS = ["Nodes", "Length", "Cost"]
+METRIC_COLUMNS = {"Nodes": "Nodes Expanded", "Length": "Path Length", "Cost": "Total Cost"}
+YLABELS = {"Nodes": "Nodes Expanded", "Length": "Path Length", "Cost": "Total Path Cost"}
+ALGORITHM_ORDER = ALGORITHMS + ["hpa", "alt"]
+ALGORITHM_COLORMAP = "tab20"
+STACK_COLORS = ['skyblue', 'orange', 'lightgreen']
+PER_MAP_CHARTS = ["bar", "radar", "stacked"]
+PER_METRIC_CHARTS = ["grouped", "lines"]
+CHARTS = PER_MAP_CHARTS + PER_METRIC_CHARTS
+
+# Map names, algorithm names, and their metrics as an array indexed [map,
+# metric, algorithm] following METRICS. A run without a path counts as cost 0.
+def load_results(db_file=DEFAULT_DB):
+    rows = open_store(db_file).latest()
+    if not rows:
+        return [], [], np.zeros((0, len(METRICS), 0))
+    frame = pd.DataFrame(rows, columns=HEADERS).rename(columns={v: k for k, v in METRIC_COLUMNS.items()})
+    frame["Cost"] = frame["Cost"].fillna(0)
+    present = set(frame["Algorithm"])
+    algorithms = [algo for algo in ALGORITHM_ORDER if algo in present] + sorted(present - set(ALGORITHM_ORDER))
+    wide = frame.set_index(["Map", "Algorithm"])[METRICS].unstack("Algorithm")
+    wide = wide.reindex(columns=pd.MultiIndex.from_product([METRICS, algorithms]))
+    values = wide.to_numpy(dtype=float).reshape(len(wide), len(METRICS), len(algorithms))
+    return list(wide.index), algorithms, values
+
+# One color per algorithm, the same in every chart of a report
+def algorithm_colors(algorithms):
+    palette = colormaps[ALGORITHM_COLORMAP]
+    return [palette(i % palette.N) for i in range(len(algorithms))]
+
+def _stem(map_name):
+    return map_name.replace(".txt", "")
+
+# values: [metric, algorithm] for one map; algorithms without a run are left out
+def plot_metric(map_name, metric, algorithms, values):
+    row = values[METRICS.index(metric)]
+    ran = ~np.isnan(row)
+    fig = Figure(figsize=(max(6.4, 0.6 * len(algorithms)), 4.8))
+    ax = fig.subplots()
+    x = np.flatnonzero(ran)
+    ax.bar(x, row[ran], color=np.array(algorithm_colors(algorithms))[ran])
+    ax.set_xticks(x, np.array(algorithms)[ran], rotation=45, ha='right')
+    ax.set_title(f"{metric} on {map_name}")
+    ax.set_ylabel(YLABELS[metric])
+    ax.set_xlabel("Algorithm")
+    return fig, f"{_stem(map_name)}_{metric}.png"
+
+# Each algorithm's three metrics scaled by the largest of them
+def plot_radar(map_name, algorithms, values):
+    angles = np.linspace(0, 2 * np.pi, len(METRICS), endpoint=False)
+    angles = np.append(angles, angles[0])  # loop back to start
+    peaks = values.max(axis=0)
+    normalized = np.divide(values, peaks, out=np.zeros_like(values), where=peaks > 0)
+
+    fig = Figure(figsize=(6, 6))
+    ax = fig.add_subplot(polar=True)
+    for column, (algo, color) in enumerate(zip(algorithms, algorithm_colors(algorithms))):
+        if np.isnan(values[0, column]):
+            continue
+        points = np.append(normalized[:, column], normalized[0, column])
+        ax.plot(angles, points, label=algo.upper(), color=color)
+        ax.fill(angles, points, alpha=0.1, color=color)
+
+    ax.set_title(f"Radar Chart: {map_name}")
+    ax.set_xticks(angles[:-1])
+    ax.set_xticklabels(METRICS)
+    ax.set_yticks([0.25, 0.5, 0.75, 1.0])
+    ax.set_yticklabels(['25%', '50%', '75%', '100%'])
+    ax.legend(loc='upper left', bbox_to_anchor=(1.1, 1.05))
+    return fig, f"{_stem(map_name)}_radar.png"
+
+def plot_stacked_bar(map_name, algorithms, values):
+    values = np.nan_to_num(values)
+    x = np.arange(len(algorithms))
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    bottom = np.zeros(len(algorithms))
+    for metric, row, color in zip(METRICS, values, STACK_COLORS):
+        ax.bar(x, row, 0.6, bottom=bottom, label=metric, color=color)
+        bottom += row
+
+    ax.set_title(f"Stacked Bar Chart: {map_name}")
+    ax.set_xlabel("Algorithm")
+    ax.set_ylabel("Total Effort")
+    ax.set_xticks(x, [algo.upper() for algo in algorithms], rotation=45, ha='right')
+    ax.legend()
+    return fig, f"{_stem(map_name)}_stacked_bar.png"
+
+# values: [map, algorithm] of one metric across every map
+def plot_grouped_bar(map_names, metric, algorithms, values):
+    values = np.nan_to_num(values)
+    bar_width = 0.15
+    index = np.arange(len(algorithms))
+    offsets = np.linspace(-bar_width * len(map_names) / 2, bar_width * len(map_names) / 2, len(map_names))
+
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    for map_name, offset, row in zip(map_names, offsets, values):
+        ax.bar(index + offset, row, width=bar_width, label=map_name)
+
+    ax.set_xticks(index, [algo.upper() for algo in algorithms], rotation=45, ha='right')
+    ax.set_ylabel(YLABELS[metric])
+    ax.set_title(f"{metric} Comparison Across Maps")
+    ax.legend(title="Map")
+    return fig, f"comparison_{metric}.png"
+
+def plot_metric_lines(map_names, metric, algorithms, values):
+    values = np.nan_to_num(values)
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    for algo, color, column in zip(algorithms, algorithm_colors(algorithms), values.T):
+        ax.plot(map_names, column, marker='o', label=algo.upper(), color=color)
+
+    ax.set_title(f"{metric} Trend Across Maps")
+    ax.set_xlabel("Map")
+    ax.set_ylabel(YLABELS[metric])
+    ax.tick_params(axis='x', labelrotation=45)
+    ax.grid(True)
+    ax.legend()
+    return fig, f"line_{metric}.png"
+
+# One (chart, name(s), metric, algorithms, data) job per figure
+def chart_jobs(map_names, algorithms, values, charts=CHARTS):
+    jobs = []
+    for map_name, map_values in zip(map_names, values):
+        if "bar" in charts:
+            jobs.extend(("bar", map_name, metric, algorithms, map_values) for metric in METRICS)
+        if "radar" in charts:
+            jobs.append(("radar", map_name, None, algorithms, map_values))
+        if "stacked" in charts:
+            jobs.append(("stacked", map_name, None, algorithms, map_values))
+    for chart in PER_METRIC_CHARTS:
+        if chart in charts and map_names:
+            jobs.extend((chart, map_names, metric, algorithms, values[:, i]) for i, metric in enumerate(METRICS))
+    return jobs
+
+def render_chart(job, output_dir="."):
+    chart, name, metric, algorithms, data = job
+    if chart == "bar":
+        fig, filename = plot_metric(name, metric, algorithms, data)
+    elif chart == "radar":
+        fig, filename = plot_radar(name, algorithms, data)
+    elif chart == "stacked":
+        fig, filename = plot_stacked_bar(name, algorithms, data)
+    elif chart == "grouped":
+        fig, filename = plot_grouped_bar(name, metric, algorithms, data)
+    else:
+        fig, filename = plot_metric_lines(name, metric, algorithms, data)
+    path = os.path.join(output_dir, filename)
+    fig.savefig(path, bbox_inches="tight")
+    return path
+
+def _render_batch(jobs, output_dir):
+    return [render_chart(job, output_dir) for job in jobs]
+
+# Render every chart, spread over workers processes (all CPUs by default, or
+# in this process with workers=1); returns the saved paths
+def write_report(db_file=DEFAULT_DB, charts=CHARTS, output_dir=".", workers=None):
+    map_names, algorithms, values = load_results(db_file)
+    jobs = chart_jobs(map_names, algorithms, values, charts)
+    os.makedirs(output_dir, exist_ok=True)
+    workers = min(workers or os.cpu_count(), len(jobs))
+    if workers <= 1:
+        return _render_batch(jobs, output_dir)
+    # A few batches per worker keeps pickling overhead low and the load even
+    batch = -(-len(jobs) // (workers * 4))
+    batches = [jobs[i:i + batch] for i in range(0, len(jobs), batch)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(_render_batch, batches, [output_dir] * len(batches))
+        return [path for paths in results for path in paths]
+
+def main():
+    parser = argparse.ArgumentParser(description="Render benchmark charts from the results store")
+    parser.add_argument("db", nargs="?", default=DEFAULT_DB)
+    parser.add_argument("--charts", nargs="+", choices=CHARTS, default=CHARTS)
+    parser.add_argument("--output", default=".", help="directory for the PNG files")
+    parser.add_argument("--workers", type=int, default=None, help="render processes (default: all CPUs)")
+    args = parser.parse_args()
+    started = time.perf_counter()
+    paths = write_report(args.db, args.charts, args.output, args.workers)
+    print(f"✅ Saved {len(paths)} charts to {args.output} in {time.perf_counter() - started:.2f}s")
+
+if __name__ == "__main__":
+    main()
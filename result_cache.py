@@ -0,0 +1,77 @@
+import hashlib
+import json
+import os
+import tempfile
+from a_star_pathfinding_multi import SOLVER_VERSION
+
+# Persistent, content-addressed cache of solver results. Keys hash the map
+# contents (its fingerprint), start, goal, algorithm and SOLVER_VERSION, so a
+# renamed or re-uploaded map still hits and a solver change invalidates
+# everything. Each entry is one JSON file; a hit refreshes its mtime, and
+# writes evict the least recently used entries once the directory grows past
+# max_bytes.
+
+DEFAULT_CACHE_DIR = ".result_cache"
+DEFAULT_MAX_BYTES = 256 << 20
+
+def result_key(fingerprint, start, goal, algorithm):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps([fingerprint, list(start), list(goal), algorithm, SOLVER_VERSION]).encode())
+    return digest.hexdigest()
+
+class ResultCache:
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                result = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None  # missing, evicted meanwhile, or a torn file
+        for field in ("start", "goal"):
+            result[field] = tuple(result[field])
+        if result.get("path") is not None:
+            result["path"] = [tuple(cell) for cell in result["path"]]
+        return result
+
+    def put(self, key, result):
+        entry = {field: value for field, value in result.items() if field not in ("job", "map", "visited")}
+        # Write to a temporary file and rename, so readers never see half an entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, self._path(key))
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".json"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def __len__(self):
+        return sum(1 for name in os.listdir(self.directory) if name.endswith(".json"))
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                os.remove(os.path.join(self.directory, name))
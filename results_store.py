@@ -0,0 +1,186 @@
+import csv
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+# SQLite-backed store for benchmark runs. Every run is one row in `runs`,
+# indexed on (map, algorithm, run_at); `latest` keeps a pointer to the newest
+# run of each map/algorithm pair, so the dashboard view costs one row per
+# pair no matter how many runs have piled up. WAL mode lets dashboard
+# sessions read while another one writes, and writes wait on a busy timeout
+# instead of failing.
+
+DEFAULT_DB = "results.db"
+HEADERS = ["Map", "Algorithm", "Time(s)", "Nodes Expanded", "Path Length", "Total Cost", "Found"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    map TEXT NOT NULL,
+    algorithm TEXT NOT NULL,
+    run_at REAL NOT NULL,
+    time REAL,
+    nodes_expanded INTEGER NOT NULL,
+    path_length INTEGER NOT NULL,
+    cost REAL,
+    found INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_map_algorithm_run_at ON runs (map, algorithm, run_at);
+CREATE INDEX IF NOT EXISTS runs_run_at ON runs (run_at);
+CREATE TABLE IF NOT EXISTS latest (
+    map TEXT NOT NULL,
+    algorithm TEXT NOT NULL,
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    PRIMARY KEY (map, algorithm)
+);
+CREATE TABLE IF NOT EXISTS imports (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    rows INTEGER NOT NULL
+);
+"""
+
+COLUMNS = "runs.map, runs.algorithm, runs.time, runs.nodes_expanded, runs.path_length, runs.cost, runs.found"
+
+# Accepts the CSV-style rows the benchmark and dashboard build ("-" for no
+# cost, "Yes"/"No" for found, "" for a missing time) as well as typed values
+def _row_values(row):
+    map_name, algorithm, duration, nodes, length, cost, found = row
+    return (
+        map_name,
+        algorithm,
+        float(duration) if duration not in (None, "") else None,
+        int(nodes),
+        int(length),
+        float(cost) if cost not in (None, "", "-") else None,
+        int(found == "Yes" if isinstance(found, str) else bool(found)),
+    )
+
+def _as_row(record):
+    map_name, algorithm, duration, nodes, length, cost, found = record
+    return dict(zip(HEADERS, (map_name, algorithm, duration, nodes, length, cost, "Yes" if found else "No")))
+
+class ResultsStore:
+    def __init__(self, path=DEFAULT_DB):
+        self.path = path
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    # A short-lived connection per call keeps the store safe to share across
+    # Streamlit's script threads
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _insert(self, conn, values, run_at):
+        for value in values:
+            cursor = conn.execute(
+                "INSERT INTO runs (map, algorithm, time, nodes_expanded, path_length, cost, found, run_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", value + (run_at,))
+            conn.execute(
+                "INSERT INTO latest (map, algorithm, run_id) VALUES (?, ?, ?) "
+                "ON CONFLICT (map, algorithm) DO UPDATE SET run_id = excluded.run_id",
+                (value[0], value[1], cursor.lastrowid))
+
+    # Batch insert in one transaction; returns the number of rows added
+    def add_runs(self, rows, run_at=None):
+        run_at = time.time() if run_at is None else run_at
+        values = [_row_values(row) for row in rows]
+        with closing(self._connect()) as conn, conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._insert(conn, values, run_at)
+        return len(values)
+
+    # Newest run of every map/algorithm pair (optionally for one map), as
+    # dicts keyed like the CSV headers with None for a missing time or cost
+    def latest(self, map_name=None):
+        query = f"SELECT {COLUMNS} FROM latest JOIN runs ON runs.id = latest.run_id"
+        params = ()
+        if map_name is not None:
+            query += " WHERE latest.map = ?"
+            params = (map_name,)
+        with closing(self._connect()) as conn:
+            records = conn.execute(query + " ORDER BY latest.map, runs.id", params).fetchall()
+        return [_as_row(record) for record in records]
+
+    # Full run history, newest first, filtered by any of map, algorithm and a
+    # run_at lower bound (seconds since the epoch)
+    def runs(self, map_name=None, algorithm=None, since=None, limit=None):
+        conditions, params = [], []
+        for column, value in (("map = ?", map_name), ("algorithm = ?", algorithm), ("run_at >= ?", since)):
+            if value is not None:
+                conditions.append(column)
+                params.append(value)
+        query = f"SELECT {COLUMNS}, runs.run_at FROM runs"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY run_at DESC, id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with closing(self._connect()) as conn:
+            records = conn.execute(query, params).fetchall()
+        return [dict(_as_row(record[:-1]), run_at=record[-1]) for record in records]
+
+    # Runs are only ever appended, so the newest run id changes exactly when
+    # the results do; callers key their caches on it
+    def version(self):
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COALESCE(MAX(id), 0) FROM runs").fetchone()[0]
+
+    def known_pairs(self):
+        with closing(self._connect()) as conn:
+            return set(conn.execute("SELECT map, algorithm FROM latest").fetchall())
+
+    # One-time import of an old results.csv; the file's size and mtime are
+    # recorded so importing the same file again is a no-op that never reads
+    # the rows. Returns rows added.
+    def import_csv(self, csv_path):
+        stat = os.stat(csv_path)
+        key = os.path.abspath(csv_path)
+        query = "SELECT size, mtime FROM imports WHERE path = ?"
+        with closing(self._connect()) as conn:
+            if conn.execute(query, (key,)).fetchone() == (stat.st_size, stat.st_mtime):
+                return 0
+        with open(csv_path, newline='') as f:
+            values = [_row_values([row[header] for header in HEADERS]) for row in csv.DictReader(f)]
+        with closing(self._connect()) as conn, conn:
+            # Checked again inside the write lock so two sessions cannot both import
+            conn.execute("BEGIN IMMEDIATE")
+            if conn.execute(query, (key,)).fetchone() == (stat.st_size, stat.st_mtime):
+                return 0
+            # Rows keep their file order, so the last row of a pair becomes its latest
+            self._insert(conn, values, stat.st_mtime)
+            conn.execute("INSERT OR REPLACE INTO imports (path, size, mtime, rows) VALUES (?, ?, ?, ?)",
+                         (key, stat.st_size, stat.st_mtime, len(values)))
+        return len(values)
+
+# (store, csv, size, mtime) already imported by this process, so repeated
+# opens (several per dashboard rerun) skip the import entirely
+_imported = set()
+
+# Open the store, pulling in results.csv the first time it is seen
+def open_store(path=DEFAULT_DB, legacy_csv="results.csv"):
+    store = ResultsStore(path)
+    if legacy_csv and os.path.exists(legacy_csv):
+        stat = os.stat(legacy_csv)
+        key = (os.path.abspath(path), os.path.abspath(legacy_csv), stat.st_size, stat.st_mtime)
+        if key not in _imported:
+            store.import_csv(legacy_csv)
+            _imported.add(key)
+    return store
+
+# python results_store.py import results.csv [db] | latest [db]
+if __name__ == "__main__":
+    import sys
+    command = sys.argv[1] if len(sys.argv) > 1 else "latest"
+    if command == "import":
+        csv_path = sys.argv[2] if len(sys.argv) > 2 else "results.csv"
+        store = ResultsStore(sys.argv[3] if len(sys.argv) > 3 else DEFAULT_DB)
+        print(f"✅ Imported {store.import_csv(csv_path)} rows from {csv_path} into {store.path}")
+    else:
+        store = ResultsStore(sys.argv[2] if len(sys.argv) > 2 else DEFAULT_DB)
+        for row in store.latest():
+            print(row)
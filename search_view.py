@@ -0,0 +1,133 @@
+import io
+import itertools
+import numpy as np
+from matplotlib import colormaps
+from PIL import Image
+from a_star_pathfinding_multi import as_grid
+
+# Picture of one traced solver run: walls, the expansion order as a heatmap
+# (early = dark, late = bright) and the path, composed with array operations
+# into one RGB image. Maps whose longer side exceeds max_side are shrunk by a
+# whole factor: a pixel then covers a square block of cells, shaded by the
+# share of walls in it and colored by the earliest expansion inside it.
+# Smaller maps are blown up by a whole factor instead, up to max_side.
+# The heatmap and frames are kept per block rather than per cell, so 8k x 8k
+# maps cost little more than reading their visited_nodes list.
+
+DEFAULT_MAX_SIDE = 1024
+DEFAULT_FRAMES = 60
+FRAME_MS = 50
+HEAT_COLORMAP = "viridis"
+FREE_COLOR = (255, 255, 255)
+WALL_COLOR = (40, 40, 40)
+PATH_COLOR = (230, 30, 60)
+START_COLOR = (0, 200, 0)
+GOAL_COLOR = (255, 140, 0)
+
+# visited_nodes is a solver's list of (row, col) cells or an (n, 2) array of
+# them, as run_batch returns with trace=True
+class ExplorationView:
+    def __init__(self, grid, visited_nodes, path=None, start=None, goal=None, max_side=DEFAULT_MAX_SIDE):
+        grid = as_grid(grid)
+        rows, cols = grid.rows, grid.cols
+        self.scale = max(1, -(-max(rows, cols) // max_side))
+        self.zoom = max(1, max_side // max(rows, cols))
+        height, width = -(-rows // self.scale), -(-cols // self.scale)
+        self.shape = (height, width)
+
+        # Share of walls per block; cells past the map edge count as free
+        cells = grid.cells
+        if (rows, cols) != (height * self.scale, width * self.scale):
+            cells = np.zeros((height * self.scale, width * self.scale), dtype=np.uint8)
+            cells[:rows, :cols] = grid.cells
+        walls = (cells != 0).reshape(height, self.scale, width, self.scale).sum(axis=(1, 3), dtype=np.uint32)
+        share = (walls / self.scale ** 2)[..., None]
+        self.base = (np.array(FREE_COLOR) * (1 - share) + np.array(WALL_COLOR) * share).astype(np.uint8)
+
+        # Step at which each block was first expanded, -1 if never
+        self.expansions = len(visited_nodes) if visited_nodes is not None else 0
+        self.order = np.full(height * width, -1, dtype=np.int64)
+        if self.expansions:
+            if isinstance(visited_nodes, np.ndarray):
+                cells = visited_nodes.reshape(-1, 2).astype(np.int64, copy=False)
+            else:
+                cells = np.fromiter(itertools.chain.from_iterable(visited_nodes), dtype=np.int64,
+                                    count=2 * self.expansions).reshape(-1, 2)
+            blocks = self._blocks(cells)
+            first_blocks, first_steps = np.unique(blocks, return_index=True)
+            self.order[first_blocks] = first_steps
+        self.order = self.order.reshape(height, width)
+        lut = (colormaps[HEAT_COLORMAP](np.linspace(0, 1, 256))[:, :3] * 255).astype(np.uint8)
+        self.heat = lut[self.order * 255 // max(self.expansions - 1, 1)]
+
+        self.path = self._blocks(np.asarray(path)) if path else None
+        endpoints = [start if start is not None else (path[0] if path else None),
+                     goal if goal is not None else (path[-1] if path else None)]
+        self.endpoints = [self._blocks(np.asarray([pos]))[0] if pos is not None else None for pos in endpoints]
+
+    # Flat block ids of an (n, 2) array of cells
+    def _blocks(self, cells):
+        return (cells[:, 0] // self.scale) * self.shape[1] + cells[:, 1] // self.scale
+
+    # One pixel per block after the first `steps` expansions
+    def _compose(self, steps):
+        shown = (self.order >= 0) & (self.order < steps)
+        image = np.where(shown[..., None], self.heat, self.base).reshape(-1, 3)
+        if self.path is not None and steps >= self.expansions:
+            image[self.path] = PATH_COLOR
+        for block, color in zip(self.endpoints, (START_COLOR, GOAL_COLOR)):
+            if block is not None:
+                image[block] = color
+        return image.reshape(*self.shape, 3)
+
+    # The image after the first `steps` expansions (all of them by default);
+    # the path is drawn once the whole search is shown
+    def image(self, steps=None):
+        image = self._compose(self.expansions if steps is None else steps)
+        if self.zoom > 1:
+            image = image.repeat(self.zoom, axis=0).repeat(self.zoom, axis=1)
+        return image
+
+    def _steps(self, count):
+        return np.linspace(0, self.expansions, max(count, 2)).astype(np.int64)
+
+    # Replay of the search in `count` evenly spaced steps, ending on the path
+    def frames(self, count=DEFAULT_FRAMES):
+        return [self.image(step) for step in self._steps(count)]
+
+    def png(self):
+        output = io.BytesIO()
+        Image.fromarray(self.image()).save(output, format="PNG")
+        return output.getvalue()
+
+    # Animated GIF of frames(); the last frame is held for a second. Every
+    # frame is mapped onto one palette taken from the first (bare map) and
+    # last (every color in use) frames instead of being quantized on its own,
+    # and blown up only after that.
+    def gif(self, count=DEFAULT_FRAMES, frame_ms=FRAME_MS):
+        frames = [self._compose(step) for step in self._steps(count)]
+        palette = Image.fromarray(np.concatenate([frames[0], frames[-1]])).quantize(256, dither=Image.Dither.NONE)
+        size = (self.shape[1] * self.zoom, self.shape[0] * self.zoom)
+        frames = [Image.fromarray(frame).quantize(palette=palette, dither=Image.Dither.NONE).resize(size, Image.NEAREST)
+                  for frame in frames]
+        durations = [frame_ms] * (len(frames) - 1) + [1000]
+        output = io.BytesIO()
+        frames[0].save(output, format="GIF", save_all=True, append_images=frames[1:], duration=durations, loop=0)
+        return output.getvalue()
+
+# Trace one run and picture it: python search_view.py map.txt [algorithm] [out.png|out.gif]
+if __name__ == "__main__":
+    import sys
+    from a_star_pathfinding_multi import load_map, run_algorithm
+    map_file = sys.argv[1]
+    algorithm = sys.argv[2] if len(sys.argv) > 2 else "a_star"
+    output = sys.argv[3] if len(sys.argv) > 3 else f"{algorithm}_exploration.png"
+    grid = as_grid(map_file)
+    meta = load_map(map_file)[1]
+    start = meta["start"] or (0, 0)
+    goal = meta["goal"] or (grid.rows - 1, grid.cols - 1)
+    result = run_algorithm(grid, start, goal, algorithm, trace=True)
+    view = ExplorationView(grid, result.visited_nodes, result.path, start, goal)
+    with open(output, "wb") as f:
+        f.write(view.gif() if output.endswith(".gif") else view.png())
+    print(f"✅ {algorithm}: {result.expansions} expansions, 1 pixel = {view.scale}x{view.scale} cells, saved {output}")
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+from a_star_pathfinding_multi import Grid, run_algorithm
+from batch_runner import run_batch
+
+# Jobs solved in worker processes on the shared-memory copy of a map come
+# back tagged with their position and map, and with the same results as
+# solving them in this process
+
+def test_matches_run_algorithm():
+    rng = np.random.default_rng(0)
+    maps = {name: Grid((rng.random((24, 24)) < 0.3).astype(np.uint8)) for name in ("a", "b")}
+    jobs = []
+    for name, grid in maps.items():
+        for start, goal in rng.choice(np.argwhere(grid.cells == 0), (3, 2)).tolist():
+            jobs += [(name, tuple(start), tuple(goal), algorithm) for algorithm in ("a_star", "bfs")]
+    results = list(run_batch(jobs, maps=maps, workers=2, repeats=2))
+    assert sorted(result["job"] for result in results) == list(range(len(jobs)))
+    for result in results:
+        name, start, goal, algorithm = jobs[result["job"]]
+        expected = run_algorithm(maps[name], start, goal, algorithm)
+        assert result["map"] == name
+        assert result["path"] == expected.path
+        assert result["cost"] == pytest.approx(expected.cost)
+        assert len(result["times"]) == 2
@@ -0,0 +1,19 @@
+from benchmark_pathfinding import compare_to_baseline, save_results
+
+# A case regresses when its median is slower than the baseline past both the
+# relative tolerance and the absolute floor, or when its path cost changed
+
+def _record(map_name, median, cost=10.0, algorithm="a_star"):
+    return {"map": map_name, "algorithm": algorithm, "median": median, "cost": cost}
+
+def test_compare_to_baseline(tmp_path):
+    baseline = [_record("same", 0.1), _record("slower", 0.1), _record("noise", 0.0001), _record("cost", 0.1),
+                _record("lost", 0.1), _record("faster", 0.1)]
+    save_results(baseline, tmp_path / "baseline.json", {})
+    records = [_record("same", 0.105), _record("slower", 0.2), _record("noise", 0.0005), _record("cost", 0.1, 11.0),
+               _record("lost", 0.1, None), _record("faster", 0.05), _record("new", 9.0),
+               _record("same", 9.0, algorithm="bfs")]
+    regressions = compare_to_baseline(records, tmp_path / "baseline.json", tolerance=0.10, min_delta=0.001)
+    found = {record["map"]: (ratio, cost_changed) for record, _, ratio, cost_changed in regressions}
+    assert set(found) == {"slower", "cost", "lost"}
+    assert found["slower"] == (2.0, False) and found["cost"][1] and found["lost"][1]
@@ -0,0 +1,45 @@
+import time
+import numpy as np
+import pytest
+from a_star_pathfinding_multi import BUDGET_EXCEEDED, Grid, bfs, bidirectional_bfs, bidirectional_search, search
+
+# Bidirectional searches meet in the middle without giving up optimality:
+# A* and Dijkstra match search()'s costs, BFS matches BFS's move count
+
+def _random_grid(seed):
+    rng = np.random.default_rng(seed)
+    return Grid((rng.random((32, 32)) < 0.4).astype(np.uint8)), rng
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("algorithm", ["bi_a_star", "bi_dijkstra"])
+def test_costs_match_search(algorithm, seed):
+    grid, rng = _random_grid(seed)
+    for start, goal in rng.choice(np.argwhere(grid.cells == 0), (8, 2)).tolist():
+        expected = search(grid, tuple(start), tuple(goal), "dijkstra")
+        result = bidirectional_search(grid, tuple(start), tuple(goal), algorithm)
+        if expected.path is None:
+            assert result.path is None
+        else:
+            assert result.path[0] == tuple(start) and result.path[-1] == tuple(goal)
+            assert result.cost == pytest.approx(expected.cost)
+
+@pytest.mark.parametrize("seed", range(4))
+def test_bfs_matches_bfs(seed):
+    grid, rng = _random_grid(seed)
+    for start, goal in rng.choice(np.argwhere(grid.cells == 0), (8, 2)).tolist():
+        expected = bfs(grid, tuple(start), tuple(goal))
+        result = bidirectional_bfs(grid, tuple(start), tuple(goal))
+        assert (result.path is None) == (expected.path is None)
+        if result.path is not None:
+            assert len(result.path) == len(expected.path)
+
+def test_same_cell():
+    grid = Grid(np.zeros((4, 4), dtype=np.uint8))
+    for result in (bidirectional_search(grid, (3, 3), (3, 3)), bidirectional_bfs(grid, (3, 3), (3, 3))):
+        assert result.path == [(3, 3)] and result.cost == 0
+
+def test_budgets():
+    grid = Grid(np.zeros((64, 64), dtype=np.uint8))
+    for result in (bidirectional_search(grid, (0, 0), (63, 63), "bi_dijkstra", max_expansions=3),
+                   bidirectional_bfs(grid, (0, 0), (63, 63), deadline=time.perf_counter() - 1)):
+        assert result.status == BUDGET_EXCEEDED and result.expansions <= 3
@@ -0,0 +1,42 @@
+import json
+import numpy as np
+import pytest
+from a_star_pathfinding_multi import Grid, is_grid_bin, load_grid_bin, load_map
+from map_converter import convert_map
+
+# Binary maps load back the exact cells and endpoints they were saved with,
+# packed or not, as copy-on-write arrays that never write back to the file
+
+def _save_txt(cells, txt_path):
+    with open(txt_path, "w") as f:
+        f.write("\n".join(" ".join(map(str, row)) for row in cells.tolist()) + "\n")
+
+@pytest.mark.parametrize("packed", [False, True])
+def test_round_trip(tmp_path, packed):
+    cells = (np.random.default_rng(5).random((13, 21)) < 0.3).astype(np.uint8)  # 273 cells, not a byte multiple
+    txt_path = str(tmp_path / "map.txt")
+    _save_txt(cells, txt_path)
+    with open(tmp_path / "map.json", "w") as f:
+        json.dump({"start": [1, 2], "goal": [11, 19]}, f)
+    out_path = convert_map(txt_path, packed=packed)
+    assert out_path.endswith(".gmap") and is_grid_bin(out_path) and not is_grid_bin(txt_path)
+    loaded, meta = load_grid_bin(out_path)
+    assert np.array_equal(loaded, cells)
+    assert meta["start"] == (1, 2) and meta["goal"] == (11, 19)
+    assert np.array_equal(load_map(out_path)[0], load_map(txt_path)[0])
+
+def test_unset_endpoints(tmp_path):
+    _save_txt(np.zeros((3, 4), dtype=np.uint8), tmp_path / "map.txt")
+    _, meta = load_grid_bin(convert_map(str(tmp_path / "map.txt")))
+    assert meta["start"] is None and meta["goal"] is None
+
+def test_edits_never_reach_the_file(tmp_path):
+    _save_txt(np.zeros((4, 4), dtype=np.uint8), tmp_path / "map.txt")
+    out_path = convert_map(str(tmp_path / "map.txt"))
+    Grid(load_grid_bin(out_path)[0]).set_cell((2, 2), 1)
+    assert not load_grid_bin(out_path)[0].any()
+
+def test_rejects_other_files(tmp_path):
+    _save_txt(np.zeros((2, 2), dtype=np.uint8), tmp_path / "map.txt")
+    with pytest.raises(ValueError):
+        load_grid_bin(tmp_path / "map.txt")
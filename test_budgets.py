@@ -0,0 +1,49 @@
+import time
+import numpy as np
+import pytest
+from a_star_pathfinding_multi import (BUDGET_EXCEEDED, CANCELLED, FOUND, PROGRESS_EVERY, Grid, anytime_search,
+                                      run_algorithm, search)
+from map_generators import rooms_map
+
+# Expansion budgets, deadlines and progress callbacks stop a solver with the
+# matching status, and anytime search ends on A*'s optimal cost
+
+SOLVERS = ["a_star", "dijkstra", "greedy", "bfs", "dfs", "jps", "anytime"]
+
+@pytest.mark.parametrize("algorithm", SOLVERS)
+def test_expired_deadline_stops_before_expanding(algorithm):
+    grid = Grid(rooms_map(64))
+    result = run_algorithm(grid, (0, 0), (63, 63), algorithm, deadline=time.perf_counter() - 1)
+    assert result.status == BUDGET_EXCEEDED
+    assert result.expansions == 0
+
+@pytest.mark.parametrize("algorithm", SOLVERS)
+def test_expansion_budget(algorithm):
+    grid = Grid(rooms_map(64))
+    result = run_algorithm(grid, (0, 0), (63, 63), algorithm, max_expansions=3)
+    assert result.status == BUDGET_EXCEEDED
+    assert result.expansions <= 3 and result.path is None
+
+@pytest.mark.parametrize("algorithm", ["dijkstra", "bfs"])
+def test_progress_cancels(algorithm):
+    calls = []
+    def progress(expansions):
+        calls.append(expansions)
+        return True
+    grid = Grid(np.zeros((128, 128), dtype=np.uint8))
+    result = run_algorithm(grid, (0, 0), (127, 127), algorithm, progress=progress)
+    assert result.status == CANCELLED
+    assert calls == [PROGRESS_EVERY]
+
+@pytest.mark.parametrize("seed", range(4))
+def test_anytime_ends_optimal(seed):
+    rng = np.random.default_rng(seed)
+    grid = Grid((rng.random((32, 32)) < 0.3).astype(np.uint8))
+    improvements = []
+    for start, goal in rng.choice(np.argwhere(grid.cells == 0), (6, 2)).tolist():
+        expected = search(grid, tuple(start), tuple(goal), "a_star")
+        result = anytime_search(grid, tuple(start), tuple(goal), on_improve=improvements.append)
+        assert result.status == expected.status
+        if expected.status == FOUND:
+            assert result.cost == pytest.approx(expected.cost) and result.bound == 1.0
+            assert improvements[-1].cost == result.cost
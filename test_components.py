@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from a_star_pathfinding_multi import NO_PATH, Grid, search
+from components import WALL, ComponentIndex, label_components
+
+# Labels kept current through set_cell split and merge regions exactly like
+# labels built from scratch, and a search between components returns at once
+
+def _assert_same_partition(labels, expected):
+    labels, expected = labels.reshape(-1), expected.reshape(-1)
+    assert np.array_equal(labels == WALL, expected == WALL)
+    pairs = np.unique(np.stack([labels, expected]), axis=1)
+    assert pairs.shape[1] == len(np.unique(labels)) == len(np.unique(expected))
+
+@pytest.mark.parametrize("seed", range(4))
+def test_labels_follow_edits(seed):
+    rng = np.random.default_rng(seed)
+    grid = Grid((rng.random((24, 24)) < 0.4).astype(np.uint8))
+    grid.components = ComponentIndex.build(grid)
+    for pos in rng.integers(0, 24, (80, 2)).tolist():
+        grid.set_cell(pos, 1 - int(grid.cells[tuple(pos)]))
+        _assert_same_partition(grid.components.labels, label_components(grid))
+
+def test_split_and_merge():
+    grid = Grid(np.zeros((5, 9), dtype=np.uint8))
+    grid.components = ComponentIndex.build(grid)
+    for row in range(5):
+        grid.set_cell((row, 4), 1)
+    assert not grid.components.connected(grid.index((2, 0)), grid.index((2, 8)))
+    result = search(grid, (2, 0), (2, 8))
+    assert result.status == NO_PATH and result.expansions == 0
+    grid.set_cell((4, 4), 0)
+    assert grid.components.connected(grid.index((2, 0)), grid.index((2, 8)))
+    assert search(grid, (2, 0), (2, 8)).path is not None
+
+def test_saved_labels_are_tied_to_their_map(tmp_path):
+    grid = Grid((np.random.default_rng(1).random((16, 16)) < 0.4).astype(np.uint8))
+    ComponentIndex.build(grid).save(tmp_path / "map.cc.npz")
+    _assert_same_partition(ComponentIndex.load(tmp_path / "map.cc.npz", grid).labels, label_components(grid))
+    grid.set_cell((1, 1), 1 - int(grid.cells[1, 1]))
+    with pytest.raises(ValueError):
+        ComponentIndex.load(tmp_path / "map.cc.npz", grid)
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+from a_star_pathfinding_multi import (ALGORITHMS, CONNECT_4, CONNECT_8, CONNECT_8_NO_CUT, CORNER_CUTTING_ALGORITHMS,
+                                      Grid, distance_field, get_neighbors, jps, run_algorithm, search)
+from batch_runner import run_batch
+from components import ComponentIndex, label_components
+from hpa_star import AbstractGraph, hpa_search
+from landmarks import LandmarkHeuristic
+
+# 4-connected grids never move diagonally and 8-no-cut grids never pass a
+# wall corner diagonally. The neighbor masks encode the rule once and every
+# solver, index and preprocessing step follows them.
+
+MODES = [CONNECT_4, CONNECT_8_NO_CUT]
+SOLVERS = [algo for algo in ALGORITHMS if algo not in CORNER_CUTTING_ALGORITHMS]
+
+def _random_grid(seed, connectivity):
+    rng = np.random.default_rng(seed)
+    return Grid((rng.random((24, 24)) < 0.3).astype(np.uint8), connectivity=connectivity), rng
+
+def _queries(grid, rng, count=8):
+    ends = rng.choice(np.argwhere(grid.cells == 0), (count, 2)).tolist()
+    return [(tuple(start), tuple(goal)) for start, goal in ends]
+
+def _assert_legal(grid, path):
+    for (r1, c1), (r2, c2) in zip(path, path[1:]):
+        if r1 != r2 and c1 != c2:
+            assert grid.connectivity == CONNECT_8_NO_CUT
+            assert grid.cells[r1, c2] == 0 and grid.cells[r2, c1] == 0
+
+@pytest.mark.parametrize("connectivity", MODES)
+def test_masks_match_neighbor_scan_through_edits(connectivity):
+    grid, rng = _random_grid(0, connectivity)
+    for pos in rng.integers(0, 24, (30, 2)).tolist():
+        grid.set_cell(pos, 1 - int(grid.cells[tuple(pos)]))
+        assert grid.mask == Grid(grid.cells.copy(), connectivity=connectivity).mask
+    cells = grid.cells.tolist()
+    for pos in map(tuple, np.argwhere(grid.cells == 0).tolist()):
+        assert sorted(get_neighbors(grid, pos)) == sorted(get_neighbors(cells, pos, connectivity))
+
+@pytest.mark.parametrize("algorithm", SOLVERS)
+@pytest.mark.parametrize("connectivity", MODES)
+def test_solvers_follow_the_rule(connectivity, algorithm):
+    for seed in range(3):
+        grid, rng = _random_grid(seed, connectivity)
+        for start, goal in _queries(grid, rng):
+            result = run_algorithm(grid, start, goal, algorithm)
+            expected = search(grid, start, goal, "dijkstra")
+            assert (result.path is None) == (expected.path is None)
+            if result.path is not None:
+                _assert_legal(grid, result.path)
+                if algorithm not in ("greedy", "bfs", "dfs", "bi_bfs"):
+                    assert result.cost == pytest.approx(expected.cost)
+
+@pytest.mark.parametrize("connectivity", MODES)
+def test_preprocessing_follows_the_rule(connectivity):
+    grid, rng = _random_grid(1, connectivity)
+    graph = AbstractGraph.build(grid, cluster_size=8)
+    landmarks = LandmarkHeuristic.build(grid, count=4)
+    for start, goal in _queries(grid, rng):
+        expected = search(grid, start, goal, "dijkstra")
+        dist, _ = distance_field(grid, start)
+        hpa = hpa_search(grid, start, goal, graph)
+        alt = search(grid, start, goal, heuristic=landmarks)
+        if expected.path is None:
+            assert hpa.path is None and alt.path is None and np.isinf(dist[goal])
+        else:
+            _assert_legal(grid, hpa.path)
+            assert hpa.cost >= expected.cost - 1e-9
+            assert alt.cost == pytest.approx(expected.cost) and dist[goal] == pytest.approx(expected.cost)
+
+def test_components_do_not_cut_corners():
+    cells = np.array([[0, 1], [1, 0]], dtype=np.uint8)
+    for connectivity, connected in ((CONNECT_4, False), (CONNECT_8_NO_CUT, False), (CONNECT_8, True)):
+        grid = Grid(cells, connectivity=connectivity)
+        assert ComponentIndex.build(grid).connected(0, 3) == connected
+        labels = label_components(grid).reshape(-1)
+        assert (labels[0] == labels[3]) == connected
+
+def test_batch_workers_keep_the_mode():
+    grid, rng = _random_grid(2, CONNECT_4)
+    jobs = [("4", start, goal, "a_star") for start, goal in _queries(grid, rng, 4)]
+    for result in run_batch(jobs, maps={"4": grid}, workers=2):
+        _, start, goal, _ = jobs[result["job"]]
+        assert result["path"] == search(grid, start, goal).path
+
+def test_jps_refuses_other_modes():
+    for connectivity in MODES:
+        with pytest.raises(ValueError):
+            jps(Grid(np.zeros((4, 4), dtype=np.uint8), connectivity=connectivity), (0, 0), (3, 3))
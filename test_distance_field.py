@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from a_star_pathfinding_multi import Grid, bfs, distance_field, field_path, path_cost, search
+
+# One-to-all fields agree with single searches from the same source: octile
+# fields with Dijkstra's costs, unit fields with BFS's move counts, and
+# field_path reads back a path of the field's cost
+
+def _random_grid(seed, size=32):
+    rng = np.random.default_rng(seed)
+    return Grid((rng.random((size, size)) < 0.4).astype(np.uint8)), rng
+
+@pytest.mark.parametrize("seed", range(4))
+def test_octile_field_matches_dijkstra(seed):
+    grid, rng = _random_grid(seed)
+    source, *targets = map(tuple, rng.choice(np.argwhere(grid.cells == 0), 12).tolist())
+    dist, pred = distance_field(grid, source)
+    for target in targets:
+        expected = search(grid, source, target, "dijkstra")
+        if expected.path is None:
+            assert np.isinf(dist[target]) and field_path(dist, pred, target) is None
+        else:
+            path = field_path(dist, pred, target)
+            assert dist[target] == pytest.approx(expected.cost)
+            assert path[0] == source and path[-1] == target
+            assert path_cost(path) == pytest.approx(expected.cost)
+
+@pytest.mark.parametrize("seed", range(4))
+def test_unit_field_matches_bfs(seed):
+    grid, rng = _random_grid(seed)
+    source, *targets = map(tuple, rng.choice(np.argwhere(grid.cells == 0), 12).tolist())
+    dist, pred = distance_field(grid, source, metric="unit")
+    for target in targets:
+        expected = bfs(grid, source, target)
+        if expected.path is None:
+            assert np.isinf(dist[target])
+        else:
+            assert dist[target] == len(expected.path) - 1
+            assert len(field_path(dist, pred, target)) == len(expected.path)
+
+# A winding one-cell corridor keeps the frontier small for many passes, which
+# hands the rest of the fill to the scalar finish
+def test_maze_like_corridor():
+    cells = np.ones((41, 41), dtype=np.uint8)
+    cells[1::2, 1:-1] = 0
+    cells[2::4, -2] = 0
+    cells[4::4, 1] = 0
+    grid = Grid(cells)
+    dist, _ = distance_field(grid, (1, 1))
+    assert dist[39, 1] == pytest.approx(search(grid, (1, 1), (39, 1), "dijkstra").cost)
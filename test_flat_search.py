@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+from a_star_pathfinding_multi import Grid, flat_search, search
+
+# flat_search pushes and pops in search()'s order, so on any map it returns
+# the same path, cost and expansion count
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("algorithm", ["a_star", "dijkstra", "greedy"])
+def test_matches_search(algorithm, seed):
+    rng = np.random.default_rng(seed)
+    grid = Grid((rng.random((24, 24)) < 0.4).astype(np.uint8))
+    free = np.argwhere(grid.cells == 0)
+    for start, goal in rng.choice(free, (8, 2)):
+        start, goal = tuple(start.tolist()), tuple(goal.tolist())
+        expected = search(grid, start, goal, algorithm)
+        result = flat_search(grid, start, goal, algorithm)
+        assert result.path == expected.path
+        assert result.cost == pytest.approx(expected.cost)
+        assert result.expansions == expected.expansions
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+from a_star_pathfinding_multi import Grid, get_neighbors
+
+# The precomputed neighbor masks allow exactly the moves of the list-of-lists
+# neighbor scan, and set_cell keeps them equal to a fresh build
+
+def _random_grid(seed):
+    rng = np.random.default_rng(seed)
+    return Grid((rng.random((24, 24)) < 0.3).astype(np.uint8)), rng
+
+@pytest.mark.parametrize("seed", range(3))
+def test_mask_matches_neighbor_scan(seed):
+    grid, _ = _random_grid(seed)
+    cells = grid.cells.tolist()
+    for pos in map(tuple, np.argwhere(grid.cells == 0).tolist()):
+        assert sorted(get_neighbors(grid, pos)) == sorted(get_neighbors(cells, pos))
+
+@pytest.mark.parametrize("seed", range(3))
+def test_set_cell_keeps_mask_current(seed):
+    grid, rng = _random_grid(seed)
+    for pos in rng.integers(0, 24, (40, 2)).tolist():
+        grid.set_cell(pos, 1 - int(grid.cells[tuple(pos)]))
+        assert grid.mask == Grid(grid.cells.copy()).mask
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+from a_star_pathfinding_multi import Grid, get_neighbors, path_cost, search
+from hpa_star import AbstractGraph, hpa_search
+
+# HPA* is complete but only near-optimal: it finds a path exactly when
+# search() does, and that path is legal and never cheaper than search()'s
+
+def _random_grid(seed):
+    rng = np.random.default_rng(seed)
+    return Grid((rng.random((40, 40)) < 0.35).astype(np.uint8)), rng
+
+def test_paths_are_valid():
+    for seed in range(4):
+        grid, rng = _random_grid(seed)
+        graph = AbstractGraph.build(grid, cluster_size=8)
+        for start, goal in rng.choice(np.argwhere(grid.cells == 0), (10, 2)):
+            start, goal = tuple(start.tolist()), tuple(goal.tolist())
+            expected = search(grid, start, goal, "dijkstra")
+            result = hpa_search(grid, start, goal, graph)
+            assert (result.path is None) == (expected.path is None)
+            if result.path is None:
+                continue
+            assert result.path[0] == start and result.path[-1] == goal
+            for a, b in zip(result.path, result.path[1:]):
+                assert b in [pos for pos, _ in get_neighbors(grid, a)]
+            assert path_cost(result.path) == pytest.approx(result.cost)
+            assert result.cost >= expected.cost - 1e-9
+
+def test_saved_graph_answers_the_same(tmp_path):
+    grid, _ = _random_grid(0)
+    graph = AbstractGraph.build(grid, cluster_size=8)
+    graph.save(tmp_path / "map.hpa.npz")
+    loaded = AbstractGraph.load(tmp_path / "map.hpa.npz", grid)
+    free = np.argwhere(grid.cells == 0)
+    start, goal = tuple(free[0].tolist()), tuple(free[-1].tolist())
+    assert hpa_search(grid, start, goal, loaded).path == hpa_search(grid, start, goal, graph).path
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from a_star_pathfinding_multi import Grid, path_cost, search
+from incremental_planner import IncrementalPlanner
+
+# After each batch of wall edits, and as the start moves, the repaired D* Lite
+# plan costs the same as a fresh search() on the edited grid
+
+def _assert_plan(grid, planner, start, goal):
+    path, _ = planner.plan(start)
+    expected = search(grid, start, goal, "dijkstra")
+    if expected.path is None:
+        assert path is None
+    else:
+        assert path[0] == start and path[-1] == goal
+        assert path_cost(path) == pytest.approx(expected.cost)
+
+@pytest.mark.parametrize("seed", range(4))
+def test_repair_after_wall_edits(seed):
+    rng = np.random.default_rng(seed)
+    cells = (rng.random((24, 24)) < 0.3).astype(np.uint8)
+    start, goal = (0, 0), (23, 23)
+    cells[start] = cells[goal] = 0
+    grid = Grid(cells)
+    planner = IncrementalPlanner(grid, goal)
+    _assert_plan(grid, planner, start, goal)
+    for _ in range(6):
+        changes = [(pos, 1 - int(grid.cells[pos])) for pos in map(tuple, rng.integers(0, 24, (6, 2)).tolist())
+                   if pos not in (start, goal)]
+        planner.update_cells(changes)
+        _assert_plan(grid, planner, start, goal)
+
+def test_moving_start():
+    rng = np.random.default_rng(5)
+    grid = Grid((rng.random((24, 24)) < 0.3).astype(np.uint8))
+    free = [tuple(pos) for pos in np.argwhere(grid.cells == 0).tolist()]
+    goal = free[-1]
+    planner = IncrementalPlanner(grid, goal)
+    for i in rng.choice(len(free), 8):
+        _assert_plan(grid, planner, free[i], goal)
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+from a_star_pathfinding_multi import Grid, get_neighbors, jps, search
+
+# Jump point search returns paths as cheap as A*'s, with the skipped cells
+# between jump points filled back in
+
+@pytest.mark.parametrize("seed", range(6))
+def test_costs_match_a_star(seed):
+    rng = np.random.default_rng(seed)
+    grid = Grid((rng.random((32, 32)) < 0.35).astype(np.uint8))
+    free = np.argwhere(grid.cells == 0)
+    for start, goal in rng.choice(free, (8, 2)):
+        start, goal = tuple(start.tolist()), tuple(goal.tolist())
+        expected = search(grid, start, goal, "a_star")
+        result = jps(grid, start, goal)
+        if expected.path is None:
+            assert result.path is None
+            continue
+        assert result.cost == pytest.approx(expected.cost)
+        assert result.path[0] == start and result.path[-1] == goal
+        for a, b in zip(result.path, result.path[1:]):
+            assert b in [pos for pos, _ in get_neighbors(grid, a)]
+
+def test_open_map_takes_few_expansions():
+    grid = Grid(np.zeros((64, 64), dtype=np.uint8))
+    result = jps(grid, (0, 0), (63, 40))
+    assert result.cost == pytest.approx(search(grid, (0, 0), (63, 40)).cost)
+    assert result.expansions < 10
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from a_star_pathfinding_multi import Grid, distance_field, flat_search, path_cost, search
+from landmarks import LandmarkHeuristic
+
+# The ALT heuristic never overestimates, so A* with it finds paths exactly as
+# cheap as plain A*, and saved tables only load for their own map
+
+def _random_grid(seed):
+    rng = np.random.default_rng(seed)
+    return Grid((rng.random((32, 32)) < 0.35).astype(np.uint8)), rng
+
+@pytest.mark.parametrize("seed", range(4))
+def test_costs_match_a_star(seed):
+    grid, rng = _random_grid(seed)
+    heuristic = LandmarkHeuristic.build(grid, count=4)
+    for start, goal in rng.choice(np.argwhere(grid.cells == 0), (8, 2)).tolist():
+        expected = search(grid, tuple(start), tuple(goal), "a_star")
+        result = search(grid, tuple(start), tuple(goal), "a_star", heuristic=heuristic)
+        if expected.path is None:
+            assert result.path is None
+        else:
+            assert result.cost == pytest.approx(expected.cost)
+
+def test_never_overestimates():
+    grid, rng = _random_grid(0)
+    heuristic = LandmarkHeuristic.build(grid, count=4)
+    free = [tuple(pos) for pos in np.argwhere(grid.cells == 0).tolist()]
+    for i in rng.choice(len(free), 3):
+        dist, _ = distance_field(grid, free[i])
+        for pos in free:
+            if np.isfinite(dist[pos]):
+                assert heuristic(pos, free[i]) <= dist[pos] + 1e-9
+
+def test_saved_tables_are_tied_to_their_map(tmp_path):
+    grid, _ = _random_grid(0)
+    LandmarkHeuristic.build(grid, count=4).save(tmp_path / "map.alt.npz")
+    loaded = LandmarkHeuristic.load(tmp_path / "map.alt.npz", grid)
+    assert loaded.landmarks == LandmarkHeuristic.build(grid, count=4).landmarks
+    grid.set_cell((0, 0), 1 - int(grid.cells[0, 0]))
+    with pytest.raises(ValueError):
+        LandmarkHeuristic.load(tmp_path / "map.alt.npz", grid)
+
+# Admissible but inconsistent: a random share of the true distance per cell.
+# A* has to reopen cells it closed too early to stay optimal.
+@pytest.mark.parametrize("seed", range(4))
+def test_inconsistent_heuristics_stay_optimal(seed):
+    grid, rng = _random_grid(seed)
+    for start, goal in rng.choice(np.argwhere(grid.cells == 0), (8, 2)).tolist():
+        start, goal = tuple(start), tuple(goal)
+        dist, _ = distance_field(grid, goal)
+        share = rng.random(dist.shape)
+
+        def heuristic(pos, goal):
+            return share[pos] * dist[pos]
+
+        expected = search(grid, start, goal, "dijkstra")
+        result = search(grid, start, goal, heuristic=heuristic)
+        flat = flat_search(grid, start, goal, heuristic=heuristic)
+        if expected.path is None:
+            assert result.path is None and flat.path is None
+        else:
+            assert result.cost == flat.cost == pytest.approx(expected.cost)
+            assert path_cost(flat.path, grid) == pytest.approx(expected.cost)
+            assert flat.expansions == result.expansions
+
+def test_picking_stops_at_min_spread():
+    grid = Grid(np.zeros((16, 16), dtype=np.uint8))
+    assert sorted(LandmarkHeuristic.build(grid, count=8, min_spread=1).landmarks) == [0, 255]
+    assert len(LandmarkHeuristic.build(grid, count=8, min_spread=0).landmarks) == 8
+
+def test_goal_table_matches_lookups():
+    grid, rng = _random_grid(1)
+    heuristic = LandmarkHeuristic.build(grid, count=4)
+    goal = tuple(np.argwhere(grid.cells == 0)[0])
+    table = heuristic.goal_table(goal)
+    for pos in map(tuple, rng.integers(0, 32, (50, 2)).tolist()):
+        assert heuristic(pos, list(goal)) == table[grid.index(pos)]
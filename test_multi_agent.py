@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from a_star_pathfinding_multi import CONNECT_8, CONNECTIVITIES, FOUND, Grid, get_neighbors, path_cost, search
+from map_generators import generate_map
+from multi_agent import MAPF_METHODS, WAIT_COST, _first_conflict, plan_agents, random_agents
+
+# Multi-agent plans are collision-free and made of legal moves and waits that
+# add up to the reported costs; CBS is never worse than prioritized planning,
+# and a lone agent pays exactly what search() does
+
+AGENTS = 6
+MAZE_AGENTS = 10
+TIME_LIMIT = 30
+# One-cell maze corridors make CBS branch on nearly every meeting, so mazes
+# only get prioritized plans
+CBS_KINDS = ["open", "random", "rooms"]
+
+def _make_grid(kind, terrain, connectivity, seed):
+    cells = generate_map(kind, 24, seed)
+    costs = np.random.default_rng(seed).integers(1, 6, cells.shape).astype(np.uint8) if terrain else None
+    return Grid(cells, costs, connectivity)
+
+def _check_plan(grid, agents, result):
+    assert result.status == FOUND
+    assert _first_conflict(result.paths) is None
+    for (start, goal), path, cost in zip(agents, result.paths, result.costs):
+        assert path[0] == start and path[-1] == goal
+        for a, b in zip(path, path[1:]):
+            assert a == b or b in [pos for pos, _ in get_neighbors(grid, a)]
+        steps = [WAIT_COST if a == b else path_cost([a, b], grid) for a, b in zip(path, path[1:])]
+        assert sum(steps) == pytest.approx(cost)
+
+@pytest.mark.parametrize("connectivity", CONNECTIVITIES)
+@pytest.mark.parametrize("terrain", [False, True])
+@pytest.mark.parametrize("kind", CBS_KINDS)
+def test_plans_are_valid(kind, terrain, connectivity):
+    grid = _make_grid(kind, terrain, connectivity, seed=CBS_KINDS.index(kind))
+    agents = random_agents(grid, AGENTS, seed=1)
+    results = {method: plan_agents(grid, agents, method, TIME_LIMIT) for method in MAPF_METHODS}
+    for result in results.values():
+        _check_plan(grid, agents, result)
+    assert results["cbs"].cost <= results["prioritized"].cost + 1e-9
+
+@pytest.mark.parametrize("terrain", [False, True])
+def test_prioritized_in_a_maze(terrain):
+    grid = _make_grid("maze", terrain, CONNECT_8, seed=2)
+    agents = random_agents(grid, MAZE_AGENTS, seed=1)
+    _check_plan(grid, agents, plan_agents(grid, agents, "prioritized", TIME_LIMIT))
+
+@pytest.mark.parametrize("method", MAPF_METHODS)
+def test_single_agent_matches_search(method):
+    grid = _make_grid("random", True, CONNECT_8, seed=3)
+    rng = np.random.default_rng(3)
+    for start, goal in rng.choice(np.argwhere(grid.cells == 0), (6, 2)).tolist():
+        start, goal = tuple(start), tuple(goal)
+        expected = search(grid, start, goal, "dijkstra")
+        if expected.path is not None:
+            assert plan_agents(grid, [(start, goal)], method).cost == pytest.approx(expected.cost)
+
+# Two agents swapping ends of a corridor with one side pocket: one has to
+# step aside, which is a conflict CBS must resolve
+def test_swap_through_a_corridor():
+    cells = np.ones((3, 5), dtype=np.uint8)
+    cells[1, :] = 0
+    cells[0, 2] = 0
+    grid = Grid(cells)
+    agents = [((1, 0), (1, 4)), ((1, 4), (1, 0))]
+    result = plan_agents(grid, agents, "cbs", TIME_LIMIT)
+    _check_plan(grid, agents, result)
+    assert result.nodes > 1
+
+# Trees past the byte budget are dropped and grown again, which changes
+# nothing about the plans
+@pytest.mark.parametrize("method", MAPF_METHODS)
+def test_tree_budget_keeps_plans(method):
+    grid = _make_grid("rooms", True, CONNECT_8, seed=2)
+    agents = random_agents(grid, AGENTS, seed=1)
+    expected = plan_agents(grid, agents, method, TIME_LIMIT)
+    result = plan_agents(grid, agents, method, TIME_LIMIT, max_tree_bytes=1)
+    _check_plan(grid, agents, result)
+    assert result.paths == expected.paths
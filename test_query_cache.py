@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from a_star_pathfinding_multi import Grid, search
+from query_cache import QueryCache, ReverseTree
+
+# Cached reverse trees answer like a fresh search() from the start, for many
+# starts per goal, across grid edits and after evictions
+
+def _terrain_grid(seed):
+    rng = np.random.default_rng(seed)
+    cells = (rng.random((24, 24)) < 0.3).astype(np.uint8)
+    return Grid(cells, rng.integers(1, 6, cells.shape).astype(np.uint8)), rng
+
+def _assert_answer(grid, cache, start, goal):
+    expected = search(grid, start, goal, "dijkstra")
+    result = cache.search(start, goal)
+    if expected.path is None:
+        assert result.path is None
+    else:
+        assert result.path[0] == start and result.path[-1] == goal
+        assert result.cost == pytest.approx(expected.cost)
+
+@pytest.mark.parametrize("seed", range(3))
+def test_answers_follow_edits(seed):
+    grid, rng = _terrain_grid(seed)
+    cache = QueryCache(grid)
+    free = [tuple(pos) for pos in np.argwhere(grid.cells == 0).tolist()]
+    goals = [free[i] for i in rng.choice(len(free), 3)]
+    for _ in range(4):
+        for i in rng.choice(len(free), 6):
+            for goal in goals:
+                _assert_answer(grid, cache, free[i], goal)
+        for pos in map(tuple, rng.integers(0, 24, (5, 2)).tolist()):
+            if pos in goals:
+                continue
+            if rng.random() < 0.5:
+                grid.set_cell(pos, 1 - int(grid.cells[pos]))
+            else:
+                grid.set_cost(pos, int(rng.integers(1, 6)))
+
+def test_repeat_queries_hit():
+    cache = QueryCache(Grid(np.zeros((24, 24), dtype=np.uint8)))
+    cache.search((0, 0), (23, 23))
+    assert cache.search((0, 0), (23, 23)).expansions == 0
+    assert cache.search((5, 5), (23, 23)).expansions == 0  # settled on the way to (0, 0)
+    assert cache.hits == 2 and cache.misses == 1
+
+def test_edits_only_drop_trees_that_reached_them():
+    grid = Grid(np.zeros((24, 24), dtype=np.uint8))
+    cache = QueryCache(grid)
+    cache.search((0, 1), (0, 0))
+    cache.search((23, 22), (23, 23))
+    grid.set_cell((1, 1), 1)
+    assert list(cache.trees) == [grid.index((23, 23))]
+    assert cache.invalidations == 1
+
+def test_evictions_keep_answers():
+    grid, rng = _terrain_grid(0)
+    cache = QueryCache(grid, max_bytes=1)
+    free = [tuple(pos) for pos in np.argwhere(grid.cells == 0).tolist()]
+    for start, goal in rng.choice(len(free), (10, 2)):
+        _assert_answer(grid, cache, free[start], free[goal])
+    assert len(cache.trees) == 1
+
+def test_guided_tree_distances_are_exact():
+    grid, rng = _terrain_grid(1)
+    free = [tuple(pos) for pos in np.argwhere(grid.cells == 0).tolist()]
+    for start, goal in rng.choice(len(free), (8, 2)):
+        start, goal = free[start], free[goal]
+        tree = ReverseTree(grid, grid.index(goal), guide=grid.index(start))
+        expected = search(grid, start, goal, "dijkstra")
+        if expected.path is None:
+            assert tree.distance(grid.index(start)) == np.inf
+        else:
+            assert tree.distance(grid.index(start)) == pytest.approx(expected.cost)
+
+def test_trees_only_store_reached_cells():
+    grid = Grid(np.zeros((512, 512), dtype=np.uint8))
+    tree = ReverseTree(grid, 0, guide=grid.index((3, 3)))
+    assert tree.distance(grid.index((3, 3))) == pytest.approx(3 * 2 ** 0.5)
+    assert len(tree.g_costs) < 100 and tree.nbytes() < 64 << 10
@@ -0,0 +1,34 @@
+import os
+import numpy as np
+import pytest
+from reports import CHARTS, METRICS, load_results, write_report
+from results_store import ResultsStore
+
+# The latest runs pivot into a [map, metric, algorithm] array, NaN where an
+# algorithm never ran on a map, and every chart renders across the pool
+
+@pytest.fixture
+def db_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # keep open_store away from any results.csv
+    store = ResultsStore(tmp_path / "results.db")
+    store.add_runs([("a.txt", "dijkstra", 0.2, 30, 6, 7.5, "Yes"), ("a.txt", "a_star", 0.1, 10, 6, 7.5, "Yes"),
+                    ("b.txt", "custom", 0.1, 4, 0, "-", "No"), ("b.txt", "a_star", 0.1, 12, 5, 6.0, "Yes")], run_at=1)
+    store.add_runs([("a.txt", "a_star", 0.1, 9, 6, 7.5, "Yes")], run_at=2)
+    return store.path
+
+def test_load_results_pivot(db_file):
+    map_names, algorithms, values = load_results(db_file)
+    assert map_names == ["a.txt", "b.txt"]
+    assert algorithms == ["a_star", "dijkstra", "custom"]  # known order first, then by name
+    assert values.shape == (2, len(METRICS), 3)
+    assert values[0, :, 0].tolist() == [9, 6, 7.5]  # the newest a_star run on a.txt
+    assert np.isnan(values[1, :, 1]).all() and np.isnan(values[0, :, 2]).all()
+    assert values[1, METRICS.index("Cost"), 2] == 0  # no path counts as cost 0
+
+def test_workers_render_every_chart(db_file, tmp_path):
+    serial = write_report(db_file, CHARTS, tmp_path / "serial", workers=1)
+    parallel = write_report(db_file, CHARTS, tmp_path / "parallel", workers=2)
+    # 2 maps x (3 bars, radar, stacked) + 2 cross-map charts x 3 metrics
+    assert len(serial) == len(parallel) == 16
+    assert sorted(map(os.path.basename, serial)) == sorted(map(os.path.basename, parallel))
+    assert all(os.path.getsize(path) > 0 for path in parallel)
@@ -0,0 +1,46 @@
+import os
+import numpy as np
+import result_cache
+from a_star_pathfinding_multi import Grid
+from result_cache import ResultCache, result_key
+
+# Entries are keyed by map contents, endpoints, algorithm and solver version;
+# past max_bytes the least recently used entries go first
+
+def _result(cost):
+    return {"algorithm": "a_star", "start": (0, 0), "goal": (1, 1), "path": [(0, 0), (1, 1)], "cost": cost,
+            "job": 3, "map": "m", "visited": [(0, 0)]}
+
+def test_round_trip_drops_per_run_fields(tmp_path):
+    cache = ResultCache(tmp_path)
+    cache.put("k", _result(1.5))
+    entry = cache.get("k")
+    assert entry["path"] == [(0, 0), (1, 1)] and entry["goal"] == (1, 1) and entry["cost"] == 1.5
+    assert "job" not in entry and "map" not in entry and "visited" not in entry
+    assert cache.get("missing") is None
+
+def test_keys_follow_map_contents_not_names():
+    cells = np.zeros((4, 4), dtype=np.uint8)
+    key = result_key(Grid(cells).fingerprint(), (0, 0), (3, 3), "a_star")
+    assert key == result_key(Grid(cells.copy()).fingerprint(), [0, 0], [3, 3], "a_star")
+    cells[1, 1] = 1
+    assert key != result_key(Grid(cells).fingerprint(), (0, 0), (3, 3), "a_star")
+    assert key != result_key(Grid(np.zeros((4, 4), dtype=np.uint8)).fingerprint(), (0, 0), (3, 3), "dijkstra")
+
+def test_solver_version_invalidates(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path)
+    cache.put(result_key("map", (0, 0), (1, 1), "a_star"), _result(1.5))
+    monkeypatch.setattr(result_cache, "SOLVER_VERSION", result_cache.SOLVER_VERSION + 1)
+    assert cache.get(result_key("map", (0, 0), (1, 1), "a_star")) is None
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(tmp_path)
+    for age, key in enumerate(["a", "b", "c"]):
+        cache.put(key, _result(1.5))
+        os.utime(cache._path(key), (age, age))
+    entry_bytes = os.path.getsize(cache._path("a"))
+    assert cache.get("a") is not None  # now the most recently used
+    cache.max_bytes = 3 * entry_bytes
+    cache.put("d", _result(1.5))
+    assert cache.get("b") is None
+    assert all(cache.get(key) is not None for key in ("a", "c", "d")) and len(cache) == 3
@@ -0,0 +1,47 @@
+import csv
+import pytest
+import results_store
+from results_store import HEADERS, ResultsStore, open_store
+
+# `latest` holds the newest run of every map/algorithm pair, and an old
+# results.csv is imported once: again only if the file changes
+
+def _write_csv(path, rows):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADERS)
+        writer.writerows(rows)
+
+def test_latest_keeps_the_newest_run(tmp_path):
+    store = ResultsStore(tmp_path / "results.db")
+    store.add_runs([("m", "a_star", 0.5, 10, 5, 4.0, "Yes"), ("m", "bfs", 0.1, 20, 5, "-", "No")], run_at=1)
+    store.add_runs([("m", "a_star", 0.25, 8, 5, 4.0, "Yes")], run_at=2)
+    latest = {row["Algorithm"]: row for row in store.latest("m")}
+    assert latest["a_star"]["Time(s)"] == 0.25 and latest["a_star"]["Nodes Expanded"] == 8
+    assert latest["bfs"]["Total Cost"] is None and latest["bfs"]["Found"] == "No"
+    assert len(store.runs("m")) == 3 and store.known_pairs() == {("m", "a_star"), ("m", "bfs")}
+
+def test_csv_imports_once(tmp_path):
+    csv_path = tmp_path / "results.csv"
+    _write_csv(csv_path, [("m", "a_star", 0.5, 10, 5, 4.0, "Yes"), ("m", "a_star", 0.25, 8, 5, 4.0, "Yes")])
+    store = ResultsStore(tmp_path / "results.db")
+    assert store.import_csv(csv_path) == 2
+    assert store.latest()[0]["Nodes Expanded"] == 8  # the last row of a pair wins
+    assert store.import_csv(csv_path) == 0 and len(store.runs()) == 2
+    _write_csv(csv_path, [("m", "bfs", 0.1, 20, 5, "-", "No")])
+    assert store.import_csv(csv_path) == 1 and len(store.runs()) == 3
+
+def test_open_store_skips_known_files_without_reading_them(tmp_path, monkeypatch):
+    csv_path = tmp_path / "results.csv"
+    _write_csv(csv_path, [("m", "a_star", 0.5, 10, 5, 4.0, "Yes")])
+    monkeypatch.setattr(results_store, "_imported", set())
+    open_store(tmp_path / "results.db", csv_path)
+    imports = []
+    monkeypatch.setattr(ResultsStore, "import_csv", lambda self, path: imports.append(path))
+    for _ in range(3):
+        assert len(open_store(tmp_path / "results.db", csv_path).runs()) == 1
+    assert imports == []
+    # A new process checks the imports table before parsing any rows
+    monkeypatch.undo()
+    monkeypatch.setattr(results_store, "_row_values", pytest.fail)
+    assert ResultsStore(tmp_path / "results.db").import_csv(csv_path) == 0
@@ -0,0 +1,56 @@
+import io
+import numpy as np
+from PIL import Image
+from a_star_pathfinding_multi import Grid, search
+from search_view import GOAL_COLOR, PATH_COLOR, START_COLOR, WALL_COLOR, ExplorationView
+
+# The heatmap keeps each block's first expansion step, and replays run from
+# the bare map to the finished search with its path
+
+def test_heatmap_orders_blocks_by_first_expansion():
+    cells = np.zeros((8, 8), dtype=np.uint8)
+    cells[6:, 6:] = 1
+    visited = [(0, 0), (0, 1), (1, 1), (2, 3), (4, 4), (0, 2)]
+    view = ExplorationView(Grid(cells), visited, max_side=4)
+    assert view.scale == 2 and view.shape == (4, 4)
+    assert view.order[0, 0] == 0 and view.order[1, 1] == 3 and view.order[2, 2] == 4 and view.order[0, 1] == 5
+    assert (view.order >= 0).sum() == 4
+    assert tuple(view.base[3, 3]) == WALL_COLOR
+    assert (view.heat[0, 0] != view.heat[0, 1]).any()  # first and last steps sit at opposite colormap ends
+
+def test_small_maps_are_blown_up_with_the_path_on_top():
+    grid = Grid(np.zeros((10, 10), dtype=np.uint8))
+    result = search(grid, (0, 0), (9, 9), trace=True)
+    view = ExplorationView(grid, result.visited_nodes, result.path, max_side=100)
+    image = view.image()
+    assert view.zoom == 10 and image.shape == (100, 100, 3)
+    assert tuple(image[0, 0]) == START_COLOR and tuple(image[-1, -1]) == GOAL_COLOR
+    assert tuple(image[55, 55]) == PATH_COLOR
+    assert tuple(view.image(0)[55, 55]) != PATH_COLOR
+
+def test_frames_run_from_the_bare_map_to_the_path():
+    grid = Grid(np.zeros((16, 16), dtype=np.uint8))
+    result = search(grid, (0, 0), (15, 9), "dijkstra", trace=True)
+    view = ExplorationView(grid, result.visited_nodes, result.path, max_side=32)
+    frames = view.frames(7)
+    assert len(frames) == 7
+    assert np.array_equal(frames[0], view.image(0)) and np.array_equal(frames[-1], view.image())
+    assert len(view.frames(1)) == 2  # a replay always shows at least the start and the end
+
+def test_gif_frames_and_size():
+    grid = Grid(np.zeros((12, 20), dtype=np.uint8))
+    result = search(grid, (0, 0), (11, 19), trace=True)
+    view = ExplorationView(grid, result.visited_nodes, result.path, max_side=40)
+    gif = Image.open(io.BytesIO(view.gif(count=5)))
+    assert gif.n_frames == 5 and gif.size == (40, 24)
+    gif.seek(gif.n_frames - 1)
+    assert gif.info["duration"] == 1000
+    last, expected = np.asarray(gif.convert("RGB")).astype(int), view.image().astype(int)
+    # Quantizing may merge close heat colors; the drawn colors stay exact
+    assert np.abs(last - expected).max() < 16
+    assert tuple(last[0, 0]) == START_COLOR and tuple(last[-1, -1]) == GOAL_COLOR
+
+def test_no_expansions():
+    view = ExplorationView(Grid(np.zeros((4, 4), dtype=np.uint8)), [], start=(0, 0))
+    assert view.expansions == 0 and (view.order == -1).all()
+    assert len(view.frames(3)) == 3
@@ -0,0 +1,126 @@
+import time
+import numpy as np
+import pytest
+from a_star_pathfinding_multi import (BUDGET_EXCEEDED, Grid, bucket_dijkstra, distance_field, field_path, flat_search,
+                                      jps, load_grid_bin, path_cost, run_algorithm, save_grid_bin, search)
+from batch_runner import run_batch
+from hpa_star import AbstractGraph
+from incremental_planner import IncrementalPlanner
+from landmarks import LandmarkHeuristic
+
+# Terrain costs: every move pays its length times the cost of the cell it
+# enters. Every solver that takes terrain matches search()'s Dijkstra on it,
+# and the ones built for uniform costs refuse it.
+
+TERRAIN_SOLVERS = ["a_star", "bucket_dijkstra", "bi_a_star", "bi_dijkstra", "anytime"]
+
+def _terrain_grid(seed, fractional=False):
+    rng = np.random.default_rng(seed)
+    cells = (rng.random((24, 24)) < 0.3).astype(np.uint8)
+    if fractional:
+        costs = rng.uniform(0.3, 7.5, cells.shape).astype(np.float32)
+    else:
+        costs = rng.integers(1, 6, cells.shape).astype(np.uint8)
+    return Grid(cells, costs), rng
+
+def _queries(grid, rng, count=8):
+    ends = rng.choice(np.argwhere(grid.cells == 0), (count, 2)).tolist()
+    return [(tuple(start), tuple(goal)) for start, goal in ends]
+
+@pytest.mark.parametrize("fractional", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_solvers_match_dijkstra(seed, fractional):
+    grid, rng = _terrain_grid(seed, fractional)
+    for start, goal in _queries(grid, rng):
+        expected = search(grid, start, goal, "dijkstra")
+        results = [run_algorithm(grid, start, goal, algorithm) for algorithm in TERRAIN_SOLVERS]
+        for result in results + [flat_search(grid, start, goal)]:
+            if expected.path is None:
+                assert result.path is None
+            else:
+                assert result.cost == pytest.approx(expected.cost)
+                assert path_cost(result.path, grid) == pytest.approx(expected.cost)
+
+def test_distance_field_pays_terrain():
+    grid, rng = _terrain_grid(0, fractional=True)
+    source, *targets = [tuple(pos) for pos in rng.choice(np.argwhere(grid.cells == 0), 10).tolist()]
+    dist, pred = distance_field(grid, source)
+    for target in targets:
+        expected = search(grid, source, target, "dijkstra")
+        if expected.path is not None:
+            assert dist[target] == pytest.approx(expected.cost)
+            assert path_cost(field_path(dist, pred, target), grid) == pytest.approx(expected.cost)
+
+def test_d_star_lite_repairs_cost_edits():
+    grid, rng = _terrain_grid(1)
+    start, goal = _queries(grid, rng, 1)[0]
+    planner = IncrementalPlanner(grid, goal)
+    for _ in range(5):
+        planner.update_costs([(tuple(pos), int(rng.integers(1, 6))) for pos in rng.integers(0, 24, (8, 2)).tolist()])
+        path, _ = planner.plan(start)
+        expected = search(grid, start, goal, "dijkstra")
+        assert (path is None) == (expected.path is None)
+        if path is not None:
+            assert path_cost(path, grid) == pytest.approx(expected.cost)
+
+def test_set_cost_keeps_a_star_optimal():
+    grid, rng = _terrain_grid(2)
+    for pos in rng.integers(0, 24, (6, 2)).tolist():
+        # Cheaper than anything so far, which lowers the heuristic's scale
+        grid.set_cost(pos, float(rng.uniform(0.2, 1)))
+        for start, goal in _queries(grid, rng, 4):
+            expected = search(grid, start, goal, "dijkstra")
+            if expected.path is not None:
+                assert search(grid, start, goal).cost == pytest.approx(expected.cost)
+
+def test_batch_workers_see_terrain():
+    grid, rng = _terrain_grid(3, fractional=True)
+    jobs = [("terrain", start, goal, "a_star") for start, goal in _queries(grid, rng, 4)]
+    for result in run_batch(jobs, maps={"terrain": grid}, workers=2):
+        _, start, goal, _ = jobs[result["job"]]
+        assert result["cost"] == pytest.approx(search(grid, start, goal).cost)
+
+@pytest.mark.parametrize("packed", [False, True])
+@pytest.mark.parametrize("fractional", [False, True])
+def test_binary_maps_keep_terrain(tmp_path, packed, fractional):
+    grid, _ = _terrain_grid(4, fractional)
+    save_grid_bin(tmp_path / "map.gmap", grid, packed=packed)
+    cells, meta = load_grid_bin(tmp_path / "map.gmap")
+    assert np.array_equal(cells, grid.cells)
+    assert meta["costs"].dtype == grid.costs.dtype and np.array_equal(meta["costs"], grid.costs)
+
+def test_uniform_cost_solvers_refuse_terrain():
+    grid, _ = _terrain_grid(0)
+    with pytest.raises(ValueError):
+        jps(grid, (0, 0), (1, 1))
+    with pytest.raises(ValueError):
+        AbstractGraph.build(grid)
+    with pytest.raises(ValueError):
+        LandmarkHeuristic.build(grid)
+
+def test_rejects_bad_costs():
+    cells = np.zeros((2, 2), dtype=np.uint8)
+    for costs in (np.zeros((2, 2)), np.full((2, 2), np.inf), np.ones((3, 2))):
+        with pytest.raises(ValueError):
+            Grid(cells, costs)
+    with pytest.raises(ValueError):
+        Grid(cells).set_cost((0, 0), -1)
+
+def test_bucket_dijkstra_budget():
+    grid, _ = _terrain_grid(0)
+    result = bucket_dijkstra(grid, (0, 0), (23, 23), deadline=time.perf_counter() - 1)
+    assert result.status == BUDGET_EXCEEDED and result.expansions == 0
+
+# A wall's cost is never validated, so a 0 there must not leak into the grid
+# when the wall is opened
+def test_opened_zero_cost_wall_costs_one():
+    cells = np.zeros((3, 3), dtype=np.uint8)
+    cells[1, 1] = 1
+    costs = np.full((3, 3), 2, dtype=np.uint8)
+    costs[1, 1] = 0
+    grid = Grid(cells, costs)
+    grid.set_cell((1, 1), 0)
+    assert grid.costs[1, 1] == 1 and grid.min_cost == 1
+    for algorithm in ("dijkstra", "a_star"):
+        assert search(grid, (0, 0), (2, 2), algorithm).cost == pytest.approx(2 ** 0.5 * 3)
+    assert bucket_dijkstra(grid, (0, 0), (2, 2)).cost == pytest.approx(2 ** 0.5 * 3)
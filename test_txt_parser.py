@@ -0,0 +1,53 @@
+import io
+import numpy as np
+import pytest
+from a_star_pathfinding_multi import parse_grid_txt
+
+# The chunked parser reads the same cells whatever the chunk size, from files,
+# seekable streams and pipes, and reports malformed lines by number
+
+CHUNK_SIZES = [1, 2, 3, 7, 64, 1 << 20]
+
+class _Pipe(io.RawIOBase):
+    def __init__(self, data):
+        self._data = io.BytesIO(data)
+    def readable(self):
+        return True
+    def seekable(self):
+        return False
+    def read(self, size=-1):
+        return self._data.read(size)
+
+def _text(cells, newline="\n"):
+    return newline.join(" ".join(map(str, row)) for row in cells.tolist()).encode()
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_chunk_sizes_agree(chunk_size, tmp_path):
+    cells = np.random.default_rng(2).integers(0, 10, (24, 31)).astype(np.uint8)
+    data = _text(cells) + b"\n"
+    (tmp_path / "map.txt").write_bytes(data)
+    for source in (str(tmp_path / "map.txt"), io.BytesIO(data), _Pipe(data)):
+        parsed = parse_grid_txt(source, chunk_size)
+        assert parsed.dtype == np.uint8 and np.array_equal(parsed, cells)
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_line_endings_and_blank_lines(chunk_size):
+    cells = np.array([[0, 1, 0], [1, 1, 0]], dtype=np.uint8)
+    for data in (_text(cells), _text(cells, "\r\n") + b"\r\n", b"\n\n" + _text(cells, "\n\n") + b"\n \n",
+                 _text(cells).replace(b" ", b"\t")):
+        assert np.array_equal(parse_grid_txt(io.BytesIO(data), chunk_size), cells)
+        assert np.array_equal(parse_grid_txt(_Pipe(data), chunk_size), cells)
+
+@pytest.mark.parametrize("data, line", [
+    (b"0 1\n1 0 1\n", 2),
+    (b"0 1\n\n10 1\n", 3),
+    (b"0 1\n0 x\n", 2),
+])
+def test_malformed_lines(data, line):
+    for chunk_size in CHUNK_SIZES:
+        with pytest.raises(ValueError, match=f"line {line}:"):
+            parse_grid_txt(io.BytesIO(data), chunk_size)
+
+def test_empty_map():
+    with pytest.raises(ValueError):
+        parse_grid_txt(io.BytesIO(b"\n \n"))